@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Layout-stage benchmark for the chord diagram.
+
+Builds synthetic mappings with a Master list and six framework lists of
+increasing size and times governance_map.compute_layout (graph construction
+plus the NumPy layout stage) and layout_arrays on its own.
+
+Usage:
+  python benchmarks/layout.py [--sizes 1000 10000 50000]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import governance_map
+
+FRAMEWORKS = ["ISO42001", "ISO27001", "ISO27701", "EU AI ACT", "NIST RMF", "SOC2"]
+
+def synthetic_mapping(total_nodes, edges_per_control=3, seed=0):
+    """
+    Returns (lists, relationships) with about total_nodes controls in total.
+    """
+    rng = random.Random(seed)
+    per_list = max(1, total_nodes // (len(FRAMEWORKS) + 1))
+    lists = {"Master": [f"D{i // 10}-{i % 10 + 1}" for i in range(per_list)]}
+    for name in FRAMEWORKS:
+        lists[name] = [f"{i // 100 + 1}.{i // 10 % 10 + 1}.{i % 10 + 1}" for i in range(per_list)]
+    relationships = []
+    for name in FRAMEWORKS:
+        for item in lists[name]:
+            for _ in range(edges_per_control):
+                relationships.append(["Master", rng.choice(lists["Master"]), name, item])
+    return lists, relationships
+
+def main():
+    parser = argparse.ArgumentParser(description="Chord diagram layout benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000],
+                        help="Total node counts to benchmark")
+    args = parser.parse_args()
+
+    print(f"{'nodes':>8} | {'edges':>8} | {'compute_layout ms':>18} | {'layout_arrays ms':>17}")
+    print("-" * 62)
+    for size in args.sizes:
+        lists, relationships = synthetic_mapping(size)
+        sources = list(lists.keys())
+
+        start = time.perf_counter()
+        graph = governance_map.compute_layout(lists, relationships, sources)
+        total_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        governance_map.layout_arrays(graph.source, graph.edge_u, graph.edge_v,
+                                     len(graph.sources), sources.index("Master"))
+        arrays_ms = (time.perf_counter() - start) * 1000
+
+        print(f"{graph.num_nodes:>8} | {graph.num_edges:>8} | {total_ms:>18.1f} | {arrays_ms:>17.1f}")
+
+if __name__ == "__main__":
+    main()
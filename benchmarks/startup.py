@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark for governance_map.
+
+Times, in fresh interpreters:
+  • import_lazy:  "import governance_map" (no data parse, no plotting stack)
+  • table_lazy:   "governance_map.py table Master SOC2" (JSON parse, no plotting stack)
+  • import_eager: what importing governance_map used to cost — importing
+                  matplotlib.pyplot and networkx and parsing the mapping JSON
+
+Usage:
+  python benchmarks/startup.py [--runs 10]
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = {
+    "import_lazy": ["-c", "import governance_map"],
+    "table_lazy": ["governance_map.py", "table", "Master", "SOC2"],
+    "import_eager": ["-c", "import matplotlib.pyplot, networkx, json; "
+                           "json.load(open('control_mapping.json'))"],
+}
+
+def time_case(args, runs):
+    """
+    Runs the interpreter with args `runs` times and returns the wall times in ms,
+    or None if the command fails (e.g. matplotlib is not installed).
+    """
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable] + args, cwd=REPO_DIR,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        elapsed = (time.perf_counter() - start) * 1000
+        if result.returncode != 0:
+            return None
+        times.append(elapsed)
+    return times
+
+def main():
+    parser = argparse.ArgumentParser(description="governance_map startup benchmark")
+    parser.add_argument("--runs", type=int, default=10, help="Runs per case")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'case':<14} | {'median ms':>10} | {'min ms':>8}")
+    print("-" * 40)
+    for name, case_args in CASES.items():
+        times = time_case(case_args, args.runs)
+        if times is None:
+            print(f"{name:<14} | {'failed':>10} |")
+            continue
+        results[name] = statistics.median(times)
+        print(f"{name:<14} | {results[name]:>10.1f} | {min(times):>8.1f}")
+
+    if "import_lazy" in results and "import_eager" in results:
+        print(f"\nStartup speed-up: {results['import_eager'] / results['import_lazy']:.1f}x")
+
+if __name__ == "__main__":
+    main()
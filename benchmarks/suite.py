@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Synthetic-scale benchmark suite for the toolchain.
+
+Generates the synthetic datasets of benchmarks/synthetic.py at each scale
+(default 1x, 10x, 100x and 1000x) and measures, per case and scale, the
+median wall time over --repeat runs and the peak Python heap (tracemalloc,
+in a separate run so the tracing does not distort the times):
+  conversion        conversion.main(): Source Data.xlsx -> control_mapping.json
+  governance_csv    governance_csv.main(): every pair CSV
+  tables            governance_map.py tables: every pair CSV from the relationship index
+  dora_csv          dora_csv.export_to_csv of the DORA mapping
+  dora_parse_table  dora_map.parse_table of the DORA HTML table
+  render            headless chord diagram of every list (build_chord_figure + PNG)
+  standards_import  standards_mapper.import_directory of the pair CSVs into a
+                    SQLite stand-in for the PostgreSQL database
+Cases whose dependencies are not installed are reported as skipped. The
+rendering and database cases are slow at large scales; they stop at
+max_scale (see CASES) unless --no-limit is given.
+
+Results are saved as JSON. With --baseline, every time is compared with an
+earlier run, and the exit code is 1 if one is slower by more than --tolerance.
+
+Usage:
+  python benchmarks/suite.py [--scales 1 10 100 1000] [--cases tables render] [--repeat 3]
+  python benchmarks/suite.py --out baseline.json
+  python benchmarks/suite.py --baseline baseline.json [--tolerance 0.25]
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import sqlite3
+import logging
+import platform
+import argparse
+import tempfile
+import contextlib
+import statistics
+import subprocess
+import tracemalloc
+from datetime import datetime, timezone
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import synthetic
+
+SQLITE_SCHEMA = """
+CREATE TABLE standards (
+    standard_id INTEGER PRIMARY KEY,
+    standard_name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE clauses (
+    clause_id INTEGER PRIMARY KEY,
+    standard_id INTEGER REFERENCES standards(standard_id) ON DELETE CASCADE,
+    clause_text TEXT NOT NULL,
+    UNIQUE(standard_id, clause_text)
+);
+CREATE TABLE mappings (
+    mapping_id INTEGER PRIMARY KEY,
+    clause_a_id INTEGER REFERENCES clauses(clause_id) ON DELETE CASCADE,
+    clause_b_id INTEGER REFERENCES clauses(clause_id) ON DELETE CASCADE,
+    source_file TEXT,
+    UNIQUE(clause_a_id, clause_b_id)
+);
+CREATE TABLE import_logs (
+    import_id INTEGER PRIMARY KEY,
+    file_name TEXT NOT NULL,
+    import_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    row_count INTEGER,
+    success BOOLEAN DEFAULT TRUE,
+    error_message TEXT
+);
+CREATE INDEX idx_clauses_standard_id ON clauses(standard_id);
+CREATE INDEX idx_mappings_clause_a ON mappings(clause_a_id);
+CREATE INDEX idx_mappings_clause_b ON mappings(clause_b_id);
+"""
+
+class StandInCursor:
+    """
+    The part of the psycopg cursor interface standards_mapper uses, on SQLite.
+    """
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cursor.close()
+
+    def execute(self, query, params=()):
+        self.cursor.execute(query.replace("%s", "?"), params)
+
+    def executemany(self, query, params_seq):
+        self.cursor.executemany(query.replace("%s", "?"), params_seq)
+
+    def fetchone(self):
+        return self.cursor.fetchone()
+
+    def fetchall(self):
+        return self.cursor.fetchall()
+
+class StandInConnection:
+    """
+    A local SQLite database standing in for psycopg.connect(DB_CONNECTION_STRING).
+    """
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.connection.close()
+
+    def cursor(self):
+        return StandInCursor(self.connection.cursor())
+
+    def commit(self):
+        self.connection.commit()
+
+# ------------------------------------------------------------
+# Cases. Each takes the benchmark context (dataset, working directory) and
+# returns (run, rows): run() is the timed call, rows the amount of work it does.
+# Everything before the return is untimed setup.
+# ------------------------------------------------------------
+def case_conversion(ctx):
+    import conversion
+    if not ctx["dataset"]["workbook"]:
+        raise ImportError("writing the synthetic workbook needs openpyxl")
+    return conversion.main, len(ctx["dataset"]["mapping"]["relationships"])
+
+def case_governance_csv(ctx):
+    import governance_csv
+    return governance_csv.main, len(ctx["dataset"]["mapping"]["relationships"])
+
+def case_tables(ctx):
+    from relationship_index import RelationshipIndex, write_all_tables
+    mapping = ctx["dataset"]["mapping"]
+    out_dir = os.path.join(ctx["dir"], "tables")
+    def run():
+        write_all_tables(RelationshipIndex(mapping["lists"], mapping["relationships"]), out_dir)
+    return run, len(mapping["relationships"])
+
+def case_dora_csv(ctx):
+    import dora_csv
+    mapping = ctx["dataset"]["dora_mapping"]
+    def run():
+        dora_csv.export_to_csv(dora_csv.create_mapping_dict(mapping))
+    return run, len(mapping["relationships"])
+
+def case_dora_parse_table(ctx):
+    import dora_map
+    html = ctx["dataset"]["dora_html"]
+    headers = ["DORA-area", "ISO 27001:2022 Controls", "ISO 27002:2022 Controls"]
+    def run():
+        dora_map.parse_table(html, headers, "DORA")
+    return run, len(ctx["dataset"]["dora_mapping"]["lists"]["DORA"])
+
+def case_render(ctx):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import governance_map
+    mapping = ctx["dataset"]["mapping"]
+    sources = list(mapping["lists"])
+    def run():
+        result = governance_map.build_chord_figure(mapping["lists"], mapping["relationships"], sources)
+        result[0].savefig(io.BytesIO(), format="png")
+        plt.close(result[0])
+    return run, len(mapping["relationships"])
+
+def case_standards_import(ctx):
+    import standards_mapper
+    from relationship_index import RelationshipIndex, write_all_tables
+    standards_mapper.logger.setLevel(logging.WARNING)
+    mapping = ctx["dataset"]["mapping"]
+    csv_dir = os.path.join(ctx["dir"], "import_csv")
+    if not os.path.isdir(csv_dir):
+        write_all_tables(RelationshipIndex(mapping["lists"], mapping["relationships"]), csv_dir)
+    db_path = os.path.join(ctx["dir"], "standards.sqlite")
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    with sqlite3.connect(db_path) as connection:
+        connection.executescript(SQLITE_SCHEMA)
+    standards_mapper.get_connection = lambda: StandInConnection(db_path)
+    rows = 0
+    for name in os.listdir(csv_dir):
+        with open(os.path.join(csv_dir, name), encoding='utf-8') as f:
+            rows += sum(1 for _ in f) - 1
+    return (lambda: standards_mapper.import_directory(csv_dir)), rows
+
+CASES = {
+    "conversion": {"setup": case_conversion, "max_scale": 1000},
+    "governance_csv": {"setup": case_governance_csv, "max_scale": 1000},
+    "tables": {"setup": case_tables, "max_scale": 1000},
+    "dora_csv": {"setup": case_dora_csv, "max_scale": 1000},
+    "dora_parse_table": {"setup": case_dora_parse_table, "max_scale": 1000},
+    "render": {"setup": case_render, "max_scale": 10},
+    "standards_import": {"setup": case_standards_import, "max_scale": 100},
+}
+
+def measure(setup, ctx, repeat):
+    """
+    Returns {"seconds", "min_seconds", "peak_mb", "rows"} for one case.
+    """
+    times = []
+    for _ in range(repeat):
+        run, rows = setup(ctx)
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    run, rows = setup(ctx)
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": round(statistics.median(times), 6), "min_seconds": round(min(times), 6),
+            "peak_mb": round(peak / 2**20, 3), "rows": rows}
+
+def run_suite(cases, scales, repeat=3, no_limit=False, seed=0):
+    """
+    Runs the cases at every scale. Returns the list of result records.
+    """
+    results = []
+    cwd = os.getcwd()
+    for scale in scales:
+        work_dir = tempfile.mkdtemp(prefix=f"bench_{scale}x_")
+        try:
+            dataset = synthetic.write_dataset(work_dir, scale, seed)
+            ctx = {"dir": work_dir, "scale": scale, "dataset": dataset}
+            os.chdir(work_dir)
+            for name in cases:
+                record = {"case": name, "scale": scale}
+                if scale > CASES[name]["max_scale"] and not no_limit:
+                    record["skipped"] = f"above max_scale {CASES[name]['max_scale']} (use --no-limit)"
+                else:
+                    try:
+                        with contextlib.redirect_stdout(io.StringIO()):
+                            record.update(measure(CASES[name]["setup"], ctx, repeat))
+                    except ImportError as e:
+                        record["skipped"] = f"missing dependency: {e}"
+                results.append(record)
+                print(format_record(record, None))
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+def format_record(record, baseline):
+    label = f"{record['case']:<17} | {record['scale']:>5}x"
+    if "skipped" in record:
+        return f"{label} | skipped: {record['skipped']}"
+    line = (f"{label} | {record['seconds'] * 1000:>10.1f} ms | {record['peak_mb']:>9.1f} MB | "
+            f"{record['rows']:>9} rows")
+    previous = (baseline or {}).get((record["case"], record["scale"]))
+    if previous and previous.get("seconds"):
+        line += f" | {record['seconds'] / previous['seconds']:.2f}x baseline"
+    return line
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic-scale benchmark suite")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100, 1000],
+                        help="Dataset scales (default: 1 10 100 1000)")
+    parser.add_argument("--cases", nargs="+", help=f"Cases to run (default: all of {', '.join(CASES)})")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case (default: 3)")
+    parser.add_argument("--seed", type=int, default=0, help="Dataset seed (default: 0)")
+    parser.add_argument("--no-limit", action="store_true", help="Run every case at every scale")
+    parser.add_argument("--out", default="benchmark_results.json",
+                        help="Results JSON file (default: benchmark_results.json)")
+    parser.add_argument("--baseline", help="Results JSON file of an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown against the baseline (default: 0.25 = 25%%)")
+    args = parser.parse_args()
+
+    cases = args.cases or list(CASES)
+    for name in cases:
+        if name not in CASES:
+            print(f"Unknown case: {name}")
+            return 1
+    args.out = os.path.abspath(args.out)
+
+    results = run_suite(cases, args.scales, args.repeat, args.no_limit, args.seed)
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "results": results,
+    }
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved as '{args.out}'.")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, 'r') as f:
+        baseline = {(r["case"], r["scale"]): r for r in json.load(f)["results"]}
+    print(f"\nCompared with {args.baseline}:")
+    regressions = 0
+    for record in results:
+        if "skipped" in record or (record["case"], record["scale"]) not in baseline:
+            continue
+        print(format_record(record, baseline))
+        previous = baseline[(record["case"], record["scale"])]
+        if previous.get("seconds") and record["seconds"] > previous["seconds"] * (1 + args.tolerance):
+            regressions += 1
+    if regressions:
+        print(f"{regressions} case(s) slower than the baseline by more than {args.tolerance:.0%}.")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic datasets for the benchmarks.
+
+At scale 1 a dataset has the shape of the real one: 44 Master controls in
+12 domains, the six framework lists at their real sizes, and each framework
+control mapped to one to three Master controls (about 900 relationships). Scale
+s multiplies every list by s. The same scale and seed always produce the same
+files:
+  Source Data.xlsx          the Mapping sheet conversion.py reads (needs openpyxl)
+  control_mapping.json      what conversion.py makes of that sheet
+  dora_table.html           a DORA-style HTML table as parsed by dora_map.parse_table
+  control_mapping_dora.json what dora_map.py makes of that table
+
+Usage:
+  python benchmarks/synthetic.py --scale 10 --out /tmp/synthetic_10x
+"""
+
+import os
+import json
+import random
+import argparse
+
+DOMAINS = ["GL", "RM", "SE", "LC", "RS", "PR", "RO", "AA", "IM", "OM", "CO", "TP"]
+FRAMEWORK_SIZES = {"ISO42001": 67, "ISO27001": 80, "ISO27701": 94, "EU AI ACT": 122, "NIST RMF": 63, "SOC2": 66}
+MASTER_SIZE = 44
+DORA_ROWS = 12
+
+def _framework_ids(name, count):
+    if name == "SOC2":
+        return [f"CC{i // 10 + 1}.{i % 10 + 1}" for i in range(count)]
+    if name == "ISO27001":
+        return [f"A.{i // 100 + 5}.{i // 10 % 10 + 1}.{i % 10 + 1}" for i in range(count)]
+    return [f"{i // 100 + 4}.{i // 10 % 10 + 1}.{i % 10 + 1}" for i in range(count)]
+
+def generate_rows(scale=1, seed=0):
+    """
+    Returns the rows of the Mapping sheet: [{column: cell text or None}], one
+    row per Master control, with the framework controls of a cell separated by
+    newlines, as in the real workbook.
+    """
+    rng = random.Random(seed)
+    masters = [f"{DOMAINS[i % len(DOMAINS)]}-{i // len(DOMAINS) + 1}" for i in range(MASTER_SIZE * scale)]
+    cells = {m: {} for m in masters}
+    for name, size in FRAMEWORK_SIZES.items():
+        for item in _framework_ids(name, size * scale):
+            for master in rng.sample(masters, rng.choice((1, 1, 2, 2, 3))):
+                cells[master].setdefault(name, []).append(item)
+    rows = []
+    for master in masters:
+        row = {"MASTER": master}
+        for name in FRAMEWORK_SIZES:
+            items = cells[master].get(name)
+            row[name] = "\n".join(items) if items else None
+        rows.append(row)
+    return rows
+
+def mapping_from_rows(rows):
+    """
+    Returns the control_mapping.json structure for rows, as conversion.py builds it.
+    """
+    lists = {"Master": set(), **{name: set() for name in FRAMEWORK_SIZES}}
+    relationships = []
+    for row in rows:
+        master = row["MASTER"]
+        lists["Master"].add(master)
+        for name in FRAMEWORK_SIZES:
+            for item in (row[name] or "").splitlines():
+                lists[name].add(item)
+                relationships.append(["Master", master, name, item])
+    return {"lists": {name: sorted(items) for name, items in lists.items()},
+            "relationships": relationships}
+
+def generate_dora(scale=1, seed=0):
+    """
+    Returns (html, mapping): a DORA-style table of DORA areas against ISO 27001
+    and ISO 27002 controls, and the mapping dora_map.py produces from it.
+    """
+    rng = random.Random(seed)
+    rows = []
+    lists = {"DORA": [], "ISO27001": set(), "ISO27002": set()}
+    relationships = []
+    for i in range(DORA_ROWS * scale):
+        area = f"DORA area {i + 1}"
+        iso27001 = [f"Annex A 5.{rng.randint(1, 37)}" for _ in range(rng.randint(1, 4))] + [f"6.1.{rng.randint(1, 3)}"]
+        iso27002 = [f"{rng.randint(5, 8)}.{rng.randint(1, 37)}" for _ in range(rng.randint(1, 4))]
+        rows.append(f"<tr><td>{area}</td><td>{'<br>'.join(iso27001)}</td><td>{'<br>'.join(iso27002)}</td></tr>")
+        lists["DORA"].append(area)
+        lists["ISO27001"].update(iso27001)
+        lists["ISO27002"].update(iso27002)
+        relationships += [["DORA", area, "ISO27001", c] for c in iso27001]
+        relationships += [["DORA", area, "ISO27002", c] for c in iso27002]
+    html = ("<figure class=\"table\"><table><thead><tr><th>DORA-area</th><th>ISO 27001:2022 Controls</th>"
+            "<th>ISO 27002:2022 Controls</th></tr></thead><tbody>" + "".join(rows) + "</tbody></table></figure>")
+    mapping = {"lists": {"DORA": lists["DORA"], "ISO27001": sorted(lists["ISO27001"]),
+                         "ISO27002": sorted(lists["ISO27002"])},
+               "relationships": relationships}
+    return html, mapping
+
+def write_workbook(rows, path):
+    """
+    Writes rows as the Mapping sheet of an .xlsx workbook. Returns False if
+    openpyxl is not installed.
+    """
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        return False
+    wb = Workbook(write_only=True)
+    sheet = wb.create_sheet("Mapping")
+    columns = ["MASTER"] + list(FRAMEWORK_SIZES)
+    sheet.append(columns)
+    for row in rows:
+        sheet.append([row[c] for c in columns])
+    wb.save(path)
+    return True
+
+def write_dataset(out_dir, scale=1, seed=0):
+    """
+    Writes every file of the dataset to out_dir (see the module docstring).
+    Returns {"rows": ..., "mapping": ..., "dora_html": ..., "dora_mapping": ..., "workbook": bool}.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    rows = generate_rows(scale, seed)
+    mapping = mapping_from_rows(rows)
+    dora_html, dora_mapping = generate_dora(scale, seed)
+    with open(os.path.join(out_dir, "control_mapping.json"), 'w') as f:
+        json.dump(mapping, f, indent=4)
+    with open(os.path.join(out_dir, "control_mapping_dora.json"), 'w') as f:
+        json.dump(dora_mapping, f, indent=2)
+    with open(os.path.join(out_dir, "dora_table.html"), 'w') as f:
+        f.write(dora_html)
+    workbook = write_workbook(rows, os.path.join(out_dir, "Source Data.xlsx"))
+    return {"rows": rows, "mapping": mapping, "dora_html": dora_html,
+            "dora_mapping": dora_mapping, "workbook": workbook}
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic mapping dataset")
+    parser.add_argument("--scale", type=int, default=1, help="Size multiplier (default: 1)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--out", required=True, help="Output directory")
+    args = parser.parse_args()
+
+    dataset = write_dataset(args.out, args.scale, args.seed)
+    mapping = dataset["mapping"]
+    print(f"{sum(len(items) for items in mapping['lists'].values())} controls, "
+          f"{len(mapping['relationships'])} relationships written to {args.out}")
+    if not dataset["workbook"]:
+        print("Source Data.xlsx was not written: it needs openpyxl.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Lightweight integer-indexed graph model for the chord diagram.
+
+Nodes are numbered 0..n-1 in the order they are added and described by
+parallel arrays, so building the graph, laying it out and colouring edges
+never has to format or re-parse "Source: Item" strings:
+  source[i]  index into sources of the list node i belongs to
+  label[i]   the control ID (e.g. "GL-1", "A.7.4")
+  angle[i]   position on the circle in radians (set by the layout)
+  color[i]   node color (set by the layout)
+  size[i]    number of controls the node stands for (> 1 for collapsed aggregates)
+  aggregate[i]  True if node i is a collapsed Master domain / top-level clause
+Edges are stored once each as parallel arrays edge_u/edge_v of node ids;
+edge_weight counts how many relationships were merged into each edge, and
+edge_color and arc_sign are filled in by the layout.
+The layout (governance_map.layout_arrays) replaces angle with a NumPy array
+and adds x, y, label_x, label_y and label_left arrays.
+"""
+
+import math
+
+EDGE_WIDTH = 1.5
+# Width of a merged edge bundle (thinner, since it overlays many edges).
+BUNDLE_WIDTH = 1.0
+
+class ChordGraph:
+    def __init__(self, sources):
+        self.sources = list(sources)
+        self.source = []
+        self.label = []
+        self.angle = []
+        self.color = []
+        self.size = []
+        self.aggregate = []
+        self.x = None
+        self.y = None
+        self.label_x = None
+        self.label_y = None
+        self.label_left = None
+        self.edge_u = []
+        self.edge_v = []
+        self.edge_weight = []
+        self.edge_color = []
+        self.arc_sign = []
+        # Bundled edge geometry (see governance_map.compute_bundles), if any.
+        self.bundles = None
+        # {(source index, label): node id}
+        self._index = {}
+        # {(u, v) with u <= v: edge id}
+        self._edge_index = {}
+
+    @property
+    def num_nodes(self):
+        return len(self.label)
+
+    @property
+    def num_edges(self):
+        return len(self.edge_u)
+
+    def add_node(self, source_idx, label, size=1, aggregate=False):
+        """
+        Adds a node (if not already present) and returns its id.
+        """
+        key = (source_idx, label)
+        node = self._index.get(key)
+        if node is None:
+            node = len(self.label)
+            self._index[key] = node
+            self.source.append(source_idx)
+            self.label.append(label)
+            self.angle.append(0.0)
+            self.color.append(None)
+            self.size.append(size)
+            self.aggregate.append(aggregate)
+        return node
+
+    def add_edge(self, u, v, weight=1):
+        """
+        Adds an undirected edge between node ids u and v and returns its id.
+        Adding an existing edge again adds weight to it instead.
+        """
+        key = (u, v) if u <= v else (v, u)
+        e = self._edge_index.get(key)
+        if e is not None:
+            self.edge_weight[e] += weight
+            return e
+        e = len(self.edge_u)
+        self._edge_index[key] = e
+        self.edge_u.append(u)
+        self.edge_v.append(v)
+        self.edge_weight.append(weight)
+        return e
+
+    def edge_width(self, e):
+        """
+        Returns the line width of edge e: edges to a collapsed aggregate node
+        grow with the number of relationships merged into them, all other edges
+        keep the constant EDGE_WIDTH (even if a relationship is listed twice).
+        """
+        if self.aggregate[self.edge_u[e]] or self.aggregate[self.edge_v[e]]:
+            return min(EDGE_WIDTH * math.sqrt(self.edge_weight[e]), 8)
+        return EDGE_WIDTH
+
+    def positions(self):
+        """
+        Returns the (x, y) position of every node on the unit circle.
+        """
+        if self.x is not None:
+            return list(zip(self.x.tolist(), self.y.tolist()))
+        return [(math.cos(a), math.sin(a)) for a in self.angle]
@@ -0,0 +1,178 @@
+"""
+Control search: prefix lookup of control IDs and keyword lookup of control statements.
+
+SearchIndex is built once from the lists of the mapping (and the Master
+Control Statements of "Source Data.csv", if present):
+  • a trie over every control ID of every list (case-insensitive), so the IDs
+    starting with a prefix ("A.7.4", "rm-") are found by walking the prefix and
+    collecting the subtree instead of scanning every ID,
+  • a token index {word: set of controls} over the statements, so a keyword
+    query is an intersection of small sets (the last word also matches as a
+    prefix, so results come up while a word is being typed).
+Results are (list, control) pairs in the order of the lists, and within a list
+in the order of sort_key (governance_map passes its natural dotted order,
+parse_dotted); every control's rank is computed once when the index is built.
+Blank queries match nothing.
+
+prompt() wraps input() with readline tab completion where readline is available.
+"""
+
+import re
+
+from relationship_index import HUB
+
+END = ""
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+class ControlTrie:
+    def __init__(self, entries):
+        """
+        entries: iterable of (key, value); keys are matched case-insensitively.
+        """
+        self.root = {}
+        for key, value in entries:
+            node = self.root
+            for ch in key.lower():
+                node = node.setdefault(ch, {})
+            node.setdefault(END, []).append(value)
+
+    def find(self, prefix):
+        """
+        Returns the values of every key that starts with prefix (in no particular order).
+        """
+        node = self.root
+        for ch in prefix.lower():
+            node = node.get(ch)
+            if node is None:
+                return []
+        values = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for ch, child in node.items():
+                if ch == END:
+                    values.extend(child)
+                else:
+                    stack.append(child)
+        return values
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+class SearchIndex:
+    def __init__(self, lists, statements=None, sort_key=None):
+        """
+        lists: {list name: [control IDs]}; statements: {(list, control): text};
+        sort_key: key function ordering the control IDs of a list (default: as strings).
+        """
+        sort_key = sort_key or str
+        self.statements = statements or {}
+        list_order = {l: i for i, l in enumerate(lists)}
+        order = sorted(((l, item) for l in lists for item in lists[l]),
+                       key=lambda c: (list_order[c[0]], sort_key(c[1])))
+        self.rank = {control: i for i, control in enumerate(order)}
+        self.ids = ControlTrie((item, (l, item)) for l, item in order)
+        self.tokens = {}
+        for control, text in self.statements.items():
+            if control in self.rank:
+                for token in tokenize(text):
+                    self.tokens.setdefault(token, set()).add(control)
+        self.words = ControlTrie((token, token) for token in self.tokens)
+
+    def _sorted(self, controls, limit):
+        return sorted(controls, key=self.rank.__getitem__)[:limit]
+
+    def prefix(self, prefix, limit=None):
+        """
+        Returns the (list, control) pairs whose ID starts with prefix
+        (none for a blank prefix).
+        """
+        prefix = prefix.strip()
+        if not prefix:
+            return []
+        return self._sorted(set(self.ids.find(prefix)), limit)
+
+    def keyword(self, query, limit=None):
+        """
+        Returns the (list, control) pairs whose statement contains every word of
+        query; the last word may be the start of a word.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+        postings = [self.tokens.get(w, set()) for w in words[:-1]]
+        last = set()
+        for word in self.words.find(words[-1]):
+            last |= self.tokens[word]
+        postings.append(last)
+        postings.sort(key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result &= posting
+        return self._sorted(result, limit)
+
+    def search(self, query, limit=None):
+        """
+        Returns the ID prefix matches of query, followed by its keyword matches
+        if nothing matched the ID or the query has several words.
+        """
+        found = self.prefix(query, limit)
+        if found and len(query.split()) == 1:
+            return found
+        seen = set(found)
+        found += [c for c in self.keyword(query) if c not in seen]
+        return found[:limit]
+
+    def complete_id(self, prefix):
+        """
+        Returns the distinct control IDs that start with prefix, for tab completion.
+        """
+        return list(dict.fromkeys(item for _, item in self.prefix(prefix)))
+
+def load_statements(csv_file, hub=HUB):
+    """
+    Returns {(hub, control): "Topic. Control Statement"} from the source data
+    CSV, or {} if the file is missing.
+    """
+    from suggest import load_statements as load_csv_statements
+    try:
+        return {(hub, control): text for control, text in load_csv_statements(csv_file).items()}
+    except FileNotFoundError:
+        return {}
+
+def prompt(text, candidates, delimiters=","):
+    """
+    input(text) with tab completion: candidates(prefix) returns the completions
+    of the word being typed (words are separated by delimiters).
+    Falls back to plain input() where readline is not available.
+    """
+    try:
+        import readline
+    except ImportError:
+        return input(text)
+
+    matches = []
+    def complete(word, state):
+        if state == 0:
+            matches[:] = candidates(word.lstrip())
+        return matches[state] if state < len(matches) else None
+
+    old_completer = readline.get_completer()
+    old_delimiters = readline.get_completer_delims()
+    readline.set_completer(complete)
+    readline.set_completer_delims(delimiters)
+    if "libedit" in (readline.__doc__ or ""):
+        readline.parse_and_bind("bind ^I rl_complete")
+    else:
+        readline.parse_and_bind("tab: complete")
+    try:
+        return input(text)
+    finally:
+        readline.set_completer(old_completer)
+        readline.set_completer_delims(old_delimiters)
+        # readline cannot report the previous Tab binding, so reapply the
+        # user's init file (without one, Tab is bound to complete by default).
+        try:
+            readline.read_init_file()
+        except OSError:
+            pass
@@ -1,6 +1,8 @@
 import pandas as pd
 import json
 
+import tracing
+
 def expand_range(val):
     """
     Expands a range string into a list of individual control values.
@@ -36,40 +38,71 @@ def process_cell(cell):
             controls.extend(expand_range(part))
     return controls
 
-# Read the Excel file (adjust sheet name/path as needed)
-df = pd.read_excel("Source Data.xlsx", sheet_name="Mapping")
-
-df.columns = df.columns.str.strip().str.upper()
-print(df.columns)
-
 # Define the expected columns.
-master_col = "MASTER"
-source_cols = ["ISO42001", "ISO27001", "ISO27701", "EU AI ACT", "NIST RMF", "SOC2"]
+MASTER_COL = "MASTER"
+SOURCE_COLS = ["ISO42001", "ISO27001", "ISO27701", "EU AI ACT", "NIST RMF", "SOC2"]
 
-# Build the lists dictionary while expanding ranges and splitting on newlines.
-lists = {}
-for col in [master_col] + source_cols:
-    control_set = set()
-    for val in df[col].dropna():
-        controls = process_cell(val)
-        control_set.update(controls)
-    key = "Master" if col == master_col else col
-    lists[key] = sorted(control_set)
+def read_mapping_sheet(xlsx_file="Source Data.xlsx"):
+    """
+    Reads the Mapping sheet of the workbook, with stripped, upper-case column names.
+    """
+    with tracing.span("read_excel", file=xlsx_file) as s:
+        df = pd.read_excel(xlsx_file, sheet_name="Mapping")
+        s.add(len(df))
+    df.columns = df.columns.str.strip().str.upper()
+    return df
 
-# Build relationships by expanding any ranges/newlines in the cells.
-relationships = []
-for _, row in df.iterrows():
-    master_controls = process_cell(row[master_col])
-    for col in source_cols:
+def convert_row(row):
+    """
+    Converts one row of the Mapping sheet, expanding any ranges/newlines in the cells.
+    Returns (cells, relationships): cells is {list name: [controls]} for the
+    non-empty cells of the row, relationships the Master relationships of the row.
+    """
+    cells = {}
+    for col in [MASTER_COL] + SOURCE_COLS:
         if pd.notnull(row[col]):
-            source_controls = process_cell(row[col])
+            key = "Master" if col == MASTER_COL else col
+            cells[key] = process_cell(row[col])
+
+    master_controls = process_cell(row[MASTER_COL])
+    relationships = []
+    for col in SOURCE_COLS:
+        if col in cells:
             for m in master_controls:
-                for s in source_controls:
+                for s in cells[col]:
                     relationships.append(["Master", m, col, s])
+    return cells, relationships
+
+def build_mapping(converted_rows):
+    """
+    Combines converted rows (see convert_row) into the lists and relationships
+    structure of control_mapping.json.
+    """
+    lists = {key: set() for key in ["Master"] + SOURCE_COLS}
+    relationships = []
+    for cells, row_relationships in converted_rows:
+        for key, controls in cells.items():
+            lists[key].update(controls)
+        relationships.extend(row_relationships)
+    return {"lists": {key: sorted(controls) for key, controls in lists.items()},
+            "relationships": relationships}
+
+def main():
+    # Read the Excel file (adjust sheet name/path as needed)
+    df = read_mapping_sheet("Source Data.xlsx")
+    print(df.columns)
+
+    # Build the lists and relationships, row by row.
+    with tracing.span("convert_rows") as s:
+        converted = [convert_row(row) for _, row in df.iterrows()]
+        s.add(len(converted))
+    data = build_mapping(converted)
+    with tracing.span("json.dump", file="control_mapping.json") as s:
+        with open("control_mapping.json", "w") as f:
+            json.dump(data, f, indent=4)
+        s.add(len(data["relationships"]))
 
-# Combine lists and relationships into one JSON structure.
-data = {"lists": lists, "relationships": relationships}
-with open("control_mapping.json", "w") as f:
-    json.dump(data, f, indent=4)
+    print("Data successfully converted to control_mapping.json")
 
-print("Data successfully converted to control_mapping.json")
+if __name__ == "__main__":
+    main()
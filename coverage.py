@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Coverage and gap analysis of the frameworks against the Master controls.
+
+CoverageIndex stores, for every framework, one bitset per Master control:
+bit i of bits[framework][control] is set if the control is linked to the i-th
+item of lists[framework]. Every query is then a handful of bitwise operations
+on Python ints:
+  • coverage / gaps:  OR of the controls' bitsets, compared with the full mask,
+  • top controls:     popcount of each control's bitset,
+  • minimal cover:    greedy set cover, picking the control that adds the most new bits,
+  • drop controls:    items covered by all controls but not by the remaining ones.
+
+Usage:
+  python coverage.py                           # coverage summary of every framework
+  python coverage.py gaps SOC2                 # SOC2 items not covered by any Master control
+  python coverage.py top ISO27001 -n 5         # Master controls covering the most ISO27001 items
+  python coverage.py cover "EU AI ACT"         # a small set of Master controls with the same coverage
+  python coverage.py drop GL-1 RM-2            # what loses all coverage without these controls
+"""
+
+import argparse
+
+import governance_map
+from relationship_index import HUB
+
+def _positions(mask):
+    """
+    Yields the indices of the set bits of mask, lowest first.
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+class CoverageIndex:
+    def __init__(self, lists, relationships, hub=HUB):
+        self.lists = lists
+        self.hub = hub
+        self.frameworks = [name for name in lists if name != hub]
+        self.controls = list(lists.get(hub, []))
+        position = {fw: {item: i for i, item in enumerate(lists[fw])} for fw in self.frameworks}
+        self.full = {fw: (1 << len(lists[fw])) - 1 for fw in self.frameworks}
+        # {framework: {Master control: bitset over lists[framework]}}
+        self.bits = {fw: {} for fw in self.frameworks}
+        for l1, item1, l2, item2 in relationships:
+            if l2 == hub:
+                l1, item1, l2, item2 = l2, item2, l1, item1
+            if l1 != hub or l2 not in position or item2 not in position[l2]:
+                continue
+            fw_bits = self.bits[l2]
+            fw_bits[item1] = fw_bits.get(item1, 0) | (1 << position[l2][item2])
+
+    def _check(self, framework):
+        if framework not in self.bits:
+            raise ValueError(f"Unknown framework: {framework}")
+
+    def covered(self, framework, controls=None):
+        """
+        Returns the bitset of framework items covered by controls (default: all Master controls).
+        """
+        self._check(framework)
+        fw_bits = self.bits[framework]
+        mask = 0
+        for control in (fw_bits if controls is None else controls):
+            mask |= fw_bits.get(control, 0)
+        return mask
+
+    def items(self, framework, mask):
+        """
+        Returns the framework items whose bits are set in mask, in list order.
+        """
+        items = self.lists[framework]
+        return [items[i] for i in _positions(mask)]
+
+    def coverage(self, framework, controls=None):
+        """
+        Returns (covered item count, total item count) for a framework.
+        """
+        return self.covered(framework, controls).bit_count(), len(self.lists[framework])
+
+    def gaps(self, framework, controls=None):
+        """
+        Returns the framework items not covered by any of controls (default: all Master controls).
+        """
+        covered = self.covered(framework, controls)
+        return self.items(framework, self.full[framework] & ~covered)
+
+    def top_controls(self, framework, n=10):
+        """
+        Returns up to n (control, covered item count) pairs, most covering first.
+        """
+        self._check(framework)
+        counts = [(control, mask.bit_count()) for control, mask in self.bits[framework].items()]
+        counts.sort(key=lambda pair: (-pair[1], governance_map.parse_dotted(pair[0])))
+        return counts[:n]
+
+    def minimal_cover(self, framework):
+        """
+        Returns a small list of Master controls that together cover every item
+        the Master list covers, chosen greedily (most newly covered items first).
+        """
+        self._check(framework)
+        remaining = self.covered(framework)
+        candidates = dict(self.bits[framework])
+        chosen = []
+        while remaining:
+            control = max(candidates, key=lambda c: (candidates[c] & remaining).bit_count())
+            chosen.append(control)
+            remaining &= ~candidates.pop(control)
+        return chosen
+
+    def drop(self, controls):
+        """
+        Returns {framework: [items]} of the items that lose all coverage if the
+        given Master controls are removed (frameworks that lose nothing are omitted).
+        """
+        dropped = set(controls)
+        lost = {}
+        for framework, fw_bits in self.bits.items():
+            kept = 0
+            for control, mask in fw_bits.items():
+                if control not in dropped:
+                    kept |= mask
+            mask = self.covered(framework) & ~kept
+            if mask:
+                lost[framework] = self.items(framework, mask)
+        return lost
+
+def print_summary(index):
+    print(f"{'Framework':<12} | {'Covered':>7} | {'Total':>5} | {'%':>6} | Gaps")
+    print("-" * 60)
+    for framework in index.frameworks:
+        covered, total = index.coverage(framework)
+        percent = 100.0 * covered / total if total else 0.0
+        print(f"{framework:<12} | {covered:>7} | {total:>5} | {percent:>5.1f}% | {total - covered}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Coverage and gap analysis against the Master controls")
+    parser.add_argument("--data", default="control_mapping.json", help="Mapping JSON file")
+    subparsers = parser.add_subparsers(dest="command", help="Query to run (default: summary)")
+    gaps_parser = subparsers.add_parser("gaps", help="List the items of a framework no Master control covers")
+    gaps_parser.add_argument("framework")
+    top_parser = subparsers.add_parser("top", help="List the Master controls covering the most items of a framework")
+    top_parser.add_argument("framework")
+    top_parser.add_argument("-n", type=int, default=10, help="Number of controls to list (default: 10)")
+    cover_parser = subparsers.add_parser("cover", help="Find a small set of Master controls with full coverage")
+    cover_parser.add_argument("framework")
+    drop_parser = subparsers.add_parser("drop", help="Show what loses all coverage without some Master controls")
+    drop_parser.add_argument("controls", nargs="+", help="Master control IDs (e.g. GL-1)")
+    args = parser.parse_args()
+
+    lists, relationships = governance_map.load_data(args.data)
+    index = CoverageIndex(lists, relationships)
+    try:
+        if args.command == "gaps":
+            gaps = index.gaps(args.framework)
+            print(f"{len(gaps)} {args.framework} items not covered by any Master control:")
+            for item in gaps:
+                print(f"  {item}")
+        elif args.command == "top":
+            for control, count in index.top_controls(args.framework, args.n):
+                print(f"{control:<10} {count}")
+        elif args.command == "cover":
+            chosen = index.minimal_cover(args.framework)
+            covered, total = index.coverage(args.framework)
+            print(f"{len(chosen)} Master controls cover {covered} of {total} {args.framework} items:")
+            print("  " + ", ".join(chosen))
+        elif args.command == "drop":
+            unknown = [c for c in args.controls if c not in index.controls]
+            if unknown:
+                print(f"Unknown Master control(s): {', '.join(unknown)}")
+                return 1
+            lost = index.drop(args.controls)
+            if not lost:
+                print("No items lose coverage.")
+            for framework, items in lost.items():
+                print(f"{framework}: {', '.join(items)}")
+        else:
+            print_summary(index)
+    except ValueError as e:
+        print(e)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
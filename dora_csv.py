@@ -2,6 +2,8 @@ import json
 import csv
 from itertools import combinations
 
+import tracing
+
 def load_json(filename="control_mapping_dora.json"):
     """
     Load the JSON file containing the control mappings.
@@ -63,7 +65,7 @@ def export_to_csv(mapping):
 
         print(f"Creating {filename}...")
 
-        with open(filename, 'w', newline='') as csvfile:
+        with open(filename, 'w', newline='') as csvfile, tracing.span("export_to_csv", file=filename) as s:
             writer = csv.writer(csvfile)
             writer.writerow([std1, std2])  # Header row
 
@@ -71,8 +73,10 @@ def export_to_csv(mapping):
                 if item2_list:
                     for item2 in item2_list:
                         writer.writerow([item1, item2])
+                    s.add(len(item2_list))
                 else:
                     writer.writerow([item1, ""])  # Write unmapped items
+                    s.add()
 
 def main():
     # Load the JSON data
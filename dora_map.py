@@ -2,6 +2,9 @@ import json
 import re
 from bs4 import BeautifulSoup
 
+import tracing
+
+@tracing.traced("dora_map.parse_table")
 def parse_table(table_string, headers, standard_name):
     soup = BeautifulSoup(table_string, "html.parser")
     table = soup.find("table")
@@ -62,7 +65,11 @@ def parse_table(table_string, headers, standard_name):
         relationships,
     )
 
-def main():
+def build_mapping():
+    """
+    Parses the DORA and NIS2 tables and returns the combined mapping
+    {"lists": {...}, "relationships": [...]} (the JSON that main prints).
+    """
     table1_string = """
     <figure class="table" style="float:left;"><table style="border-color:hsl(0, 0%, 30%);border-style:solid;"><thead><tr><th style="vertical-align:top;width:400px;">DORA-area&nbsp;<br><br>&nbsp;</th><th style="vertical-align:top;width:150px;">ISO 27001:2022 Controls</th><th style="vertical-align:top;width:150px;">ISO 27002:2022 &nbsp;Controls</th></tr></thead><tbody><tr><td style="vertical-align:top;width:400px;"><strong>Information and Communication Technology (ICT) risk management &nbsp;- Governance </strong>(Article 5)<br>&nbsp;</td><td style="width:150px;">Annex A 5.31<br>Annex A 5.34<br>Annex A 5.35<br>Annex A 5.36<br>Annex A 6.3&nbsp;</td><td style="vertical-align:top;width:150px;">5.1<br>5.31<br>5.34<br>5.35<br>5.36<br>6.3</td></tr><tr><td style="vertical-align:top;width:400px;"><strong>Information and Communication Technology (ICT) risk management &nbsp;- Risk management </strong>(Article 6, 16)</td><td style="vertical-align:top;width:150px;">&nbsp;5.2<br>6.1.2<br>6.1.3<br>8.2<br>8.3<br>Annex A 5.1</td><td style="vertical-align:top;">A 5.2</td></tr><tr><td style="vertical-align:top;"><strong>Information and Communication Technology (ICT) risk management &nbsp;- Identify, Protect, Detect &nbsp;</strong>(Article 7-10)</td><td>Annex A 5.20<br>Annex A 5.24<br>Annex A 5.37<br>Annex A 6.8<br>Annex A 8.8<br>Annex A 8.9<br>Annex A 8.20<br>Annex A 8.21</td><td>5.20<br>5.24<br>5.37<br>6.8<br>8.8<br>8.9<br>8.20<br>8.21</td></tr><tr><td style="vertical-align:top;"><strong>Information and Communication Technology (ICT) risk management &nbsp;- Business continuity </strong>(Article 11, 12)<br><br>&nbsp;</td><td style="vertical-align:top;">Annex A 5.29<br>Annex A 5.30<br>Annex A 8.13<br>Annex A 8.14<br>Annex A 8.15<br>Annex A 8.16</td><td style="vertical-align:top;">5.29<br>5.30<br>8.13<br>8.14<br>8.15<br>8.16</td></tr><tr><td style="vertical-align:top;"><strong>Information and Communication Technology (ICT) risk management &nbsp;- &nbsp;Learning, communication &nbsp;</strong>(Article 13, 14)</td><td style="vertical-align:top;">7.3<br>7.4<br>Annex A 5.15<br>Annex A 5.16<br>Annex A 5.18<br>Annex A 5.24<br>Annex A 6.3<br>Annex A 6.5<br>Annex A 6.8<br>Annex A 8.2<br>Annex A 8.3<br>Annex A 8.5<br>Annex A 8.7<br>Annex A 8.9<br>Annex A 8.13<br>Annex A 8.15<br>Annex A 5.19<br>Annex A 5.22</td><td style="vertical-align:top;">5.15<br>5.16<br>5.18<br>5.24<br>6.3<br>6.5<br>6.8<br>8.2<br>8.3<br>8.5<br>8.7<br>8.9<br>8.13<br>8.15<br>5.19<br>5.22</td></tr><tr><td style="vertical-align:top;"><span style="background-color:rgb(250,247,245);color:rgb(52,77,87);font-family:&quot;Cera Pro&quot;, ui-sans-serif, system-ui, sans-serif, &quot;Apple Color Emoji&quot;, &quot;Segoe UI Emoji&quot;, &quot;Segoe UI Symbol&quot;, &quot;Noto Color Emoji&quot;;"><strong>ICT-related incident management, classification and reporting</strong></span><strong> </strong>(Article 17-23)</td><td style="vertical-align:top;">Annex A 5.14<br>Annex A 6.8<br>&nbsp;</td><td style="vertical-align:top;">5.14<br>6.8<br>&nbsp;</td></tr><tr><td><strong>Digital operational resilience testing </strong>(Article 24 - 27)</td><td style="vertical-align:top;">9.1<br>9.2<br>9.3<br>Annex A 5.35<br>Annex A 5.36</td><td style="vertical-align:top;">5.35<br>5.36<br>&nbsp;</td></tr><tr><td style="vertical-align:top;"><span style="background-color:rgba(105,154,173,0.1);color:rgb(52,77,87);font-family:&quot;Cera Pro&quot;, ui-sans-serif, system-ui, sans-serif, &quot;Apple Color Emoji&quot;, &quot;Segoe UI Emoji&quot;, &quot;Segoe UI Symbol&quot;, &quot;Noto Color Emoji&quot;;"><strong>Managing of ICT third-party risk</strong> (Article 28-44)</span><br>&nbsp;</td><td style="vertical-align:top;">Annex A 5.19<br>Annex A 5.20<br>Annex A 5.21<br>Annex A 5.22<br>Annex A 5.23<br>&nbsp;</td><td style="vertical-align:top;">5.19<br>5.20<br>5.21<br>5.22<br>5.23<br>&nbsp;</td></tr></tbody></table></figure>
     """
@@ -97,7 +104,10 @@ def main():
         "relationships": all_relationships,
     }
 
-    json_output = json.dumps(result, indent=2)
+    return result
+
+def main():
+    json_output = json.dumps(build_mapping(), indent=2)
     print(json_output)
 
 if __name__ == "__main__":
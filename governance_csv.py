@@ -2,6 +2,8 @@ import json
 import csv
 from itertools import combinations
 
+import tracing
+
 def load_data(json_file="control_mapping.json"):
     """
     Loads the JSON file with structure:
@@ -42,15 +44,18 @@ def export_to_csv(primary_list_name, secondary_list_name, mapping, lists):
     filename = f"{primary_list_name}_vs_{secondary_list_name}.csv"
     print(f"Exporting to {filename}")
     try:
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        with open(filename, 'w', newline='', encoding='utf-8') as csvfile, \
+                tracing.span("export_to_csv", file=filename) as s:
             writer = csv.writer(csvfile)
             writer.writerow([primary_list_name, secondary_list_name])  # Write header row
             for primary_item, secondary_items in mapping.items():
                 if secondary_items:
                     for secondary_item in secondary_items:
                         writer.writerow([primary_item, secondary_item])
+                    s.add(len(secondary_items))
                 else:
                     writer.writerow([primary_item, ""]) #handles empty relationships
+                    s.add()
     except Exception as e:
         print(f"Error exporting to CSV: {e}")
 
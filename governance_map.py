@@ -1,8 +1,18 @@
-import matplotlib.pyplot as plt
-import networkx as nx
 import math
 import json
-from matplotlib.patches import FancyArrowPatch, Circle
+import os
+import argparse
+import layout_cache
+import tracing
+import control_search
+from chord_graph import BUNDLE_WIDTH, ChordGraph
+from relationship_index import RelationshipIndex, write_chunks, write_all_tables, write_workbook
+
+# matplotlib is imported lazily, only where a diagram is drawn, so the menu and
+# the relationship table start without the plotting stack.
+
+DATA_FILE = "control_mapping.json"
+SOURCE_FILE = "Source Data.csv"
 
 def load_data(json_file="control_mapping.json"):
     """
@@ -23,14 +33,64 @@ def load_data(json_file="control_mapping.json"):
         ]
       }
     """
-    with open(json_file, 'r') as f:
+    with open(json_file, 'r') as f, tracing.span("json.load", file=json_file) as s:
         data = json.load(f)
+        s.add(len(data['relationships']))
     return data['lists'], data['relationships']
 
 # ----------------------------------------------------------------
-# 1. Load the data
+# 1. Load the data (lazily, on first use)
 # ----------------------------------------------------------------
-lists, relationships = load_data()
+_data = None
+_data_hash = None
+_index = None
+_search = None
+
+def get_data():
+    """
+    Returns (lists, relationships), parsing DATA_FILE the first time it is needed.
+    """
+    global _data
+    if _data is None:
+        _data = load_data(DATA_FILE)
+    return _data
+
+def get_data_hash():
+    """
+    Returns the hash of DATA_FILE used to key the layout cache.
+    """
+    global _data_hash
+    if _data_hash is None:
+        _data_hash = layout_cache.file_hash(DATA_FILE)
+    return _data_hash
+
+def get_index():
+    """
+    Returns the RelationshipIndex of DATA_FILE, building it on first use.
+    """
+    global _index
+    if _index is None:
+        _index = RelationshipIndex(*get_data())
+    return _index
+
+def get_search_index():
+    """
+    Returns the control search index (IDs of every list, statements of SOURCE_FILE),
+    building it on first use.
+    """
+    global _search
+    if _search is None:
+        lists, _ = get_data()
+        _search = control_search.SearchIndex(lists, control_search.load_statements(SOURCE_FILE),
+                                             sort_key=parse_dotted)
+    return _search
+
+def complete_label(prefix):
+    """
+    Returns the list labels that start with prefix (for tab completion).
+    """
+    lists, _ = get_data()
+    return [label for label in lists if label.lower().startswith(prefix.lower())]
 
 # ----------------------------------------------------------------
 # 2. Define a color lookup (customise as desired)
@@ -42,44 +102,77 @@ color_lookup = {
     "ISO27701": "red",
     "EU AI ACT": "purple",
     "NIST RMF": "orange",
-    "SOC2": "cyan"
+    "SOC2": "cyan",
+    "DORA": "brown",
+    "NIS2": "olive",
+    "ISO27002": "pink"
 }
 
 # ----------------------------------------------------------------
 # 3. Relationship Table Function
 # ----------------------------------------------------------------
+def print_relationship_table(primary, secondary, out=None, transitive=True):
+    """
+    Prints a table of the relationships between the primary and secondary lists
+    to out (default: stdout). Lists without direct relationships are related
+    through the Master controls they share, unless transitive is False.
+    Returns False if the list labels are invalid.
+    """
+    index = get_index()
+    if primary not in index.lists or secondary not in index.lists:
+        print("Invalid list label(s). Please try again.")
+        return False
+    if primary == secondary:
+        print("Primary and secondary lists must be different.")
+        return False
+
+    write_chunks(index.table_lines(primary, secondary, transitive), out)
+    return True
+
 def show_relationship_table():
     """
     Prompts for primary and secondary lists and prints a table of their relationships.
     """
+    lists, _ = get_data()
     print("\nAvailable list labels:")
     for label in lists.keys():
         print("  " + label)
+    print("(Press Tab to complete a label.)")
     print()
-    primary = input("Enter primary list label: ").strip()
-    secondary = input("Enter secondary list label: ").strip()
-    if primary not in lists or secondary not in lists:
-        print("Invalid list label(s). Please try again.")
-        return
-    if primary == secondary:
-        print("Primary and secondary lists must be different.")
-        return
+    primary = control_search.prompt("Enter primary list label: ", complete_label).strip()
+    secondary = control_search.prompt("Enter secondary list label: ", complete_label).strip()
+    print_relationship_table(primary, secondary)
 
-    mapping = {item: set() for item in lists[primary]}
-    for (l1, item1, l2, item2) in relationships:
-        if {l1, l2} == {primary, secondary}:
-            if l1 == primary:
-                mapping[item1].add(item2)
-            else:
-                mapping[item2].add(item1)
-
-    print(f"\nRelationships between {primary} (primary) and {secondary} (associated):")
-    print(f"{primary:<20} | {secondary}")
-    print("-" * 60)
-    for item in lists[primary]:
-        associated = ", ".join(sorted(mapping[item])) if mapping[item] else "-"
-        print(f"{item:<20} | {associated}")
-    print()
+def print_search_results(query, limit=20):
+    """
+    Prints the controls whose ID starts with query, then those whose statement
+    contains its words. Returns the number of results printed (0 for a blank query).
+    """
+    if not query.strip():
+        print("Enter a control ID prefix or keywords to search for.")
+        return 0
+    index = get_search_index()
+    results = index.search(query, limit)
+    for source, item in results:
+        statement = index.statements.get((source, item), "")
+        if len(statement) > 80:
+            statement = statement[:77] + "..."
+        print(f"{source:<12} {item:<12} {statement}")
+    if not results:
+        print(f"No controls match '{query}'.")
+    return len(results)
+
+def search_controls():
+    """
+    Prompts for a control ID prefix or keywords (Tab completes control IDs) and
+    prints the matching controls of every list.
+    """
+    index = get_search_index()
+    query = control_search.prompt("Enter a control ID prefix or keywords (Tab completes IDs): ",
+                                  index.complete_id, delimiters=" ,").strip()
+    if query:
+        print()
+        print_search_results(query)
 
 # ----------------------------------------------------------------
 # 4. Helper function to parse dotted strings naturally.
@@ -104,12 +197,180 @@ def parse_dotted(s):
     return out
 
 # ----------------------------------------------------------------
-# 5. Chord Diagram Function with grouped layout and interactive save.
+# 5. Hierarchy helpers (edge bundling and level of detail).
 # ----------------------------------------------------------------
-def show_chord_diagram():
+def master_domain(item):
+    """
+    Returns the domain prefix of a Master control ID.
+    e.g. "GL-1" -> "GL", "RM-4" -> "RM"
+    """
+    return item.split("-", 1)[0]
+
+def hub_key(source, item):
     """
-    Prompts for list labels (comma separated) or press Enter for ALL.
-    Displays an interactive chord diagram:
+    Returns the hierarchy node an item is bundled through:
+    its Master domain for Master controls, otherwise its whole source list.
+    e.g. ("Master", "GL-1") -> ("Master", "GL"), ("SOC2", "CC1.1") -> ("SOC2", None)
+    """
+    if source == "Master":
+        return (source, master_domain(item))
+    return (source, None)
+
+def clause_group(source, item):
+    """
+    Returns the group an item is collapsed into in the level-of-detail view:
+    its domain for Master controls, otherwise its top-level clause.
+    e.g. ("Master", "GL-1") -> "GL", ("ISO27001", "A.7.4") -> "A.7",
+         ("ISO27701", "6.1.2") -> "6", ("NIST RMF", "Govern 1.2") -> "Govern 1"
+    """
+    if source == "Master":
+        return master_domain(item)
+    parts = item.split(".")
+    if len(parts) > 1 and parts[0].isalpha():
+        return ".".join(parts[:2])
+    return parts[0]
+
+def bspline(ctrl, samples=12):
+    """
+    Samples a uniform cubic B-spline through the control points ctrl, with the
+    end points repeated so that the curve starts and ends exactly on them.
+    Returns a list of (x, y) points.
+    """
+    pts = [ctrl[0]] * 2 + list(ctrl) + [ctrl[-1]] * 2
+    out = []
+    for i in range(len(pts) - 3):
+        (x0, y0), (x1, y1), (x2, y2), (x3, y3) = pts[i:i + 4]
+        for k in range(samples):
+            t = k / samples
+            b0 = (1 - t) ** 3 / 6
+            b1 = (3 * t**3 - 6 * t**2 + 4) / 6
+            b2 = (-3 * t**3 + 3 * t**2 + 3 * t + 1) / 6
+            b3 = t**3 / 6
+            out.append((b0*x0 + b1*x1 + b2*x2 + b3*x3, b0*y0 + b1*y1 + b2*y2 + b3*y3))
+    out.append(ctrl[-1])
+    return out
+
+def compute_bundles(graph, hub_radius=0.55, strength=0.85):
+    """
+    Routes every edge of a laid-out ChordGraph through the hierarchy hubs of its
+    end points (node -> hub -> hub -> node) and groups edges sharing the same pair of hubs.
+    Hubs sit on an inner circle of radius hub_radius at the mean angle of their members.
+    strength (0..1) controls how tightly edges are pulled into their bundle.
+    Returns {(hub_u, hub_v): {"edges": [edge id, ...], "paths": [[(x, y), ...], ...]}}.
+    """
+    pos = graph.positions()
+    node_hub = [hub_key(graph.sources[s], label) for s, label in zip(graph.source, graph.label)]
+    sums = {}
+    for key, (x, y) in zip(node_hub, pos):
+        sx, sy = sums.get(key, (0.0, 0.0))
+        sums[key] = (sx + x, sy + y)
+    hubs = {}
+    for key, (sx, sy) in sums.items():
+        a = math.atan2(sy, sx)
+        hubs[key] = (hub_radius * math.cos(a), hub_radius * math.sin(a))
+
+    bundles = {}
+    for e, (u, v) in enumerate(zip(graph.edge_u, graph.edge_v)):
+        hu = node_hub[u]
+        hv = node_hub[v]
+        if hv < hu:
+            u, v, hu, hv = v, u, hv, hu
+        ctrl = [pos[u], hubs[hu], hubs[hv], pos[v]] if hu != hv else [pos[u], hubs[hu], pos[v]]
+        # Straighten the control polygon towards the direct chord by (1 - strength).
+        (x0, y0), (xn, yn) = ctrl[0], ctrl[-1]
+        n = len(ctrl) - 1
+        ctrl = [
+            (strength * x + (1 - strength) * (x0 + i / n * (xn - x0)),
+             strength * y + (1 - strength) * (y0 + i / n * (yn - y0)))
+            for i, (x, y) in enumerate(ctrl)
+        ]
+        bundle = bundles.setdefault((hu, hv), {"edges": [], "paths": []})
+        bundle["edges"].append(e)
+        bundle["paths"].append(bspline(ctrl))
+    return bundles
+
+# ----------------------------------------------------------------
+# 6. Chord Diagram construction (no GUI required).
+# ----------------------------------------------------------------
+def layout_arrays(node_source, edge_u, edge_v, num_sources, master_idx=None, label_offset=0.05):
+    """
+    Vectorized (NumPy) layout stage. Nodes must be grouped contiguously by source
+    and already sorted within each group; node_source holds each node's source index.
+      • The Master group (master_idx) spans a fixed 90° arc from 135° to 225°.
+      • The other groups share the remaining 250° in source order, with a 5° gap
+        between groups and on each side of the Master arc.
+    Returns a dict of arrays:
+      angle, x, y                     per node, on the unit circle
+      label_x, label_y, label_left    label anchor, offset radially by label_offset
+      edge_source                     source index whose color each edge takes
+      arc_sign                        +1 to bend an edge inwards, -1 for edges spanning > 90°
+    """
+    import numpy as np
+
+    node_source = np.asarray(node_source, dtype=np.intp)
+    edge_u = np.asarray(edge_u, dtype=np.intp)
+    edge_v = np.asarray(edge_v, dtype=np.intp)
+    if master_idx is None:
+        master_idx = -1
+
+    counts = np.bincount(node_source, minlength=num_sources)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    # Position of every node within its group.
+    rank = np.arange(len(node_source)) - starts[node_source]
+
+    gap_rad = math.radians(5)  # Reduced gap between groups (5 degrees)
+    group_start = np.zeros(num_sources)
+    group_span = np.zeros(num_sources)
+    if 0 <= master_idx < num_sources:
+        group_start[master_idx] = math.radians(135)
+        group_span[master_idx] = math.radians(90)
+    non_master = np.flatnonzero((counts > 0) & (np.arange(num_sources) != master_idx))
+    if len(non_master) > 0:
+        total_gap = (len(non_master) - 1) * gap_rad
+        angle_per_group = (math.radians(250) - total_gap) / len(non_master)
+        # The non-master arc starts at 225°+5°
+        group_start[non_master] = math.radians(225) + gap_rad + np.arange(len(non_master)) * (angle_per_group + gap_rad)
+        group_span[non_master] = angle_per_group
+
+    n = counts[node_source]
+    step = group_span[node_source] / np.maximum(n - 1, 1)
+    angle = np.where(n > 1,
+                     group_start[node_source] + rank * step,
+                     group_start[node_source] + group_span[node_source] / 2)
+    angle = np.where(node_source == master_idx, angle, np.mod(angle, 2 * math.pi))
+    x = np.cos(angle)
+    y = np.sin(angle)
+
+    # Edge color: the non-Master end's source, otherwise the end with the larger x.
+    su = node_source[edge_u]
+    sv = node_source[edge_v]
+    edge_source = np.where((su == master_idx) & (sv != master_idx), sv,
+                  np.where((sv == master_idx) & (su != master_idx), su,
+                  np.where(x[edge_u] >= x[edge_v], su, sv)))
+
+    # Arc direction from the wrapped angular distance between the end points.
+    node_angle = np.arctan2(y, x)
+    delta = node_angle[edge_v] - node_angle[edge_u]
+    delta = np.where(delta > math.pi, delta - 2 * math.pi,
+            np.where(delta < -math.pi, delta + 2 * math.pi, delta))
+    arc_sign = np.where(np.abs(delta) > math.pi / 2, -1, 1)
+
+    return {
+        "angle": angle,
+        "x": x,
+        "y": y,
+        "label_x": x * (1 + label_offset),
+        "label_y": y * (1 + label_offset),
+        "label_left": x >= 0,
+        "edge_source": edge_source,
+        "arc_sign": arc_sign,
+    }
+
+@tracing.traced("compute_layout")
+def compute_layout(lists, relationships, selected_sources, master_domains=None, bundled=False,
+                   lod=False, expanded=()):
+    """
+    Builds and lays out the chord diagram for the selected sources as a ChordGraph:
       • "Master" nodes are arranged along a fixed 90° arc on the left (from 135° to 225°).
       • Non‑Master nodes are arranged along the remaining 250° of the circle,
         with a 5° gap on each side between the Master arc and the others.
@@ -117,167 +378,253 @@ def show_chord_diagram():
       • Edge colors are determined as follows:
             - If one node is from Master and the other is not, use the non‑Master node’s color.
             - Otherwise, use the color of the node with the larger x-coordinate.
-      • Node labels are offset radially (no extra vertical offset).
-      • Press 'c' to clear edges, 'r' to restore edges.
-      • Press 's' to save the current diagram: you will be prompted for a file name.
+    If master_domains is given (e.g. {"GL"}), only edges touching a Master control
+    in one of those domains are kept; all nodes are still placed on the circle.
+    If bundled is True, edges are also routed through the Master domain hierarchy
+    (see compute_bundles) and stored in graph.bundles.
+    If lod is True (level of detail), every Master domain and every top-level clause
+    (see clause_group) is collapsed into a single aggregate node, except for the
+    (source, group) pairs in expanded; relationships between collapsed nodes are
+    merged into weighted edges.
+    Returns the graph, or None if there are no edges. The result can be pickled (see layout_cache).
     """
-    print("\nAvailable list labels:")
-    for label in lists.keys():
-        print("  " + label)
-    print()
-    selected_input = input("Enter list labels to include (comma separated) or press Enter for ALL: ").strip()
-    if not selected_input:
-        selected_sources = list(lists.keys())
-    else:
-        selected_sources = [x.strip() for x in selected_input.split(",") if x.strip()]
-    for s in selected_sources:
-        if s not in lists:
-            print(f"Invalid list label: {s}")
-            return
-
-    # Build graph: nodes are "Source: Item"
-    G = nx.Graph()
-    node_to_data = {}
-    for source in selected_sources:
+    # Build graph: each group's nodes are added contiguously, already in natural order.
+    graph = ChordGraph(dict.fromkeys(selected_sources))
+    source_index = {source: i for i, source in enumerate(graph.sources)}
+    node_of = {}  # {(source index, item): node id}
+    for i, source in enumerate(graph.sources):
+        if not lod:
+            for item in sorted(lists[source], key=parse_dotted):
+                node_of[(i, item)] = graph.add_node(i, item)
+            continue
+        groups = {}
         for item in lists[source]:
-            node_id = f"{source}: {item}"
-            G.add_node(node_id)
-            node_to_data[node_id] = (source, item)
+            groups.setdefault(clause_group(source, item), []).append(item)
+        for group in sorted(groups, key=parse_dotted):
+            members = groups[group]
+            if (source, group) in expanded:
+                for item in sorted(members, key=parse_dotted):
+                    node_of[(i, item)] = graph.add_node(i, item)
+            else:
+                node = graph.add_node(i, group, size=len(members), aggregate=True)
+                for item in members:
+                    node_of[(i, item)] = node
+    master_idx = source_index.get("Master")
     for (l1, item1, l2, item2) in relationships:
-        if l1 in selected_sources and l2 in selected_sources:
-            n1 = f"{l1}: {item1}"
-            n2 = f"{l2}: {item2}"
-            if n1 in G and n2 in G:
-                G.add_edge(n1, n2)
-    if G.number_of_edges() == 0:
-        print("No relationships found among the selected lists.")
-        return
+        s1 = source_index.get(l1)
+        s2 = source_index.get(l2)
+        if s1 is None or s2 is None:
+            continue
+        if master_domains is not None:
+            if s1 == master_idx and master_domain(item1) not in master_domains:
+                continue
+            if s2 == master_idx and master_domain(item2) not in master_domains:
+                continue
+            if master_idx not in (s1, s2):
+                continue
+        u = node_of.get((s1, item1))
+        v = node_of.get((s2, item2))
+        if u is not None and v is not None and u != v:
+            graph.add_edge(u, v)
+    if graph.num_edges == 0:
+        return None
 
-    fig, ax = plt.subplots(figsize=(10, 10))
-    ax.set_aspect('equal')
+    source_colors = [color_lookup.get(source, "gray") for source in graph.sources]
+    arrays = layout_arrays(graph.source, graph.edge_u, graph.edge_v,
+                           len(graph.sources), master_idx)
+    graph.angle = arrays["angle"]
+    graph.x = arrays["x"]
+    graph.y = arrays["y"]
+    graph.label_x = arrays["label_x"]
+    graph.label_y = arrays["label_y"]
+    graph.label_left = arrays["label_left"]
+    graph.arc_sign = arrays["arc_sign"]
+    graph.color = [source_colors[s] for s in graph.source]
+    graph.edge_color = [source_colors[s] for s in arrays["edge_source"].tolist()]
 
-    # Group nodes by their source.
-    groups = {}
-    for node in G.nodes():
-        source = node_to_data[node][0]
-        groups.setdefault(source, []).append(node)
-    
-    # Order groups by the order in selected_sources.
-    ordered_sources = [s for s in selected_sources if s in groups]
-
-    pos = {}
-    gap_deg = 5  # Reduced gap between groups (5 degrees)
-    # If "Master" is one of the groups, assign it a fixed 90° arc from 135° to 225°.
-    if "Master" in ordered_sources:
-        master_nodes = sorted(groups["Master"], key=lambda n: parse_dotted(n.split(": ", 1)[1]))
-        nM = len(master_nodes)
-        master_start = math.radians(135)
-        master_end = math.radians(225)
-        if nM > 1:
-            angles_master = [master_start + i*((master_end - master_start)/(nM - 1)) for i in range(nM)]
-        else:
-            angles_master = [math.radians(180)]
-        for i, node in enumerate(master_nodes):
-            pos[node] = (math.cos(angles_master[i]), math.sin(angles_master[i]))
-    
-    # Non-master groups: remaining sources.
-    non_master_sources = [s for s in ordered_sources if s != "Master"]
-    # Total available angle for non-master nodes: 250° (leaving a 5° gap on each side).
-    total_non_master_deg = 250
-    total_non_master_rad = math.radians(total_non_master_deg)
-    gap_rad = math.radians(gap_deg)
-    nGroups = len(non_master_sources)
-    if nGroups > 0:
-        total_gap = (nGroups - 1) * gap_rad
-        angle_per_group = (total_non_master_rad - total_gap) / nGroups
-        # The non-master arc starts at 225°+5°
-        current_start = math.radians(225 + gap_deg)
-        for source in non_master_sources:
-            nodes = sorted(groups[source], key=lambda n: parse_dotted(n.split(": ", 1)[1]))
-            nNodes = len(nodes)
-            group_start = current_start
-            group_end = current_start + angle_per_group
-            if nNodes > 1:
-                angles = [group_start + i*((group_end - group_start)/(nNodes - 1)) for i in range(nNodes)]
-            else:
-                angles = [(group_start + group_end) / 2]
-            for i, node in enumerate(nodes):
-                a = angles[i] % (2 * math.pi)
-                pos[node] = (math.cos(a), math.sin(a))
-            current_start += angle_per_group + gap_rad
-
-    # Precompute node angles (for edge drawing)
-    node_angles = {}
-    for node in G.nodes():
-        x, y = pos[node]
-        node_angles[node] = math.atan2(y, x)
+    if bundled:
+        graph.bundles = compute_bundles(graph)
+        for bundle in graph.bundles.values():
+            bundle["color"] = graph.edge_color[bundle["edges"][0]]
+    return graph
+
+def draw_layout(graph, title=True, figsize=(10, 10), ax=None, scale=1.0):
+    """
+    Draws a ChordGraph laid out by compute_layout on a new figure (or on ax,
+    which is cleared first) without showing it.
+    Node labels are offset radially (no extra vertical offset). Aggregate nodes of
+    the level-of-detail view are drawn larger and labelled with their size, and
+    merged edges are drawn wider according to their weight.
+    scale multiplies font sizes and line widths (e.g. for zoomed-in tiles).
+    If the graph is bundled, every bundle (pair of hubs) is drawn as a single merged
+    path instead of one patch per edge, and edge_artists is keyed by hub pair
+    instead of edge id.
+    Returns (fig, node_artists, edge_artists, node_to_edges, graph), keyed by node id.
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.patches import FancyArrowPatch, Circle, PathPatch
+    from matplotlib.path import Path
+
+    pos = graph.positions()
+
+    if ax is None:
+        fig, ax = plt.subplots(figsize=figsize)
+    else:
+        fig = ax.figure
+        ax.clear()
+    ax.set_aspect('equal')
 
     # Draw nodes & labels (without extra vertical offset)
     node_artists = {}
-    for node, (x, y) in pos.items():
-        source = node_to_data[node][0]
-        col = color_lookup.get(source, "gray")
-        circle = Circle((x, y), 0.015, color=col, zorder=3, picker=True)
-        ax.add_patch(circle)
-        node_artists[node] = circle
-
-        r = math.sqrt(x**2 + y**2)
-        offset_r = 0.05
-        x_label = x + offset_r * (x / r)
-        y_label = y + offset_r * (y / r)
-        ha = 'left' if x >= 0 else 'right'
-        item_label = node.split(": ", 1)[1]
-        ax.text(x_label, y_label, item_label, fontsize=8, ha=ha, va='center', zorder=4)
-
-    # Define edge color logic:
-    # If one node is from Master and the other is not, use the non-master node's color.
-    # Otherwise, use the color of the node with the larger x-coordinate.
-    def get_edge_color(u, v):
-        source_u = node_to_data[u][0]
-        source_v = node_to_data[v][0]
-        if source_u == "Master" and source_v != "Master":
-            return color_lookup.get(source_v, "gray")
-        elif source_v == "Master" and source_u != "Master":
-            return color_lookup.get(source_u, "gray")
-        else:
-            if pos[u][0] >= pos[v][0]:
-                return color_lookup.get(source_u, "gray")
-            else:
-                return color_lookup.get(source_v, "gray")
+    with tracing.span("draw_nodes") as s:
+        for node, (x, y) in enumerate(pos):
+            radius = 0.015
+            label = graph.label[node]
+            if graph.aggregate[node]:
+                radius = 0.025
+                label = f"{label} ({graph.size[node]})"
+            circle = Circle((x, y), radius, color=graph.color[node], zorder=3, picker=True)
+            ax.add_patch(circle)
+            node_artists[node] = circle
+
+            ha = 'left' if graph.label_left[node] else 'right'
+            ax.text(graph.label_x[node], graph.label_y[node], label,
+                    fontsize=8 * scale, ha=ha, va='center', zorder=4)
+        s.add(graph.num_nodes)
 
-    # Draw edges as curved arcs.
     edge_artists = {}
-    node_to_edges = {node: [] for node in G.nodes()}
-    arc_radius = 0.2
-    for u, v in G.edges():
-        edge_color = get_edge_color(u, v)
-        angle_u = node_angles[u]
-        angle_v = node_angles[v]
-        delta = angle_v - angle_u
-        if delta > math.pi:
-            delta -= 2 * math.pi
-        elif delta < -math.pi:
-            delta += 2 * math.pi
-        sign = -1 if abs(delta) > math.pi / 2 else 1
-        conn_style = f"arc3,rad={sign * arc_radius}"
-        edge_patch = FancyArrowPatch(pos[u], pos[v],
-                                     connectionstyle=conn_style,
-                                     arrowstyle='-',
-                                     color=edge_color,
-                                     linewidth=1.5,
-                                     alpha=0.7,
-                                     zorder=1)
-        ax.add_patch(edge_patch)
-        edge_artists[frozenset([u, v])] = edge_patch
-        node_to_edges[u].append(edge_patch)
-        node_to_edges[v].append(edge_patch)
-
-    # Interactivity: clicking on a node toggles its incident edges.
+    node_to_edges = {node: [] for node in range(graph.num_nodes)}
+    with tracing.span("draw_edges", bundled=graph.bundles is not None) as s:
+        if graph.bundles is not None:
+            # Draw each bundle as one merged path (one sub-path per edge).
+            for key, bundle in graph.bundles.items():
+                vertices = []
+                codes = []
+                for path in bundle["paths"]:
+                    vertices.extend(path)
+                    codes.extend([Path.MOVETO] + [Path.LINETO] * (len(path) - 1))
+                bundle_patch = PathPatch(Path(vertices, codes),
+                                         fill=False,
+                                         edgecolor=bundle["color"],
+                                         linewidth=BUNDLE_WIDTH * scale,
+                                         alpha=0.6,
+                                         zorder=1)
+                ax.add_patch(bundle_patch)
+                edge_artists[key] = bundle_patch
+                members = set()
+                for e in bundle["edges"]:
+                    members.add(graph.edge_u[e])
+                    members.add(graph.edge_v[e])
+                for node in members:
+                    node_to_edges[node].append(bundle_patch)
+        else:
+            # Draw edges as curved arcs.
+            arc_radius = 0.2
+            for e, (u, v) in enumerate(zip(graph.edge_u, graph.edge_v)):
+                conn_style = f"arc3,rad={int(graph.arc_sign[e]) * arc_radius}"
+                edge_patch = FancyArrowPatch(pos[u], pos[v],
+                                             connectionstyle=conn_style,
+                                             arrowstyle='-',
+                                             color=graph.edge_color[e],
+                                             linewidth=graph.edge_width(e) * scale,
+                                             alpha=0.7,
+                                             zorder=1)
+                ax.add_patch(edge_patch)
+                edge_artists[e] = edge_patch
+                node_to_edges[u].append(edge_patch)
+                node_to_edges[v].append(edge_patch)
+        s.add(len(edge_artists))
+
+    ax.set_xlim(-1.2, 1.2)
+    ax.set_ylim(-1.2, 1.2)
+    ax.axis('off')
+    if title:
+        ax.set_title(
+            "Interactive Chord Diagram\n"
+            "Click on a node to toggle its edges; press 'c' to clear, 'r' to restore, and 's' to save.",
+            fontsize=12
+        )
+    return fig, node_artists, edge_artists, node_to_edges, graph
+
+def build_chord_figure(lists, relationships, selected_sources, master_domains=None,
+                       title=True, figsize=(10, 10), bundled=False, data_hash=None,
+                       lod=False, expanded=(), ax=None):
+    """
+    Builds the chord diagram for the selected sources on a new figure (or on ax)
+    without showing it (compute_layout followed by draw_layout).
+    If data_hash (the hash of the mapping file, see layout_cache.file_hash) is given,
+    the layout is read from / written to the persistent layout cache, keyed on the
+    data, the selection, the layout options and the code of the rendering modules.
+    Returns (fig, node_artists, edge_artists, node_to_edges, graph), or None if there are no edges.
+    """
+    key = None
+    layout = None
+    if data_hash is not None:
+        key = layout_cache.make_key(data_hash, selected_sources, code=layout_cache.code_hash(),
+                                    master_domains=master_domains, bundled=bundled,
+                                    lod=lod, expanded=set(expanded))
+        layout = layout_cache.load_layout(key)
+    if layout is None:
+        layout = compute_layout(lists, relationships, selected_sources,
+                                master_domains=master_domains, bundled=bundled,
+                                lod=lod, expanded=expanded)
+        if layout is None:
+            return None
+        if key is not None:
+            layout_cache.save_layout(key, layout)
+    return draw_layout(layout, title=title, figsize=figsize, ax=ax)
+
+# ----------------------------------------------------------------
+# 7. Interactive Chord Diagram with interactive save.
+# ----------------------------------------------------------------
+def show_chord(selected_sources, bundled=False, master_domains=None, lod=False):
+    """
+    Displays the chord diagram built by build_chord_figure interactively:
+      • Click on a node to toggle its edges.
+      • Press 'c' to clear edges, 'r' to restore edges.
+      • Press 's' to save the current diagram: you will be prompted for a file name.
+    If lod is True, the diagram starts with every Master domain and top-level clause
+    collapsed into one aggregate node. Clicking an aggregate expands it in place;
+    clicking an expanded control collapses its group again.
+    """
+    import matplotlib.pyplot as plt
+
+    lists, relationships = get_data()
+    data_hash = get_data_hash()
+    state = {"expanded": set()}
+
+    def render(ax=None):
+        built = build_chord_figure(lists, relationships, selected_sources,
+                                   master_domains=master_domains, bundled=bundled,
+                                   data_hash=data_hash, lod=lod,
+                                   expanded=state["expanded"], ax=ax)
+        if built is None:
+            return None
+        (state["fig"], state["node_artists"], state["edge_artists"],
+         state["node_to_edges"], state["graph"]) = built
+        return built
+
+    if render() is None:
+        print("No relationships found among the selected lists.")
+        return
+    fig = state["fig"]
+
+    # Interactivity: clicking on a node toggles its incident edges,
+    # or, in the level-of-detail view, expands/collapses its group.
     def on_pick(event):
-        for node, patch in node_artists.items():
+        for node, patch in state["node_artists"].items():
             if event.artist == patch:
-                for e in node_to_edges[node]:
-                    e.set_visible(not e.get_visible())
+                if lod:
+                    graph = state["graph"]
+                    source = graph.sources[graph.source[node]]
+                    if graph.aggregate[node]:
+                        state["expanded"].add((source, graph.label[node]))
+                    else:
+                        state["expanded"].discard((source, clause_group(source, graph.label[node])))
+                    render(ax=fig.axes[0])
+                else:
+                    for e in state["node_to_edges"][node]:
+                        e.set_visible(not e.get_visible())
                 fig.canvas.draw()
                 break
 
@@ -286,6 +633,7 @@ def show_chord_diagram():
     # Key press: 'c' clears edges, 'r' restores them.
     # Also, pressing 's' will prompt to save the diagram.
     def on_key_press(event):
+        edge_artists = state["edge_artists"]
         if event.key == 'c':
             for e in edge_artists.values():
                 e.set_visible(False)
@@ -298,43 +646,215 @@ def show_chord_diagram():
             # Use a blocking input to ask for file name and format.
             fname = input("Enter file name (with extension .svg or .png): ").strip()
             if fname:
+                # The unmodified diagram (all edges visible) is served from the render cache,
+                # keyed like render_images: code, format and the current window size and dpi.
+                fmt = os.path.splitext(fname)[1].lstrip(".").lower() or "png"
+                render_key = layout_cache.make_key(data_hash, selected_sources,
+                                                   code=layout_cache.code_hash(), format=fmt,
+                                                   master_domains=master_domains,
+                                                   bundled=bundled, lod=lod,
+                                                   expanded=state["expanded"], title=True,
+                                                   size=[round(x, 3) for x in fig.get_size_inches()],
+                                                   dpi=fig.dpi)
+                unmodified = all(e.get_visible() for e in edge_artists.values())
                 try:
+                    if unmodified and layout_cache.load_render(render_key, fmt, fname):
+                        print(f"Diagram saved as '{fname}' (from cache).")
+                        return
                     plt.savefig(fname)
+                    if unmodified:
+                        layout_cache.save_render(render_key, fmt, fname)
                     print(f"Diagram saved as '{fname}'.")
                 except Exception as ex:
                     print("Error saving file:", ex)
 
     fig.canvas.mpl_connect('key_press_event', on_key_press)
 
-    ax.set_xlim(-1.2, 1.2)
-    ax.set_ylim(-1.2, 1.2)
-    ax.axis('off')
-    plt.title(
-        "Interactive Chord Diagram\n"
-        "Click on a node to toggle its edges; press 'c' to clear, 'r' to restore, and 's' to save.",
-        fontsize=12
-    )
     plt.show()
 
+def save_chord(selected_sources, fname, bundled=False, master_domains=None, title=True, lod=False):
+    """
+    Renders the chord diagram on the non-GUI Agg backend and saves it to fname.
+    Returns False if there is nothing to draw.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    lists, relationships = get_data()
+    built = build_chord_figure(lists, relationships, selected_sources,
+                               master_domains=master_domains, title=title,
+                               bundled=bundled, data_hash=get_data_hash(), lod=lod)
+    if built is None:
+        print("No relationships found among the selected lists.")
+        return False
+    built[0].savefig(fname)
+    plt.close(built[0])
+    print(f"Diagram saved as '{fname}'.")
+    return True
+
+def show_chord_diagram():
+    """
+    Prompts for list labels (comma separated) or press Enter for ALL,
+    then displays the interactive chord diagram (see show_chord).
+    """
+    lists, _ = get_data()
+    print("\nAvailable list labels:")
+    for label in lists.keys():
+        print("  " + label)
+    print("(Press Tab to complete a label.)")
+    print()
+    selected_input = control_search.prompt(
+        "Enter list labels to include (comma separated) or press Enter for ALL: ", complete_label).strip()
+    if not selected_input:
+        selected_sources = list(lists.keys())
+    else:
+        selected_sources = [x.strip() for x in selected_input.split(",") if x.strip()]
+    for s in selected_sources:
+        if s not in lists:
+            print(f"Invalid list label: {s}")
+            return
+
+    bundled = input("Bundle edges through the Master domains? (y/N): ").strip().lower() == 'y'
+    lod = input("Start with domains and clauses collapsed? (y/N): ").strip().lower() == 'y'
+    show_chord(selected_sources, bundled=bundled, lod=lod)
+
 # ----------------------------------------------------------------
-# 7. Main CLI
+# 8. Main CLI
 # ----------------------------------------------------------------
-def main():
+def interactive_menu():
     while True:
         print("\nSelect an option:")
         print("  1) Show table of relationships between two lists")
         print("  2) Show interactive chord diagram for selected lists")
-        print("  3) Quit")
-        choice = input("Enter choice (1/2/3): ").strip()
+        print("  3) Search controls by ID prefix or keyword")
+        print("  4) Quit")
+        choice = input("Enter choice (1/2/3/4): ").strip()
         if choice == '1':
             show_relationship_table()
         elif choice == '2':
             show_chord_diagram()
         elif choice == '3':
+            search_controls()
+        elif choice == '4':
             print("Exiting application.")
             break
         else:
             print("Invalid option. Please try again.\n")
 
+def main(argv=None):
+    """
+    Without a command, runs the interactive menu. For scripting:
+      python governance_map.py table PRIMARY SECONDARY [--out FILE] [--direct]
+      python governance_map.py tables [--out DIR] [--format csv|txt] [--direct]
+      python governance_map.py diagram [LIST ...] [--domains GL,RM] [--bundled] [--lod] [--save FILE]
+      python governance_map.py export FILE.html|FILE.svg [LIST ...] [--domains GL,RM] [--bundled] [--lod]
+    """
+    global DATA_FILE
+    parser = argparse.ArgumentParser(description="Governance Mega-Map")
+    parser.add_argument("--data", default=DATA_FILE, help="Mapping JSON file")
+    subparsers = parser.add_subparsers(dest="command", help="Command to run (default: interactive menu)")
+
+    table_parser = subparsers.add_parser("table", help="Print the relationships between two lists")
+    table_parser.add_argument("primary", help="Primary list label")
+    table_parser.add_argument("secondary", help="Secondary list label")
+    table_parser.add_argument("--out", metavar="FILE", help="Write the table to FILE instead of the terminal")
+    table_parser.add_argument("--direct", action="store_true",
+                              help="Only show direct relationships, not those through Master")
+
+    tables_parser = subparsers.add_parser("tables", help="Write the tables for every pair of lists")
+    tables_parser.add_argument("--out", metavar="PATH",
+                               help="Output directory (default: tables), or .xlsx file with --format xlsx "
+                                    "(default: crosswalks.xlsx)")
+    tables_parser.add_argument("--format", choices=["csv", "txt", "xlsx"], default="csv",
+                               help="Output format (default: csv); xlsx writes one workbook with a sheet per pair")
+    tables_parser.add_argument("--direct", action="store_true",
+                               help="Only include direct relationships, not those through Master")
+
+    search_parser = subparsers.add_parser("search", help="Find controls by ID prefix or statement keywords")
+    search_parser.add_argument("query", nargs="+", help="Control ID prefix (e.g. A.7.4, RM-) or keywords")
+    search_parser.add_argument("--limit", type=int, default=20, help="Maximum number of results (default: 20)")
+
+    diagram_parser = subparsers.add_parser("diagram", help="Show or save a chord diagram")
+    diagram_parser.add_argument("lists", nargs="*", help="List labels to include (default: ALL)")
+    diagram_parser.add_argument("--domains", help="Only draw edges of these Master domains (comma separated)")
+    diagram_parser.add_argument("--bundled", action="store_true", help="Bundle edges through the Master domains")
+    diagram_parser.add_argument("--lod", action="store_true",
+                                help="Start with Master domains and top-level clauses collapsed")
+    diagram_parser.add_argument("--no-title", action="store_true", help="Omit the diagram title")
+    diagram_parser.add_argument("--save", metavar="FILE", help="Save to FILE (.png/.svg) without opening a window")
+
+    export_parser = subparsers.add_parser("export", help="Export a self-contained interactive HTML/SVG diagram")
+    export_parser.add_argument("file", help="Output file (.html or .svg)")
+    export_parser.add_argument("lists", nargs="*", help="List labels to include (default: ALL)")
+    export_parser.add_argument("--domains", help="Only draw edges of these Master domains (comma separated)")
+    export_parser.add_argument("--bundled", action="store_true", help="Bundle edges through the Master domains")
+    export_parser.add_argument("--lod", action="store_true",
+                               help="Collapse Master domains and top-level clauses into aggregate nodes")
+
+    args = parser.parse_args(argv)
+    DATA_FILE = args.data
+
+    if args.command == "table":
+        if args.out:
+            with open(args.out, 'w', encoding='utf-8') as f:
+                ok = print_relationship_table(args.primary, args.secondary, out=f,
+                                              transitive=not args.direct)
+            if ok:
+                print(f"Table saved as '{args.out}'.")
+            return 0 if ok else 1
+        return 0 if print_relationship_table(args.primary, args.secondary,
+                                             transitive=not args.direct) else 1
+
+    if args.command == "search":
+        return 0 if print_search_results(" ".join(args.query), args.limit) else 1
+
+    if args.command == "tables":
+        if args.format == "xlsx":
+            out = args.out or "crosswalks.xlsx"
+            try:
+                summary = write_workbook(get_index(), out, transitive=not args.direct)
+            except ImportError:
+                print("Writing .xlsx files requires the openpyxl package.")
+                return 1
+            print(f"Wrote {len(summary)} tables ({sum(row[3] for row in summary)} rows) to '{out}'.")
+            return 0
+        out = args.out or "tables"
+        paths = write_all_tables(get_index(), out, fmt=args.format, transitive=not args.direct)
+        print(f"Wrote {len(paths)} tables to '{out}'.")
+        return 0
+
+    if args.command in ("diagram", "export"):
+        lists, relationships = get_data()
+        selected_sources = args.lists or list(lists.keys())
+        for s in selected_sources:
+            if s not in lists:
+                print(f"Invalid list label: {s}")
+                return 1
+        master_domains = None
+        if args.domains:
+            master_domains = {d.strip() for d in args.domains.split(",") if d.strip()}
+        if args.command == "export":
+            import html_export
+            graph = compute_layout(lists, relationships, selected_sources,
+                                   master_domains=master_domains, bundled=args.bundled, lod=args.lod)
+            if graph is None:
+                print("No relationships found among the selected lists.")
+                return 1
+            size = html_export.write_interactive(graph, args.file)
+            print(f"Interactive diagram saved as '{args.file}' ({size // 1024} KB).")
+            return 0
+        if args.save:
+            ok = save_chord(selected_sources, args.save, bundled=args.bundled,
+                            master_domains=master_domains, title=not args.no_title,
+                            lod=args.lod)
+            return 0 if ok else 1
+        show_chord(selected_sources, bundled=args.bundled, master_domains=master_domains,
+                   lod=args.lod)
+        return 0
+
+    interactive_menu()
+    return 0
+
 if __name__ == '__main__':
-    main()
+    raise SystemExit(main())
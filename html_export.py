@@ -0,0 +1,142 @@
+"""
+Self-contained interactive SVG/HTML export of the chord diagram.
+
+Writes the layout computed by governance_map.compute_layout (same positions,
+colors, arcs, bundles and level-of-detail aggregates) as a single file with
+inline SVG and a small embedded script, so the diagram can be explored in a
+browser without Python:
+  • Click on a node to toggle its edges.
+  • Press 'c' (or the Clear button) to clear edges, 'r' (or Restore) to restore them.
+The file is kept small by sharing definitions: one <circle> definition reused
+for every node, one CSS class per color instead of per-element styles, and
+coordinates rounded to one decimal (whole units for sampled bundle splines).
+"""
+
+import html
+
+from chord_graph import BUNDLE_WIDTH, EDGE_WIDTH
+
+# The diagram is drawn in data coordinates [-1.2, 1.2] (see draw_layout),
+# mapped onto a VIEW_SIZE x VIEW_SIZE SVG view box with y pointing down.
+VIEW_SIZE = 1000
+_SCALE = VIEW_SIZE / 2.4
+
+SCRIPT = """
+(function () {
+  var svg = document.getElementById('chord');
+  var edges = svg.querySelectorAll('.e');
+  function setAll(hidden) {
+    for (var i = 0; i < edges.length; i++) edges[i].classList.toggle('off', hidden);
+  }
+  svg.addEventListener('click', function (ev) {
+    var node = ev.target.closest('.n');
+    if (!node) return;
+    var id = ' ' + node.getAttribute('data-id') + ' ';
+    for (var i = 0; i < edges.length; i++) {
+      if ((' ' + edges[i].getAttribute('data-n') + ' ').indexOf(id) >= 0) edges[i].classList.toggle('off');
+    }
+  });
+  document.addEventListener('keydown', function (ev) {
+    if (ev.key === 'c') setAll(true);
+    else if (ev.key === 'r') setAll(false);
+  });
+  window.chordClear = function () { setAll(true); };
+  window.chordRestore = function () { setAll(false); };
+})();
+"""
+
+def _xy(x, y, digits=1):
+    return f"{(x + 1.2) * _SCALE:.{digits}f} {(1.2 - y) * _SCALE:.{digits}f}"
+
+def _arc3_control(p1, p2, rad):
+    """
+    Returns the quadratic Bezier control point matplotlib's "arc3,rad=..." uses
+    between p1 and p2.
+    """
+    (x1, y1), (x2, y2) = p1, p2
+    return ((x1 + x2) / 2 + rad * (y2 - y1), (y1 + y2) / 2 - rad * (x2 - x1))
+
+def build_svg(graph, title=None):
+    """
+    Returns the <svg> element (as a string) for a ChordGraph laid out by compute_layout.
+    """
+    pos = graph.positions()
+    colors = sorted(set(graph.color) | set(graph.edge_color))
+    color_class = {c: f"c{i}" for i, c in enumerate(colors)}
+
+    out = [f'<svg id="chord" xmlns="http://www.w3.org/2000/svg" '
+           f'xmlns:xlink="http://www.w3.org/1999/xlink" viewBox="0 0 {VIEW_SIZE} {VIEW_SIZE}">']
+    out.append("<style>")
+    out.append("path.e{fill:none;stroke-opacity:.7}.e.off{display:none}.n{cursor:pointer}"
+               "text{font:11px sans-serif;dominant-baseline:middle}")
+    for c, cls in color_class.items():
+        out.append(f".{cls}{{fill:{c};stroke:{c}}}")
+    out.append("</style>")
+    out.append('<defs><circle id="d" r="6.3"/><circle id="D" r="10.4"/></defs>')
+    if title:
+        out.append(f'<text x="{VIEW_SIZE / 2}" y="20" text-anchor="middle">{html.escape(title)}</text>')
+
+    # Edges first, so nodes are drawn on top.
+    out.append(f'<g stroke-width="{BUNDLE_WIDTH if graph.bundles is not None else EDGE_WIDTH}">')
+    if graph.bundles is not None:
+        for bundle in graph.bundles.values():
+            members = set()
+            d = []
+            for e, path in zip(bundle["edges"], bundle["paths"]):
+                members.add(graph.edge_u[e])
+                members.add(graph.edge_v[e])
+                # Sampled splines: whole units are plenty, and pairs after M are implicit L.
+                d.append("M" + " ".join(_xy(x, y, 0) for x, y in path))
+            nodes = " ".join(str(n) for n in sorted(members))
+            out.append(f'<path class="e {color_class[bundle["color"]]}" data-n="{nodes}" d="{"".join(d)}"/>')
+    else:
+        for e, (u, v) in enumerate(zip(graph.edge_u, graph.edge_v)):
+            cx, cy = _arc3_control(pos[u], pos[v], int(graph.arc_sign[e]) * 0.2)
+            width = graph.edge_width(e)
+            style = f' stroke-width="{width:.1f}"' if width != EDGE_WIDTH else ""
+            out.append(f'<path class="e {color_class[graph.edge_color[e]]}" data-n="{u} {v}"{style} '
+                       f'd="M{_xy(*pos[u])} Q{_xy(cx, cy)} {_xy(*pos[v])}"/>')
+    out.append("</g>")
+
+    out.append("<g>")
+    for node, (x, y) in enumerate(pos):
+        label = graph.label[node]
+        shape = "#d"
+        if graph.aggregate[node]:
+            label = f"{label} ({graph.size[node]})"
+            shape = "#D"
+        px, py = _xy(x, y).split()
+        lx, ly = _xy(graph.label_x[node], graph.label_y[node]).split()
+        anchor = "start" if graph.label_left[node] else "end"
+        out.append(f'<g class="n {color_class[graph.color[node]]}" data-id="{node}">'
+                   f'<use xlink:href="{shape}" x="{px}" y="{py}"/>'
+                   f'<text x="{lx}" y="{ly}" text-anchor="{anchor}" fill="black" stroke="none">'
+                   f'{html.escape(label)}</text></g>')
+    out.append("</g>")
+    out.append("<script><![CDATA[" + SCRIPT + "]]></script>")
+    out.append("</svg>")
+    return "\n".join(out)
+
+def write_interactive(graph, fname, title="Interactive Chord Diagram"):
+    """
+    Writes graph to fname as a standalone interactive .svg, or as an .html page
+    with Clear/Restore buttons for any other extension.
+    Returns the size of the written file in bytes.
+    """
+    if fname.lower().endswith(".svg"):
+        content = '<?xml version="1.0" encoding="UTF-8"?>\n' + build_svg(graph, title=title) + "\n"
+    else:
+        content = (
+            "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+            f"<title>{html.escape(title)}</title>"
+            "<style>body{margin:0;font-family:sans-serif;text-align:center}"
+            "svg{max-width:100vmin;max-height:90vh}</style></head><body>\n"
+            f"<h3>{html.escape(title)}</h3>"
+            "<p>Click on a node to toggle its edges; press 'c' to clear and 'r' to restore. "
+            "<button onclick=\"chordClear()\">Clear</button> "
+            "<button onclick=\"chordRestore()\">Restore</button></p>\n"
+            + build_svg(graph) + "\n</body></html>\n"
+        )
+    with open(fname, "w", encoding="utf-8") as f:
+        f.write(content)
+    return len(content.encode("utf-8"))
@@ -0,0 +1,175 @@
+"""
+Persistent cache for chord diagram layouts and rendered images.
+
+Entries are keyed on (mapping file hash, selected sources, style parameters):
+  • layouts (node positions, edge colors/arcs and bundled edge paths, as produced
+    by governance_map.compute_layout) are pickled to <CACHE_DIR>/layouts/,
+  • rendered PNG/SVG output is stored as-is in <CACHE_DIR>/renders/.
+The MAX_MEMORY_LAYOUTS most recently used layouts are also kept in memory.
+The on-disk cache is bounded by MAX_CACHE_BYTES; the least recently used
+entries (by modification time, refreshed on every hit) are evicted first.
+"""
+
+import os
+import json
+import pickle
+import shutil
+import hashlib
+from collections import OrderedDict
+
+CACHE_DIR = os.environ.get("CHORD_CACHE_DIR", ".chord_cache")
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+MAX_MEMORY_LAYOUTS = 32
+
+# Modules whose code determines a rendered image (see code_hash).
+RENDER_MODULES = ("governance_map.py", "chord_graph.py", "layout_cache.py", "render_images.py")
+
+# {key: layout}, least recently used first.
+_memory = OrderedDict()
+
+def file_hash(path):
+    """
+    Returns the SHA-256 hex digest of a file's contents.
+    """
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def code_hash(modules=RENDER_MODULES):
+    """
+    Returns one hash over the source of the rendering modules (found next to
+    this file), so a change to any of them invalidates the rendered images.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    h = hashlib.sha256()
+    for name in modules:
+        h.update(name.encode())
+        h.update(file_hash(os.path.join(here, name)).encode())
+    return h.hexdigest()
+
+def _normalize(value):
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"Cannot use {type(value).__name__} in a cache key")
+
+def make_key(data_hash, selected_sources, **style):
+    """
+    Returns the cache key for a selection of sources drawn with the given style
+    parameters (e.g. master_domains, bundled, title, figsize, dpi). Pass
+    code=code_hash() so that edits to the rendering modules invalidate the entry.
+    """
+    payload = json.dumps([data_hash, list(selected_sources), style],
+                         sort_keys=True, default=_normalize)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def _path(kind, name):
+    return os.path.join(CACHE_DIR, kind, name)
+
+def _touch(path):
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+def _write_atomic(path, write):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+def _remember(key, layout):
+    _memory[key] = layout
+    _memory.move_to_end(key)
+    while len(_memory) > MAX_MEMORY_LAYOUTS:
+        _memory.popitem(last=False)
+
+def load_layout(key):
+    """
+    Returns the cached layout for key, or None.
+    """
+    if key in _memory:
+        _memory.move_to_end(key)
+        return _memory[key]
+    path = _path("layouts", key + ".pkl")
+    try:
+        with open(path, 'rb') as f:
+            layout = pickle.load(f)
+    except (FileNotFoundError, pickle.UnpicklingError, EOFError):
+        return None
+    _touch(path)
+    _remember(key, layout)
+    return layout
+
+def save_layout(key, layout):
+    """
+    Stores a layout in memory and on disk.
+    """
+    _remember(key, layout)
+    try:
+        _write_atomic(_path("layouts", key + ".pkl"),
+                      lambda f: pickle.dump(layout, f, protocol=pickle.HIGHEST_PROTOCOL))
+        evict()
+    except OSError as e:
+        print(f"Warning: could not write layout cache: {e}")
+
+def load_render(key, fmt, dest):
+    """
+    Copies the cached render for (key, fmt) to dest.
+    Returns True on a cache hit, False otherwise.
+    """
+    path = _path("renders", f"{key}.{fmt}")
+    if not os.path.exists(path):
+        return False
+    shutil.copyfile(path, dest)
+    _touch(path)
+    return True
+
+def save_render(key, fmt, src):
+    """
+    Stores a copy of the rendered file src in the cache.
+    """
+    try:
+        with open(src, 'rb') as src_file:
+            _write_atomic(_path("renders", f"{key}.{fmt}"),
+                          lambda f: shutil.copyfileobj(src_file, f))
+        evict()
+    except OSError as e:
+        print(f"Warning: could not write render cache: {e}")
+
+def evict(max_bytes=MAX_CACHE_BYTES):
+    """
+    Deletes the least recently used cache files until the cache fits in max_bytes.
+    Returns the number of files deleted.
+    """
+    entries = []
+    total = 0
+    for kind in ("layouts", "renders"):
+        directory = os.path.join(CACHE_DIR, kind)
+        if not os.path.isdir(directory):
+            continue
+        for entry in os.scandir(directory):
+            if entry.is_file():
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+    deleted = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        deleted += 1
+    return deleted
+
+def clear():
+    """
+    Removes every cached layout and render.
+    """
+    _memory.clear()
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
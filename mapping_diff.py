@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Compact deltas between two versions of a mapping JSON file.
+
+Both versions are loaded with every string interned (sys.intern), so the
+relationship tuples of both versions share their strings, and the diff is a
+pair of set differences over the hashed tuples. The delta only holds what changed:
+  {
+    "from": "<hash of the old mapping>", "to": "<hash of the new mapping>",
+    "lists": {"SOC2": {"added": ["CC9.3"], "removed": []}, ...},
+    "relationships": {"added": [["Master", "GL-1", "SOC2", "CC9.3"]], "removed": [...]},
+    "tables": {"added": [["ISO27001", "5.1", "SOC2", "CC9.3"]], "removed": [...]}
+  }
+"lists" only names the lists that changed (a list that no longer exists also
+has "deleted": true; one that became empty stays, as an empty list). "tables" holds the rows that changed
+in the pair tables (the crosswalk CSVs written by governance_map.py tables, with
+non-Master pairs joined through Master). Only the tables touched by the change
+are compared. standards_mapper.py apply_delta inserts and deletes exactly these
+rows, so a database update costs the size of the change, not a full import.
+
+The hashes are computed over the sorted lists and relationships, so a delta
+can be applied to any file with the same content, whatever its order.
+
+Usage:
+  python mapping_diff.py diff OLD.json NEW.json [--out delta.json]
+  python mapping_diff.py apply delta.json [--data control_mapping.json] [--out new.json]
+"""
+
+import sys
+import json
+import hashlib
+import argparse
+
+from relationship_index import HUB, RelationshipIndex, affected_tables
+
+def load_mapping(json_file):
+    """
+    Returns (lists, relationships) of a mapping JSON file with every string
+    interned; relationships is a set of (list1, item1, list2, item2) tuples.
+    """
+    with open(json_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    lists = {sys.intern(name): [sys.intern(item) for item in items]
+             for name, items in data["lists"].items()}
+    relationships = {tuple(map(sys.intern, rel)) for rel in data["relationships"]}
+    return lists, relationships
+
+def mapping_hash(lists, relationships):
+    """
+    Returns the order-independent hash of a mapping.
+    """
+    h = hashlib.sha256()
+    for name in sorted(lists):
+        h.update(json.dumps([name, sorted(lists[name])]).encode())
+    for rel in sorted({tuple(r) for r in relationships}):
+        h.update(json.dumps(rel).encode())
+    return h.hexdigest()
+
+def _table_rows(index, primary, secondary):
+    if primary not in index.lists or secondary not in index.lists:
+        return set()
+    return {(primary, item, secondary, related)
+            for item, items in index.iter_mapping(primary, secondary) for related in items}
+
+def diff(old_lists, old_relationships, new_lists, new_relationships, hub=HUB):
+    """
+    Returns the delta (see the module docstring) between two mappings.
+    """
+    lists = {}
+    for name in list(new_lists) + [n for n in old_lists if n not in new_lists]:
+        old_items = set(old_lists.get(name, ()))
+        new_items = set(new_lists.get(name, ()))
+        if old_items != new_items or (name in old_lists) != (name in new_lists):
+            lists[name] = {"added": [i for i in new_lists.get(name, ()) if i not in old_items],
+                           "removed": [i for i in old_lists.get(name, ()) if i not in new_items]}
+            if name not in new_lists:
+                lists[name]["deleted"] = True
+    added = new_relationships - old_relationships
+    removed = old_relationships - new_relationships
+
+    old_index = RelationshipIndex(old_lists, old_relationships, hub)
+    new_index = RelationshipIndex(new_lists, new_relationships, hub)
+    rows_added, rows_removed = [], []
+    for primary, secondary in affected_tables(new_lists, set(lists), added | removed, hub):
+        old_rows = _table_rows(old_index, primary, secondary)
+        new_rows = _table_rows(new_index, primary, secondary)
+        rows_added.extend(sorted(new_rows - old_rows))
+        rows_removed.extend(sorted(old_rows - new_rows))
+
+    return {
+        "from": mapping_hash(old_lists, old_relationships),
+        "to": mapping_hash(new_lists, new_relationships),
+        "lists": lists,
+        "relationships": {"added": [list(r) for r in sorted(added)],
+                          "removed": [list(r) for r in sorted(removed)]},
+        "tables": {"added": [list(r) for r in rows_added],
+                   "removed": [list(r) for r in rows_removed]},
+    }
+
+def apply(data, delta):
+    """
+    Applies a delta to a mapping ({"lists": ..., "relationships": ...}) in place,
+    keeping the order of what is left and appending what is added. Lists that
+    become empty are kept; only lists the delta marks as deleted are removed.
+    Raises ValueError (and changes nothing) if the mapping is not the one the
+    delta was made from, or if the result is not the one it was made to.
+    """
+    if mapping_hash(data["lists"], data["relationships"]) != delta["from"]:
+        raise ValueError("the mapping is not the one this delta was made from")
+    lists = dict(data["lists"])
+    for name, change in delta["lists"].items():
+        if change.get("deleted"):
+            lists.pop(name, None)
+            continue
+        removed = set(change["removed"])
+        lists[name] = [i for i in lists.get(name, ()) if i not in removed] + change["added"]
+    removed = {tuple(r) for r in delta["relationships"]["removed"]}
+    relationships = ([r for r in data["relationships"] if tuple(r) not in removed]
+                     + delta["relationships"]["added"])
+    if mapping_hash(lists, relationships) != delta["to"]:
+        raise ValueError("applying the delta does not give the mapping it was made to")
+    data["lists"] = lists
+    data["relationships"] = relationships
+
+def summary(delta):
+    """
+    Returns a one-line description of a delta.
+    """
+    added = sum(len(c["added"]) for c in delta["lists"].values())
+    removed = sum(len(c["removed"]) for c in delta["lists"].values())
+    return (f"controls +{added} -{removed}, "
+            f"relationships +{len(delta['relationships']['added'])} -{len(delta['relationships']['removed'])}, "
+            f"table rows +{len(delta['tables']['added'])} -{len(delta['tables']['removed'])}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two mapping JSON files, or apply a delta")
+    subparsers = parser.add_subparsers(dest="command", help="Command to run")
+
+    diff_parser = subparsers.add_parser("diff", help="Write the delta between two mapping files")
+    diff_parser.add_argument("old", help="Old mapping JSON file")
+    diff_parser.add_argument("new", help="New mapping JSON file")
+    diff_parser.add_argument("--out", help="Write the delta to this JSON file")
+
+    apply_parser = subparsers.add_parser("apply", help="Apply a delta to a mapping file")
+    apply_parser.add_argument("delta", help="Delta JSON file")
+    apply_parser.add_argument("--data", default="control_mapping.json", help="Mapping JSON file to update")
+    apply_parser.add_argument("--out", help="Write the result here instead of updating --data")
+    args = parser.parse_args()
+
+    if args.command == "diff":
+        delta = diff(*load_mapping(args.old), *load_mapping(args.new))
+        print(summary(delta))
+        if args.out:
+            with open(args.out, 'w', encoding='utf-8') as f:
+                json.dump(delta, f, indent=2, ensure_ascii=False)
+            print(f"Delta saved as '{args.out}'.")
+    elif args.command == "apply":
+        with open(args.delta, 'r', encoding='utf-8') as f:
+            delta = json.load(f)
+        with open(args.data, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        try:
+            apply(data, delta)
+        except ValueError as e:
+            print(f"Cannot apply {args.delta} to {args.data}: {e}.")
+            return 1
+        out = args.out or args.data
+        with open(out, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+        print(f"{summary(delta)}; saved as '{out}'.")
+    else:
+        parser.print_help()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Merges several mapping JSON files into one graph.
+
+The mapping from conversion.py (Master <-> ISO27001, ...) and the one from
+dora_map.py (DORA/NIS2 <-> ISO27001/ISO27002) use different notations and
+editions: the workbook numbers ISO 27001 Annex A controls as in the 2013
+edition ("A.5.1" ... "A.18.2.2"), while the DORA tables use the 2022 edition
+("Annex A 5.31"). The same number means a different control in each edition
+(2022 "Annex A 6.1" is Screening, 2013 "A.6.1" is Internal organisation), so the
+default table gives the 2022 Annex A IDs their own namespace ("A.5.31 (2022)")
+and only joins the management-system clauses ("6.1.2", "9.1"), which are numbered
+the same in both. Before the union, every list name and control ID goes through
+the canonicalization table (canonical_ids.json):
+  "lists"    list name -> canonical list name
+  "ids"      list name (or "*" for every list) -> [[regex, replacement], ...],
+             applied in order with re.sub
+  "aliases"  list name -> {control ID: canonical control ID}, applied last
+Whitespace (including non-breaking spaces) is collapsed first. Each distinct
+(list, ID) pair is canonicalized once and interned, so merging is a single
+linear pass. Lists keep the order in which their items are first seen, and
+relationships are deduplicated regardless of direction.
+
+The merged file works wherever control_mapping.json does, e.g.
+  python governance_map.py --data merged_mapping.json diagram Master ISO27001 DORA NIS2
+  python governance_map.py --data merged_mapping.json tables --out crosswalks
+
+Usage:
+  python merge_mappings.py control_mapping.json control_mapping_dora.json [--out merged_mapping.json]
+"""
+
+import re
+import sys
+import json
+import argparse
+
+CANONICAL_TABLE = "canonical_ids.json"
+
+class Canonicalizer:
+    def __init__(self, table=None):
+        table = table or {}
+        self.list_names = table.get("lists", {})
+        self.rules = {name: [(re.compile(pattern), replacement) for pattern, replacement in rules]
+                      for name, rules in table.get("ids", {}).items()}
+        self.aliases = table.get("aliases", {})
+        self._cache = {}
+
+    def list_name(self, name):
+        name = " ".join(name.split())
+        return sys.intern(self.list_names.get(name, name))
+
+    def control(self, list_name, item):
+        """
+        Returns the canonical, interned ID of a control of a (canonical) list.
+        """
+        key = (list_name, item)
+        if key not in self._cache:
+            result = " ".join(item.split())
+            for pattern, replacement in self.rules.get("*", []) + self.rules.get(list_name, []):
+                result = pattern.sub(replacement, result)
+            result = self.aliases.get(list_name, {}).get(result, result)
+            self._cache[key] = sys.intern(result)
+        return self._cache[key]
+
+def load_table(path=CANONICAL_TABLE):
+    """
+    Loads the canonicalization table; a missing file means no renaming.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        print(f"Warning: {path} not found, merging the IDs as they are.")
+        return {}
+
+def merge(mappings, canonicalizer):
+    """
+    Returns the union of mappings ({"lists": ..., "relationships": ...}) as one
+    deduplicated mapping, plus the number of duplicate relationships dropped.
+    """
+    lists = {}
+    seen = set()
+    relationships = []
+    duplicates = 0
+    for data in mappings:
+        for name, items in data["lists"].items():
+            name = canonicalizer.list_name(name)
+            target = lists.setdefault(name, {})
+            for item in items:
+                item = canonicalizer.control(name, item)
+                if item:
+                    target[item] = None
+        for l1, item1, l2, item2 in data["relationships"]:
+            l1, l2 = canonicalizer.list_name(l1), canonicalizer.list_name(l2)
+            item1, item2 = canonicalizer.control(l1, item1), canonicalizer.control(l2, item2)
+            if not item1 or not item2 or (l1, item1) == (l2, item2):
+                continue
+            key = (l1, item1, l2, item2) if (l1, item1) <= (l2, item2) else (l2, item2, l1, item1)
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            relationships.append([l1, item1, l2, item2])
+            # Controls only named in a relationship still become nodes.
+            lists.setdefault(l1, {})[item1] = None
+            lists.setdefault(l2, {})[item2] = None
+    return {"lists": {name: list(items) for name, items in lists.items()},
+            "relationships": relationships}, duplicates
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge mapping JSON files into one graph")
+    parser.add_argument("files", nargs="+", help="Mapping JSON files to merge")
+    parser.add_argument("--table", default=CANONICAL_TABLE,
+                        help=f"Canonicalization table (default: {CANONICAL_TABLE})")
+    parser.add_argument("--out", default="merged_mapping.json", help="Output JSON file (default: merged_mapping.json)")
+    args = parser.parse_args()
+
+    mappings = []
+    for path in args.files:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            mappings.append({"lists": data["lists"], "relationships": data["relationships"]})
+        except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
+            print(f"Error: Could not load mapping from {path}: {e}")
+            return 1
+
+    merged, duplicates = merge(mappings, Canonicalizer(load_table(args.table)))
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(merged, f, indent=4, ensure_ascii=False)
+    for name, items in merged["lists"].items():
+        print(f"{name:<12} {len(items):>5} controls")
+    print(f"{len(merged['relationships'])} relationships ({duplicates} duplicates dropped); "
+          f"saved as '{args.out}'.")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
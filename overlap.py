@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Framework overlap and similarity metrics.
+
+Builds the Master-control x framework-item incidence once, as NumPy index
+arrays (one entry per link), and derives every metric from it in bulk:
+  • shared_masters[A, B]  number of Master controls linked to both lists
+                          (the Master list counts as linked to all of its controls),
+  • jaccard[A, B]         shared_masters / number of Master controls linked to A or B,
+  • shared_items[A, B]    number of items of A related to any item of B through
+                          a Master control (the transitive pairs of governance_csv),
+  • fan_out[m, F]         number of items of framework F linked to Master control m,
+  • fan_in[item]          number of Master controls linked to a framework item,
+plus min/mean/median/max summaries of the fan-in and fan-out distributions.
+Relationships that do not involve the Master list are not part of the overlap.
+
+Results are written as CSV matrices and tables and as one JSON document for
+dashboards. The JSON records the hash of the mapping file, and a manifest in the
+output directory records the hash each file was computed from, so an export
+whose files all exist and were computed from the current mapping file is
+skipped (unless --force).
+
+Usage:
+  python overlap.py                            # print the Jaccard matrix
+  python overlap.py --out analytics            # also write CSV and JSON files to analytics/
+  python overlap.py --out analytics --format json
+"""
+
+import os
+import csv
+import json
+import argparse
+
+import numpy as np
+
+import governance_map
+import layout_cache
+from relationship_index import HUB
+
+JSON_NAME = "overlap.json"
+CSV_NAMES = ["jaccard.csv", "shared_masters.csv", "shared_items.csv", "fan_out.csv", "fan_in.csv"]
+MANIFEST_NAME = ".overlap_manifest.json"
+
+def build_incidence(lists, relationships, hub=HUB):
+    """
+    Returns the incidence of Master controls and framework items as a dict with:
+      names      list names, Master first
+      controls   Master control IDs
+      offsets    column offsets: the items of names[k] (k >= 1) are columns
+                 offsets[k - 1]:offsets[k] of the framework columns
+      items      (framework, item) per column
+      master     Master control index per link
+      column     framework column per link
+    Duplicate links are counted once.
+    """
+    names = [hub] + [name for name in lists if name != hub]
+    controls = list(lists.get(hub, []))
+    control_idx = {c: i for i, c in enumerate(controls)}
+    column_idx = {}
+    items = []
+    offsets = [0]
+    for name in names[1:]:
+        for item in lists[name]:
+            column_idx.setdefault((name, item), len(items))
+            items.append((name, item))
+        offsets.append(len(items))
+
+    master, column = [], []
+    for l1, item1, l2, item2 in relationships:
+        if l2 == hub:
+            l1, item1, l2, item2 = l2, item2, l1, item1
+        if l1 != hub or l2 == hub:
+            continue
+        m = control_idx.get(item1)
+        c = column_idx.get((l2, item2))
+        if m is not None and c is not None:
+            master.append(m)
+            column.append(c)
+
+    links = np.unique(np.array(master, dtype=np.int64) * len(items) + np.array(column, dtype=np.int64))
+    return {
+        "names": names,
+        "controls": controls,
+        "offsets": np.array(offsets),
+        "items": items,
+        "master": links // max(len(items), 1),
+        "column": links % max(len(items), 1),
+    }
+
+def compute_overlap(inc):
+    """
+    Computes the overlap matrices and degree statistics from an incidence.
+    Returns a dict of NumPy arrays (see the module docstring) keyed by metric name.
+    """
+    names, offsets = inc["names"], inc["offsets"]
+    n_lists, n_controls, n_items = len(names), len(inc["controls"]), len(inc["items"])
+    master, column = inc["master"], inc["column"]
+    # Framework (row index in names, 1-based for non-Master lists) of every column and link.
+    column_list = np.repeat(np.arange(1, n_lists), np.diff(offsets))
+    link_list = column_list[column]
+
+    # linked[k, m]: Master control m is linked to list k (Master itself: all controls).
+    linked = np.zeros((n_lists, n_controls), dtype=bool)
+    linked[0] = True
+    linked[link_list, master] = True
+    counts = linked.astype(np.int64)
+    shared_masters = counts @ counts.T
+    sizes = np.diag(shared_masters)
+    union = sizes[:, None] + sizes[None, :] - shared_masters
+    jaccard = np.divide(shared_masters, union, out=np.zeros(union.shape), where=union > 0)
+
+    # hit[c, k]: framework column c is related through some Master control to list k.
+    hit = np.zeros((n_items, n_lists), dtype=bool)
+    np.logical_or.at(hit, column, linked[:, master].T)
+    cumulative = np.vstack([np.zeros((1, n_lists), dtype=np.int64), np.cumsum(hit, axis=0)])
+    shared_items = np.zeros((n_lists, n_lists), dtype=np.int64)
+    shared_items[1:] = cumulative[offsets[1:]] - cumulative[offsets[:-1]]
+    # Master row: controls linked to each list.
+    shared_items[0] = linked.sum(axis=1)
+
+    fan_out = np.zeros((n_controls, n_lists), dtype=np.int64)
+    np.add.at(fan_out, (master, link_list), 1)
+    fan_out[:, 0] = fan_out.sum(axis=1)
+    fan_in = np.bincount(column, minlength=n_items)
+
+    return {
+        "shared_masters": shared_masters,
+        "jaccard": jaccard,
+        "shared_items": shared_items,
+        "fan_out": fan_out,
+        "fan_in": fan_in,
+    }
+
+def _stats(values):
+    if len(values) == 0:
+        return {"min": 0, "mean": 0.0, "median": 0.0, "max": 0}
+    return {"min": int(values.min()), "mean": round(float(values.mean()), 3),
+            "median": float(np.median(values)), "max": int(values.max())}
+
+def degree_stats(inc, metrics):
+    """
+    Returns {list name: {"fan_out": stats, "fan_in": stats}}: the distribution of
+    the number of items each Master control links to in the list, and of the
+    number of Master controls linked to each item of the list.
+    For the Master list, fan_out counts links to all frameworks and fan_in is omitted.
+    """
+    offsets = inc["offsets"]
+    stats = {}
+    for k, name in enumerate(inc["names"]):
+        entry = {"fan_out": _stats(metrics["fan_out"][:, k])}
+        if k > 0:
+            entry["fan_in"] = _stats(metrics["fan_in"][offsets[k - 1]:offsets[k]])
+        stats[name] = entry
+    return stats
+
+def _write_matrix(path, names, matrix, fmt="{}"):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow([""] + names)
+        for name, row in zip(names, matrix.tolist()):
+            writer.writerow([name] + [fmt.format(v) for v in row])
+
+def export(inc, metrics, out_dir, fmt="both", data_hash=None):
+    """
+    Writes the metrics to out_dir as CSV files and/or overlap.json, and records
+    data_hash for each of them in the manifest. Returns the list of written paths.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    names = inc["names"]
+    paths = []
+    if fmt in ("csv", "both"):
+        for metric, number_fmt in (("jaccard", "{:.4f}"), ("shared_masters", "{}"), ("shared_items", "{}")):
+            path = os.path.join(out_dir, f"{metric}.csv")
+            _write_matrix(path, names, metrics[metric], number_fmt)
+            paths.append(path)
+
+        path = os.path.join(out_dir, "fan_out.csv")
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["Master control", "Total"] + names[1:])
+            for control, row in zip(inc["controls"], metrics["fan_out"].tolist()):
+                writer.writerow([control] + row)
+        paths.append(path)
+
+        path = os.path.join(out_dir, "fan_in.csv")
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["List", "Item", "Master controls"])
+            for (name, item), degree in zip(inc["items"], metrics["fan_in"].tolist()):
+                writer.writerow([name, item, degree])
+        paths.append(path)
+
+    if fmt in ("json", "both"):
+        path = os.path.join(out_dir, JSON_NAME)
+        document = {
+            "data_hash": data_hash,
+            "lists": names,
+            "jaccard": np.round(metrics["jaccard"], 4).tolist(),
+            "shared_masters": metrics["shared_masters"].tolist(),
+            "shared_items": metrics["shared_items"].tolist(),
+            "degree_stats": degree_stats(inc, metrics),
+            "fan_out": {c: row for c, row in zip(inc["controls"], metrics["fan_out"].tolist())},
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+        paths.append(path)
+
+    manifest = load_manifest(out_dir)
+    manifest.update({os.path.basename(path): data_hash for path in paths})
+    with open(os.path.join(out_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return paths
+
+def output_names(fmt):
+    """
+    Returns the names of the files an export in format fmt writes.
+    """
+    names = []
+    if fmt in ("csv", "both"):
+        names += CSV_NAMES
+    if fmt in ("json", "both"):
+        names.append(JSON_NAME)
+    return names
+
+def load_manifest(out_dir):
+    """
+    Loads the {file name: data hash} manifest of previous exports, if any.
+    """
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def is_current(out_dir, data_hash, fmt="both"):
+    """
+    Returns True if every file of an export in format fmt exists in out_dir and
+    was computed from the mapping with data_hash.
+    """
+    manifest = load_manifest(out_dir)
+    return all(manifest.get(name) == data_hash and os.path.exists(os.path.join(out_dir, name))
+               for name in output_names(fmt))
+
+def print_matrix(names, matrix):
+    width = max(len(n) for n in names) + 1
+    print(" " * width + "".join(f"{n[:9]:>10}" for n in names))
+    for name, row in zip(names, matrix.tolist()):
+        print(f"{name:<{width}}" + "".join(f"{v:>10.3f}" for v in row))
+
+def main():
+    parser = argparse.ArgumentParser(description="Pairwise overlap metrics between the frameworks")
+    parser.add_argument("--data", default="control_mapping.json", help="Mapping JSON file")
+    parser.add_argument("--out", help="Write CSV/JSON results to this directory")
+    parser.add_argument("--format", choices=["csv", "json", "both"], default="both",
+                        help="Output format for --out (default: both)")
+    parser.add_argument("--force", action="store_true", help="Recompute even if the mapping has not changed")
+    args = parser.parse_args()
+
+    data_hash = layout_cache.file_hash(args.data)
+    if args.out and not args.force and is_current(args.out, data_hash, args.format):
+        print(f"Up to date: {args.out}")
+        return 0
+
+    lists, relationships = governance_map.load_data(args.data)
+    inc = build_incidence(lists, relationships)
+    metrics = compute_overlap(inc)
+    print("Jaccard similarity of the Master controls linked to each list:")
+    print_matrix(inc["names"], metrics["jaccard"])
+    if args.out:
+        paths = export(inc, metrics, args.out, fmt=args.format, data_hash=data_hash)
+        print(f"Wrote {len(paths)} files to '{args.out}'.")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
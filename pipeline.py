@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Cached, dependency-aware rebuild pipeline.
+
+Each stage declares the command it runs, the files (or folders) it reads and
+the files (or folders) it writes:
+  convert   Source Data.xlsx          -> control_mapping.json      (conversion.py)
+  csv       control_mapping.json      -> crosswalks/*.csv          (governance_map.py tables)
+  import    crosswalks/               -> the mapping database      (standards_mapper.py import_dir)
+  images    control_mapping.json      -> generated_images/         (render_images.py)
+The import stage needs a database (DB_CONNECTION_STRING in standards_mapper.py),
+so it is optional: it only runs when it is named on the command line.
+A stage depends on every stage that writes one of its inputs. Its fingerprint
+is the hash of its command and the contents of its inputs (including its own
+script); a stage is skipped when its fingerprint matches the last successful
+run and its outputs are unchanged since. Stages whose dependencies are done run
+in parallel, e.g. the CSV export alongside the image rendering.
+
+State is kept in .pipeline_state.json. Per-stage timings are printed at the end.
+
+Usage:
+  python pipeline.py                  # run every stage that is out of date (except import)
+  python pipeline.py images           # run only the given stages (and what they depend on)
+  python pipeline.py import           # export the CSVs and import them into the database
+  python pipeline.py --skip images    # run everything but the image rendering
+  python pipeline.py --force          # rerun stages even if they are up to date
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import layout_cache
+import tracing
+
+STATE_FILE = ".pipeline_state.json"
+CSV_DIR = "crosswalks"
+
+STAGES = [
+    {
+        "name": "convert",
+        "command": [sys.executable, "conversion.py"],
+        "inputs": ["Source Data.xlsx", "conversion.py"],
+        "outputs": ["control_mapping.json"],
+    },
+    {
+        # Same CSVs as governance_csv.py, but in their own folder so that
+        # import_dir does not also pick up "Source Data.csv".
+        "name": "csv",
+        "command": [sys.executable, "governance_map.py", "tables", "--out", CSV_DIR],
+        "inputs": ["control_mapping.json", "governance_map.py", "relationship_index.py"],
+        "outputs": [CSV_DIR],
+    },
+    {
+        "name": "import",
+        "command": [sys.executable, "standards_mapper.py", "import_dir", CSV_DIR],
+        "inputs": [CSV_DIR, "standards_mapper.py"],
+        "outputs": [],
+        "optional": True,
+    },
+    {
+        "name": "images",
+        "command": [sys.executable, "render_images.py"],
+        "inputs": ["control_mapping.json", "render_specs.json", "render_images.py",
+                   "governance_map.py", "chord_graph.py", "layout_cache.py"],
+        "outputs": ["generated_images"],
+    },
+]
+
+def content_hash(path):
+    """
+    Returns the hash of a file, or of every file in a folder (names and contents,
+    skipping hidden files such as manifests), or "missing".
+    """
+    if os.path.isfile(path):
+        return layout_cache.file_hash(path)
+    if not os.path.isdir(path):
+        return "missing"
+    h = hashlib.sha256()
+    for root, dirs, files in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        for name in sorted(f for f in files if not f.startswith(".")):
+            file_path = os.path.join(root, name)
+            h.update(os.path.relpath(file_path, path).encode())
+            h.update(layout_cache.file_hash(file_path).encode())
+    return h.hexdigest()
+
+def fingerprint(stage):
+    h = hashlib.sha256(json.dumps(stage["command"][1:]).encode())
+    for path in stage["inputs"]:
+        h.update(path.encode())
+        h.update(content_hash(path).encode())
+    return h.hexdigest()
+
+def dependencies(stages):
+    """
+    Returns {stage name: set of names of the stages that write one of its inputs}.
+    """
+    writers = {path: stage["name"] for stage in stages for path in stage["outputs"]}
+    return {stage["name"]: {writers[p] for p in stage["inputs"] if p in writers and writers[p] != stage["name"]}
+            for stage in stages}
+
+def load_state():
+    try:
+        with open(STATE_FILE, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_state(state):
+    with open(STATE_FILE, 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+def is_current(stage, state):
+    previous = state.get(stage["name"])
+    if not previous or previous.get("fingerprint") != fingerprint(stage):
+        return False
+    return all(previous.get("outputs", {}).get(p) == content_hash(p) for p in stage["outputs"])
+
+def run_stage(stage):
+    """
+    Runs a stage's command. Returns (returncode, combined output, seconds).
+    """
+    start = time.perf_counter()
+    with tracing.span(f"stage:{stage['name']}"):
+        result = subprocess.run(stage["command"], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    return result.returncode, result.stdout, time.perf_counter() - start
+
+def run_pipeline(stages=STAGES, selected=None, skip=(), force=False, jobs=None):
+    """
+    Runs the out-of-date stages (of selected and their dependencies, default all
+    but the optional ones) in dependency order, in parallel where possible.
+    Returns {stage name: (status, seconds)} with status "ran", "up to date",
+    "failed", "blocked" (a dependency failed) or "skipped" (--skip).
+    """
+    by_name = {stage["name"]: stage for stage in stages}
+    deps = dependencies(stages)
+    wanted = set(selected or (stage["name"] for stage in stages if not stage.get("optional")))
+    pending = list(wanted)
+    while pending:
+        for dep in deps[pending.pop()]:
+            if dep not in wanted:
+                wanted.add(dep)
+                pending.append(dep)
+
+    state = load_state()
+    results = {name: ("skipped", 0.0) for name in wanted if name in skip}
+    running = {}
+    with ThreadPoolExecutor(max_workers=jobs or len(stages)) as pool:
+        while True:
+            for stage in stages:
+                name = stage["name"]
+                if name not in wanted or name in results or name in running.values():
+                    continue
+                if any(results.get(d, ("",))[0] in ("failed", "blocked") for d in deps[name]):
+                    results[name] = ("blocked", 0.0)
+                    print(f"[{name}] blocked: a stage it depends on failed")
+                    continue
+                if not all(results.get(d, ("",))[0] in ("ran", "up to date", "skipped") for d in deps[name]):
+                    continue
+                if not force and is_current(stage, state):
+                    results[name] = ("up to date", 0.0)
+                    print(f"[{name}] up to date")
+                    continue
+                print(f"[{name}] running: {' '.join(stage['command'][1:])}")
+                running[pool.submit(run_stage, stage)] = name
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                stage = by_name[name]
+                returncode, output, seconds = future.result()
+                for line in output.splitlines():
+                    print(f"[{name}] {line}")
+                if returncode == 0:
+                    results[name] = ("ran", seconds)
+                    state[name] = {"fingerprint": fingerprint(stage),
+                                   "outputs": {p: content_hash(p) for p in stage["outputs"]},
+                                   "seconds": round(seconds, 3)}
+                    save_state(state)
+                else:
+                    results[name] = ("failed", seconds)
+                    print(f"[{name}] failed with exit code {returncode}")
+    return results
+
+def print_timings(results, stages=STAGES):
+    print(f"\n{'Stage':<10} | {'Status':<10} | Seconds")
+    print("-" * 36)
+    total = 0.0
+    for stage in stages:
+        if stage["name"] in results:
+            status, seconds = results[stage["name"]]
+            total += seconds
+            print(f"{stage['name']:<10} | {status:<10} | {seconds:7.2f}")
+    print(f"{'total':<10} | {'':<10} | {total:7.2f}  (stage time; parallel stages overlap)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the mapping, crosswalk CSVs, database and images")
+    names = [stage["name"] for stage in STAGES]
+    parser.add_argument("stages", nargs="*", metavar="STAGE",
+                        help=f"Stages to run, with their dependencies (default: all of {', '.join(names)} "
+                             "except the optional import)")
+    parser.add_argument("--skip", action="append", default=[], choices=names, help="Do not run this stage")
+    parser.add_argument("--force", action="store_true", help="Rerun stages even if they are up to date")
+    parser.add_argument("--jobs", type=int, default=None, help="Maximum number of stages to run at once")
+    args = parser.parse_args()
+    for name in args.stages:
+        if name not in names:
+            print(f"Unknown stage: {name}")
+            return 1
+
+    results = run_pipeline(selected=args.stages, skip=set(args.skip), force=args.force, jobs=args.jobs)
+    print_timings(results)
+    return 1 if any(status in ("failed", "blocked") for status, _ in results.values()) else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,227 @@
+"""
+Indexed relationship tables.
+
+RelationshipIndex is built with a single pass over the relationships and keeps
+a per-pair adjacency index:
+  adjacency[(from_list, to_list)] = {item: set(related items)}
+(every relationship is indexed in both directions), so a table between any two
+lists is a dictionary lookup per row instead of a scan of every relationship.
+Pairs that are not linked directly are joined through the Master list the same
+way governance_csv does it: an item maps to every secondary item that shares a
+Master control with it.
+
+Tables are produced as generators of lines and written in chunks, so large
+tables stream to the terminal or a file without being built in memory first,
+and write_all_tables generates every table from the same index.
+write_workbook streams every table into one .xlsx workbook instead (one sheet
+per pair plus a summary sheet), using openpyxl's write-only mode. The exports
+go through iter_mapping, which does not keep the tables, so beyond the index
+itself they hold one item's relationships at a time.
+"""
+
+import os
+import sys
+import csv
+from itertools import combinations
+
+import tracing
+
+HUB = "Master"
+CHUNK_LINES = 512
+SHEET_NAME_CHARS = 31
+
+class RelationshipIndex:
+    def __init__(self, lists, relationships, hub=HUB):
+        self.lists = lists
+        self.hub = hub
+        self.adjacency = {}
+        for l1, item1, l2, item2 in relationships:
+            self.adjacency.setdefault((l1, l2), {}).setdefault(item1, set()).add(item2)
+            self.adjacency.setdefault((l2, l1), {}).setdefault(item2, set()).add(item1)
+
+    def mapping(self, primary, secondary, transitive=True):
+        """
+        Returns {primary item: sorted tuple of related secondary items} for every
+        item of the primary list. With transitive=True, items of two non-Master
+        lists are also related through the Master controls they share.
+        """
+        return dict(self.iter_mapping(primary, secondary, transitive))
+
+    def iter_mapping(self, primary, secondary, transitive=True):
+        """
+        Yields the (primary item, sorted tuple of related secondary items) pairs
+        of mapping() one item at a time, without keeping them, so exports of
+        every table hold one item's relationships at a time.
+        """
+        direct = self.adjacency.get((primary, secondary), {})
+        through_hub = transitive and self.hub in self.lists and self.hub not in (primary, secondary)
+        to_hub = self.adjacency.get((primary, self.hub), {})
+        from_hub = self.adjacency.get((self.hub, secondary), {})
+        for item in dict.fromkeys(self.lists[primary]):
+            related = set(direct.get(item, ()))
+            if through_hub:
+                for hub_item in to_hub.get(item, ()):
+                    related.update(from_hub.get(hub_item, ()))
+            yield item, tuple(sorted(related))
+
+    def table_lines(self, primary, secondary, transitive=True):
+        """
+        Yields the lines (with trailing newlines) of the text table between two lists.
+        """
+        yield f"\nRelationships between {primary} (primary) and {secondary} (associated):\n"
+        yield f"{primary:<20} | {secondary}\n"
+        yield "-" * 60 + "\n"
+        for item, related in self.iter_mapping(primary, secondary, transitive):
+            yield f"{item:<20} | {', '.join(related) if related else '-'}\n"
+        yield "\n"
+
+def affected_tables(lists, changed_lists, changed_relationships, hub=HUB):
+    """
+    Returns the (primary, secondary) tables whose content may have changed:
+    tables of a changed list, and tables whose direct or Master-linked
+    relationships changed.
+    """
+    changed_pairs = {frozenset((l1, l2)) for l1, _, l2, _ in changed_relationships}
+    tables = []
+    for primary, secondary in combinations(lists, 2):
+        touched = (primary in changed_lists or secondary in changed_lists
+                   or frozenset((primary, secondary)) in changed_pairs)
+        if not touched and hub not in (primary, secondary):
+            touched = (frozenset((primary, hub)) in changed_pairs
+                       or frozenset((secondary, hub)) in changed_pairs)
+        if touched:
+            tables.append((primary, secondary))
+    return tables
+
+def write_chunks(lines, out=None, chunk_lines=CHUNK_LINES):
+    """
+    Writes an iterable of lines to out (default: stdout), chunk_lines at a time.
+    """
+    out = out or sys.stdout
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_lines:
+            out.write("".join(chunk))
+            out.flush()
+            chunk.clear()
+    if chunk:
+        out.write("".join(chunk))
+        out.flush()
+
+def write_csv(index, primary, secondary, out, transitive=True):
+    """
+    Writes the table between two lists as CSV rows, in the format of governance_csv.
+    Returns the number of rows written (without the header).
+    """
+    writer = csv.writer(out)
+    writer.writerow([primary, secondary])
+    rows = []
+    count = 0
+    for row in table_rows(index, primary, secondary, transitive):
+        rows.append(row)
+        count += 1
+        if len(rows) >= CHUNK_LINES:
+            writer.writerows(rows)
+            rows.clear()
+    writer.writerows(rows)
+    return count
+
+def write_table_file(index, primary, secondary, out_dir, fmt="csv", transitive=True):
+    """
+    Writes the table between two lists to out_dir as <primary>_vs_<secondary>.csv
+    (or .txt with fmt="txt"). Returns the written path.
+    """
+    path = os.path.join(out_dir, f"{primary}_vs_{secondary}.{fmt}")
+    with open(path, 'w', newline='', encoding='utf-8') as f, tracing.span("write_table", file=path) as s:
+        if fmt == "csv":
+            s.add(write_csv(index, primary, secondary, f, transitive))
+        else:
+            write_chunks(index.table_lines(primary, secondary, transitive), f)
+            # One line per primary item.
+            s.add(len(dict.fromkeys(index.lists[primary])))
+    return path
+
+def table_rows(index, primary, secondary, transitive=True):
+    """
+    Yields the [primary item, secondary item] rows of a table, in the format of
+    governance_csv (a primary item without relationships gets one row with "").
+    Rows are produced from iter_mapping, so nothing is kept once they are written.
+    """
+    for item, related in index.iter_mapping(primary, secondary, transitive):
+        if related:
+            for r in related:
+                yield [item, r]
+        else:
+            yield [item, ""]
+
+def sheet_title(primary, secondary, used):
+    """
+    Returns a unique Excel sheet name (at most 31 characters, without the
+    characters Excel does not allow) for the table between two lists.
+    """
+    title = f"{primary} vs {secondary}"
+    for ch in "[]:*?/\\":
+        title = title.replace(ch, "-")
+    title = title[:SHEET_NAME_CHARS]
+    n = 2
+    while title.lower() in used:
+        suffix = f" ({n})"
+        title = title[:SHEET_NAME_CHARS - len(suffix)] + suffix
+        n += 1
+    used.add(title.lower())
+    return title
+
+def _header_cells(sheet, titles):
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+
+    cells = []
+    for title in titles:
+        cell = WriteOnlyCell(sheet, value=title)
+        cell.font = Font(bold=True)
+        cells.append(cell)
+    return cells
+
+def write_workbook(index, path, transitive=True):
+    """
+    Writes the table for every pair of lists to one .xlsx workbook: a Summary
+    sheet with the row counts of every pair, then one sheet per pair.
+    Rows are streamed with openpyxl's write-only mode. Returns the summary rows
+    [(sheet, primary, secondary, rows, unmapped items)].
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    summary_sheet = wb.create_sheet("Summary")
+    used = {"summary"}
+
+    summary = []
+    for primary, secondary in combinations(index.lists.keys(), 2):
+        title = sheet_title(primary, secondary, used)
+        sheet = wb.create_sheet(title)
+        sheet.append(_header_cells(sheet, [primary, secondary]))
+        rows = unmapped = 0
+        with tracing.span("write_sheet", sheet=title) as s:
+            for row in table_rows(index, primary, secondary, transitive):
+                sheet.append(row)
+                rows += 1
+                unmapped += row[1] == ""
+            s.add(rows)
+        summary.append((title, primary, secondary, rows, unmapped))
+
+    summary_sheet.append(_header_cells(summary_sheet, ["Sheet", "Primary", "Secondary", "Rows", "Unmapped items"]))
+    for row in summary:
+        summary_sheet.append(list(row))
+    with tracing.span("save_workbook", file=path):
+        wb.save(path)
+    return summary
+
+def write_all_tables(index, out_dir, fmt="csv", transitive=True):
+    """
+    Writes the table for every pair of lists to out_dir (see write_table_file).
+    Returns the list of written paths.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    return [write_table_file(index, primary, secondary, out_dir, fmt, transitive)
+            for primary, secondary in combinations(index.lists.keys(), 2)]
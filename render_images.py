@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Headless batch renderer for the chord diagram images.
+
+Renders a list of render specs (see render_specs.json) on the non-GUI Agg
+backend across a process pool. Each spec is a JSON object:
+  {
+    "output": "GL_controls_only.png",   # file name inside the output directory
+    "sources": ["Master", "ISO27001"],  # lists to include, null for ALL
+    "master_domains": ["GL"],           # optional: only draw edges of these Master domains
+    "title": true,                      # optional: draw the diagram title (default true)
+    "size": 10,                         # optional: figure size in inches (default 10)
+    "dpi": 100,                         # optional: output resolution (default 100)
+    "format": "png",                    # optional: defaults to the output file extension
+    "bundled": false                    # optional: bundle edges through the Master domains
+  }
+
+Specs whose output is already current (same mapping data, same spec and same
+rendering code as the last render) are skipped.
+
+Usage:
+  python render_images.py                        # Render everything in render_specs.json
+  python render_images.py --jobs 4 --force       # Re-render all specs on 4 processes
+"""
+
+import os
+import json
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+import governance_map
+import layout_cache
+import tracing
+
+MANIFEST_NAME = ".render_manifest.json"
+
+def load_specs(specs_file="render_specs.json"):
+    """
+    Loads the list of render specs from a JSON file.
+    """
+    with open(specs_file, 'r') as f:
+        return json.load(f)
+
+def spec_fingerprint(spec, data_hash, code_hash):
+    """
+    Fingerprints a spec together with the mapping data and rendering code it depends on.
+    """
+    h = hashlib.sha256()
+    h.update(data_hash.encode())
+    h.update(code_hash.encode())
+    h.update(json.dumps(spec, sort_keys=True).encode())
+    return h.hexdigest()
+
+def load_manifest(out_dir):
+    """
+    Loads the {output: fingerprint} manifest of previous renders, if any.
+    """
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_manifest(out_dir, manifest):
+    with open(os.path.join(out_dir, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+_data_cache = {}
+
+def render_spec(spec, json_file, out_dir, data_hash, code_hash, dest=None, force=False):
+    """
+    Renders a single spec to out_dir (or to dest, if given). Runs inside a worker process.
+    Layouts and rendered output are reused from layout_cache when available, unless
+    force is set, in which case both are recomputed (and the cached render replaced).
+    The image is written to a temporary file and moved into place, so the
+    output is never left half written.
+    Returns the output path, or None if the selection has no relationships.
+    """
+    with tracing.span("render_spec", output=spec["output"]):
+        out_path = _render_spec(spec, json_file, out_dir, data_hash, code_hash, dest, force)
+    tracing.write_trace()
+    return out_path
+
+def _render_spec(spec, json_file, out_dir, data_hash, code_hash, dest=None, force=False):
+    # Keyed on the data hash too, so long-lived workers (see watch.py) pick up changes.
+    if (json_file, data_hash) not in _data_cache:
+        _data_cache.clear()
+        _data_cache[(json_file, data_hash)] = governance_map.load_data(json_file)
+    lists, relationships = _data_cache[(json_file, data_hash)]
+
+    sources = spec.get("sources") or list(lists.keys())
+    for s in sources:
+        if s not in lists:
+            raise ValueError(f"Invalid list label: {s}")
+    domains = spec.get("master_domains")
+    size = spec.get("size", 10)
+    out_path = dest or os.path.join(out_dir, spec["output"])
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    fmt = spec.get("format") or os.path.splitext(spec["output"])[1].lstrip(".") or "png"
+
+    style = {k: v for k, v in spec.items() if k not in ("output", "sources")}
+    render_key = layout_cache.make_key(data_hash, sources, code=code_hash, format=fmt, **style)
+    if not force and layout_cache.load_render(render_key, fmt, tmp_path):
+        os.replace(tmp_path, out_path)
+        return out_path
+
+    built = governance_map.build_chord_figure(
+        lists, relationships, sources,
+        master_domains=set(domains) if domains else None,
+        title=spec.get("title", True),
+        figsize=(size, size),
+        bundled=spec.get("bundled", False),
+        data_hash=None if force else data_hash,
+    )
+    if built is None:
+        return None
+    fig = built[0]
+    with tracing.span("savefig", format=fmt):
+        fig.savefig(tmp_path, format=fmt, dpi=spec.get("dpi", 100))
+    plt.close(fig)
+    layout_cache.save_render(render_key, fmt, tmp_path)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+def render_all(specs, json_file="control_mapping.json", out_dir="generated_images",
+               jobs=None, force=False):
+    """
+    Renders every spec that is not already current, in parallel.
+    Returns (rendered_count, skipped_count, failed_count).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    data_hash = layout_cache.file_hash(json_file)
+    code_hash = layout_cache.code_hash()
+    manifest = load_manifest(out_dir)
+
+    pending = {}
+    skipped = 0
+    for spec in specs:
+        fingerprint = spec_fingerprint(spec, data_hash, code_hash)
+        out_path = os.path.join(out_dir, spec["output"])
+        if not force and manifest.get(spec["output"]) == fingerprint and os.path.exists(out_path):
+            print(f"Up to date: {out_path}")
+            skipped += 1
+            continue
+        pending[spec["output"]] = (spec, fingerprint)
+
+    rendered = 0
+    failed = 0
+    if pending:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {
+                pool.submit(render_spec, spec, json_file, out_dir, data_hash, code_hash, force=force): name
+                for name, (spec, _) in pending.items()
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    out_path = future.result()
+                except Exception as e:
+                    print(f"Error rendering {name}: {e}")
+                    failed += 1
+                    continue
+                if out_path is None:
+                    print(f"No relationships found for {name}; nothing rendered.")
+                    failed += 1
+                    continue
+                print(f"Rendered: {out_path}")
+                manifest[name] = pending[name][1]
+                rendered += 1
+        save_manifest(out_dir, manifest)
+
+    print(f"{rendered} rendered, {skipped} up to date, {failed} failed.")
+    return rendered, skipped, failed
+
+def main():
+    parser = argparse.ArgumentParser(description="Render chord diagram images without a GUI")
+    parser.add_argument("--specs", default="render_specs.json", help="JSON file with the list of render specs")
+    parser.add_argument("--data", default="control_mapping.json", help="Mapping JSON file")
+    parser.add_argument("--out", default="generated_images", help="Output directory")
+    parser.add_argument("--jobs", type=int, default=None, help="Number of worker processes (default: all cores)")
+    parser.add_argument("--force", action="store_true", help="Re-render specs even if their output is current")
+    args = parser.parse_args()
+
+    specs = load_specs(args.specs)
+    render_all(specs, json_file=args.data, out_dir=args.out, jobs=args.jobs, force=args.force)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Control-reference scanner for policy documents.
+
+Streams the paragraphs out of every .docx and .pdf file in a folder and finds
+every control ID from control_mapping.json in a single pass per paragraph,
+using an Aho-Corasick automaton built over all the IDs. A match only counts if
+it is a whole ID: "GL-1" does not match inside "GL-10", and "5.1" does not match
+inside "A.5.1" or "5.1.2". Documents are scanned in parallel, and the result
+is a control -> (document, paragraph) index:
+  {
+    "controls": {"Master": {"GL-1": [["AI Governance Policy.docx", "¶3"], ...]}, ...},
+    "documents": {"AI Governance Policy.docx": {"Master": ["GL-1", ...]}, ...},
+    "unreferenced": {"Master": ["TP-2", ...], ...}
+  }
+.docx paragraphs are numbered in document order (¶n); PDF paragraphs are
+numbered per page (p3 ¶2) and need the pypdf package.
+
+Note that framework clause numbers such as "4.1" also match section numbers in
+the text, so restricting the scan to the Master list (--lists Master) is
+usually what a coverage check wants.
+
+Usage:
+  python scan_documents.py [DIR] [--lists Master] [--out index.json] [--jobs N]
+"""
+
+import os
+import re
+import json
+import zipfile
+import argparse
+from collections import deque
+from xml.etree import ElementTree
+from concurrent.futures import ProcessPoolExecutor
+
+import governance_map
+
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+EXTENSIONS = (".docx", ".pdf")
+
+class Automaton:
+    """
+    Aho-Corasick automaton over a set of patterns. Each pattern maps to a list
+    of values (e.g. the (list, control) pairs that share an ID).
+    """
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+        for pattern, values in patterns.items():
+            state = 0
+            for ch in pattern:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                state = nxt
+            self.out[state].append((len(pattern), values))
+
+        # Breadth-first: a state's failure link is the longest proper suffix
+        # of its path that is also a path in the trie.
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def search(self, text):
+        """
+        Yields (start, end, values) for every occurrence of a pattern in text.
+        """
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, values in out[state]:
+                yield i + 1 - length, i + 1, values
+
+def _is_whole_id(text, start, end):
+    """
+    Returns True if text[start:end] is not part of a longer ID.
+    """
+    if start > 0:
+        before = text[start - 1]
+        if before.isalnum() or before in ".-":
+            return False
+    if end < len(text):
+        after = text[end]
+        if after.isalnum():
+            return False
+        if after in ".-" and end + 1 < len(text) and text[end + 1].isalnum():
+            return False
+    return True
+
+def docx_paragraphs(path):
+    """
+    Yields (location, text) for every non-empty paragraph of a .docx file,
+    streaming word/document.xml instead of loading it whole.
+    """
+    number = 0
+    with zipfile.ZipFile(path) as z, z.open("word/document.xml") as f:
+        for _, elem in ElementTree.iterparse(f):
+            if elem.tag != WORD_NS + "p":
+                continue
+            text = "".join(t.text or "" for t in elem.iter(WORD_NS + "t"))
+            elem.clear()
+            if text.strip():
+                number += 1
+                yield f"¶{number}", text
+
+def pdf_paragraphs(path):
+    """
+    Yields (location, text) for every paragraph (block separated by a blank line)
+    of a PDF file, page by page.
+    """
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        print(f"Skipping {path}: reading PDF files requires the pypdf package.")
+        return
+    for page_number, page in enumerate(PdfReader(path).pages, 1):
+        blocks = re.split(r"\n\s*\n", page.extract_text() or "")
+        for number, block in enumerate((b for b in blocks if b.strip()), 1):
+            yield f"p{page_number} ¶{number}", block
+
+_automaton = None
+
+def _init_worker(patterns):
+    global _automaton
+    _automaton = Automaton(patterns)
+
+def scan_document(path):
+    """
+    Scans one document. Runs inside a worker process.
+    Returns [(list, control, location)] of every control reference found.
+    """
+    paragraphs = docx_paragraphs(path) if path.lower().endswith(".docx") else pdf_paragraphs(path)
+    hits = []
+    for location, text in paragraphs:
+        for start, end, values in _automaton.search(text):
+            if _is_whole_id(text, start, end):
+                hits.extend((l, control, location) for l, control in values)
+    return hits
+
+def build_patterns(lists, selected=None):
+    """
+    Returns {control ID: [(list, control)]} for the selected lists (default: all).
+    """
+    patterns = {}
+    for name, items in lists.items():
+        if selected and name not in selected:
+            continue
+        for item in items:
+            patterns.setdefault(item, []).append((name, item))
+    return patterns
+
+def scan(paths, patterns, jobs=None):
+    """
+    Scans every document in paths in parallel and returns the index (see the module docstring).
+    """
+    controls = {}
+    documents = {}
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(patterns,)) as pool:
+        for path, hits in zip(paths, pool.map(scan_document, paths)):
+            name = os.path.basename(path)
+            found = documents.setdefault(name, {})
+            for l, control, location in hits:
+                controls.setdefault(l, {}).setdefault(control, []).append([name, location])
+                if control not in found.setdefault(l, []):
+                    found[l].append(control)
+
+    unreferenced = {}
+    for values in patterns.values():
+        for l, control in values:
+            if control not in controls.get(l, {}):
+                unreferenced.setdefault(l, []).append(control)
+    for l in unreferenced:
+        unreferenced[l].sort(key=governance_map.parse_dotted)
+    for found in documents.values():
+        for l in found:
+            found[l].sort(key=governance_map.parse_dotted)
+    return {"controls": controls, "documents": documents, "unreferenced": unreferenced}
+
+def main():
+    parser = argparse.ArgumentParser(description="Find the control IDs referenced by policy documents")
+    parser.add_argument("folder", nargs="?", default="documents", help="Folder with .docx/.pdf files (default: documents)")
+    parser.add_argument("--data", default="control_mapping.json", help="Mapping JSON file")
+    parser.add_argument("--lists", help="Only look for the IDs of these lists (comma separated, default: all)")
+    parser.add_argument("--out", help="Write the control -> document/paragraph index to this JSON file")
+    parser.add_argument("--jobs", type=int, default=None, help="Number of worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    lists, _ = governance_map.load_data(args.data)
+    selected = None
+    if args.lists:
+        selected = {l.strip() for l in args.lists.split(",") if l.strip()}
+        for l in selected:
+            if l not in lists:
+                print(f"Invalid list label: {l}")
+                return 1
+    paths = sorted(os.path.join(args.folder, f) for f in os.listdir(args.folder)
+                   if f.lower().endswith(EXTENSIONS) and not f.startswith("~$"))
+    if not paths:
+        print(f"No .docx or .pdf files found in {args.folder}.")
+        return 1
+
+    index = scan(paths, build_patterns(lists, selected), jobs=args.jobs)
+    for name, found in index["documents"].items():
+        summary = ", ".join(f"{l}: {len(c)}" for l, c in found.items()) or "no control references"
+        print(f"{name:<40} | {summary}")
+    for l in lists:
+        if selected is None or l in selected:
+            total = len(lists[l])
+            referenced = total - len(index["unreferenced"].get(l, []))
+            print(f"{l}: {referenced} of {total} controls referenced")
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(index, f, indent=2, ensure_ascii=False)
+        print(f"Index saved as '{args.out}'.")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -11,11 +11,13 @@ Usage:
   python3 standards_mapper.py setup         # Create database schema
   python3 standards_mapper.py import FILE   # Import a CSV file
   python3 standards_mapper.py import_dir DIRECTORY  # Import all CSVs in a directory
+  python3 standards_mapper.py apply_delta FILE      # Apply a delta from mapping_diff.py
 """
 
 import os
 import sys
 import csv
+import json
 import logging
 import argparse
 from pathlib import Path
@@ -24,6 +26,8 @@ import psycopg
 from psycopg.rows import dict_row
 from psycopg import sql
 
+import tracing
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -268,26 +272,28 @@ def import_csv_file(file_path: str) -> bool:
                     row_count = 0
                     mapping_count = 0
                     
-                    for row_num, row in enumerate(reader, start=2):  # Start from 2 to account for header row
-                        if len(row) < 2:
-                            logger.warning(f"Skipping row {row_num} - insufficient columns")
-                            continue
+                    with tracing.span("insert_rows", file=file_path.name) as s:
+                        for row_num, row in enumerate(reader, start=2):  # Start from 2 to account for header row
+                            if len(row) < 2:
+                                logger.warning(f"Skipping row {row_num} - insufficient columns")
+                                continue
                             
-                        row_count += 1
+                            row_count += 1
                         
-                        # Process clauses for standard A
-                        clause_a_text = row[0].strip()
-                        clause_a_id = get_or_create_clause(cur, std_a_id, clause_a_text) if clause_a_text else None
+                            # Process clauses for standard A
+                            clause_a_text = row[0].strip()
+                            clause_a_id = get_or_create_clause(cur, std_a_id, clause_a_text) if clause_a_text else None
                         
-                        # Process clauses for standard B
-                        clause_b_text = row[1].strip()
-                        clause_b_id = get_or_create_clause(cur, std_b_id, clause_b_text) if clause_b_text else None
+                            # Process clauses for standard B
+                            clause_b_text = row[1].strip()
+                            clause_b_id = get_or_create_clause(cur, std_b_id, clause_b_text) if clause_b_text else None
                         
-                        # Create mapping if both clauses exist
-                        if clause_a_id and clause_b_id:
-                            mapping_id = create_mapping(cur, clause_a_id, clause_b_id, str(file_path))
-                            if mapping_id:
-                                mapping_count += 1
+                            # Create mapping if both clauses exist
+                            if clause_a_id and clause_b_id:
+                                mapping_id = create_mapping(cur, clause_a_id, clause_b_id, str(file_path))
+                                if mapping_id:
+                                    mapping_count += 1
+                        s.add(row_count)
                     
                     # Update import log
                     update_import_log(cur, import_id, row_count)
@@ -332,6 +338,102 @@ def import_directory(directory_path: str) -> Tuple[int, int]:
     logger.info(f"Imported {success_count} of {total_count} CSV files successfully")
     return (success_count, total_count)
 
+# Deletes a mapping between two clauses, given by standard name and clause text,
+# in either direction.
+DELETE_MAPPING_SQL = """
+DELETE FROM mappings m
+USING clauses ca, clauses cb, standards sa, standards sb
+WHERE m.clause_a_id = ca.clause_id AND m.clause_b_id = cb.clause_id
+  AND ca.standard_id = sa.standard_id AND cb.standard_id = sb.standard_id
+  AND ((sa.standard_name = %(std_a)s AND ca.clause_text = %(clause_a)s
+        AND sb.standard_name = %(std_b)s AND cb.clause_text = %(clause_b)s)
+    OR (sa.standard_name = %(std_b)s AND ca.clause_text = %(clause_b)s
+        AND sb.standard_name = %(std_a)s AND cb.clause_text = %(clause_a)s))
+"""
+
+# Deletes a clause (and, through the cascade, its mappings).
+DELETE_CLAUSE_SQL = """
+DELETE FROM clauses c
+USING standards s
+WHERE c.standard_id = s.standard_id
+  AND s.standard_name = %(std)s AND c.clause_text = %(clause)s
+"""
+
+def get_clause_id(cur, standard_ids: Dict[str, int], standard_name: str, clause_text: str) -> Optional[int]:
+    """Get or create a clause by standard name, caching the standard IDs in standard_ids."""
+    standard_name = extract_standard_name(standard_name)
+    if standard_name not in standard_ids:
+        standard_ids[standard_name] = get_or_create_standard(cur, standard_name)
+    return get_or_create_clause(cur, standard_ids[standard_name], clause_text)
+
+def apply_delta(file_path: str) -> bool:
+    """Apply a mapping delta (see mapping_diff.py), inserting and deleting only the changed rows."""
+    file_path = Path(file_path)
+    if not file_path.exists() or not file_path.is_file():
+        logger.error(f"File not found: {file_path}")
+        return False
+
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            delta = json.load(f)
+        lists = delta["lists"]
+        tables = delta["tables"]
+    except (json.JSONDecodeError, KeyError, TypeError) as e:
+        logger.error(f"Invalid delta file {file_path}: {e}")
+        return False
+
+    logger.info(f"Applying delta: {file_path}")
+
+    import_id = None
+    try:
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                import_id = log_import(cur, str(file_path))
+
+                # Removed rows first; removing a clause also removes its remaining mappings.
+                cur.executemany(DELETE_MAPPING_SQL, [
+                    {"std_a": extract_standard_name(std_a), "clause_a": normalize_text(clause_a),
+                     "std_b": extract_standard_name(std_b), "clause_b": normalize_text(clause_b)}
+                    for std_a, clause_a, std_b, clause_b in tables["removed"]
+                ])
+                cur.executemany(DELETE_CLAUSE_SQL, [
+                    {"std": extract_standard_name(name), "clause": normalize_text(clause)}
+                    for name, change in lists.items() for clause in change["removed"]
+                ])
+
+                standard_ids = {}
+                for name, change in lists.items():
+                    for clause in change["added"]:
+                        get_clause_id(cur, standard_ids, name, clause)
+
+                mapping_count = 0
+                for std_a, clause_a, std_b, clause_b in tables["added"]:
+                    clause_a_id = get_clause_id(cur, standard_ids, std_a, clause_a)
+                    clause_b_id = get_clause_id(cur, standard_ids, std_b, clause_b)
+                    if create_mapping(cur, clause_a_id, clause_b_id, str(file_path)):
+                        mapping_count += 1
+
+                clause_changes = sum(len(c["added"]) + len(c["removed"]) for c in lists.values())
+                row_count = clause_changes + len(tables["added"]) + len(tables["removed"])
+                update_import_log(cur, import_id, row_count)
+                logger.info(f"Applied {clause_changes} clause changes, created {mapping_count} mappings, "
+                            f"removed {len(tables['removed'])} mappings")
+
+            conn.commit()
+            return True
+
+    except Exception as e:
+        logger.error(f"Error applying delta {file_path}: {e}")
+        if import_id is not None:
+            try:
+                with get_connection() as conn:
+                    with conn.cursor() as cur:
+                        update_import_log(cur, import_id, 0, False, str(e))
+                    conn.commit()
+            except:
+                pass
+        return False
+
 def query_mapping_statistics() -> Dict[str, Any]:
     """Query and return statistics about the database."""
     try:
@@ -425,6 +527,10 @@ def main():
     import_dir_parser = subparsers.add_parser("import_dir", help="Import all CSV files in a directory")
     import_dir_parser.add_argument("directory", help="Path to directory containing CSV files")
     
+    # Apply delta command
+    apply_delta_parser = subparsers.add_parser("apply_delta", help="Apply a delta from mapping_diff.py")
+    apply_delta_parser.add_argument("file", help="Path to the delta JSON file")
+    
     # Stats command
     stats_parser = subparsers.add_parser("stats", help="Show database statistics")
     
@@ -439,6 +545,9 @@ def main():
     elif args.command == "import_dir":
         import_directory(args.directory)
     
+    elif args.command == "apply_delta":
+        apply_delta(args.file)
+    
     elif args.command == "stats":
         stats = query_mapping_statistics()
         print_statistics(stats)
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Offline mapping suggestions: which Master controls does a clause most resemble?
+
+Each Master control is described by its Topic and Control Statement from
+"Source Data.csv", plus the text of any framework clauses already mapped to it
+(if clause texts are provided with --texts). The descriptions are turned into
+a sparse TF-IDF matrix over hashed word unigrams and bigrams (no vocabulary to
+store, and unseen words cost nothing), kept in CSC form as NumPy arrays:
+  col_ptr, rows, values   the non-zero weights of each feature column
+  features                the hashed feature id of each column (sorted)
+  idf                     the inverse document frequency of each column
+The matrix is cached in <CACHE_DIR>/suggest/ (see layout_cache), keyed on the
+contents of the input files. A batch of clauses is scored with one sparse
+matrix product, so a framework of a few thousand clauses takes seconds.
+
+Usage:
+  python suggest.py "The organisation shall log access to AI systems" [-k 5]
+  python suggest.py --clauses new_framework.csv [--out suggestions.csv]
+  python suggest.py --clauses iso27001_texts.csv --unmapped --texts clause_texts.csv
+Clause CSV files have the columns List (optional), Item and Text.
+"""
+
+import os
+import re
+import csv
+import zlib
+import hashlib
+import argparse
+
+import numpy as np
+
+import layout_cache
+from relationship_index import HUB
+
+SOURCE_FILE = "Source Data.csv"
+N_FEATURES = 1 << 22
+BATCH = 1024
+# Bump when the features or weighting change.
+INDEX_VERSION = 1
+
+STOP_WORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the their
+these this those to with within shall should must may will any all such where which
+""".split())
+
+def tokenize(text):
+    """
+    Returns the hashed feature ids (word unigrams and bigrams) of text.
+    """
+    words = [w for w in re.findall(r"[a-z0-9]+", text.lower()) if w not in STOP_WORDS]
+    grams = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    return [zlib.crc32(g.encode()) % N_FEATURES for g in grams]
+
+def load_statements(csv_file=SOURCE_FILE):
+    """
+    Returns {Master control: "Topic. Control Statement"} from the source data CSV.
+    """
+    statements = {}
+    with open(csv_file, 'r', encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f):
+            control = (row.get(HUB) or "").strip()
+            if control:
+                statements[control] = f"{row.get('Topic', '')}. {row.get('Control Statement', '')}"
+    return statements
+
+def load_clauses(csv_file):
+    """
+    Returns [(list, item, text)] from a CSV file with columns List (optional), Item and Text.
+    """
+    with open(csv_file, 'r', encoding='utf-8-sig', newline='') as f:
+        return [((row.get("List") or "").strip(), row["Item"].strip(), row["Text"])
+                for row in csv.DictReader(f)]
+
+def _term_counts(texts):
+    """
+    Returns (doc, feature, count) arrays of the hashed term counts of texts.
+    """
+    docs, feats = [], []
+    for i, text in enumerate(texts):
+        ids = tokenize(text)
+        docs.extend([i] * len(ids))
+        feats.extend(ids)
+    keys = np.array(docs, dtype=np.int64) * N_FEATURES + np.array(feats, dtype=np.int64)
+    keys, counts = np.unique(keys, return_counts=True)
+    return keys // N_FEATURES, keys % N_FEATURES, counts
+
+def build_index(statements, clause_texts=(), relationships=()):
+    """
+    Builds the suggestion index for {control: statement}. clause_texts is a list
+    of (list, item, text); the text of every clause mapped to a control in
+    relationships is added to that control's description.
+    Returns a dict of NumPy arrays (see the module docstring) plus "controls".
+    """
+    controls = list(statements)
+    texts = [statements[c] for c in controls]
+    row = {c: i for i, c in enumerate(controls)}
+    clause_text = {(l, item): text for l, item, text in clause_texts}
+    if clause_text:
+        for l1, item1, l2, item2 in relationships:
+            if l2 == HUB:
+                l1, item1, l2, item2 = l2, item2, l1, item1
+            if l1 == HUB and item1 in row and (l2, item2) in clause_text:
+                texts[row[item1]] += " " + clause_text[(l2, item2)]
+
+    docs, feats, counts = _term_counts(texts)
+    features, cols = np.unique(feats, return_inverse=True)
+    df = np.bincount(cols, minlength=len(features))
+    idf = np.log((1 + len(controls)) / (1 + df)) + 1.0
+    values = (1.0 + np.log(counts)) * idf[cols]
+    norms = np.sqrt(np.bincount(docs, weights=values**2, minlength=len(controls)))
+    values = values / np.where(norms > 0, norms, 1.0)[docs]
+
+    order = np.argsort(cols, kind="stable")
+    col_ptr = np.concatenate([[0], np.cumsum(np.bincount(cols, minlength=len(features)))])
+    return {
+        "controls": np.array(controls),
+        "features": features,
+        "idf": idf,
+        "col_ptr": col_ptr,
+        "rows": docs[order],
+        "values": values[order],
+    }
+
+def index_key(*paths):
+    """
+    Returns the cache key of an index built from the given input files.
+    """
+    h = hashlib.sha256(f"{INDEX_VERSION}:{N_FEATURES}".encode())
+    for path in paths:
+        h.update((layout_cache.file_hash(path) if path else "-").encode())
+    return h.hexdigest()
+
+def load_index(source_file=SOURCE_FILE, texts_file=None, json_file="control_mapping.json"):
+    """
+    Returns the suggestion index for the given inputs, from the cache when possible.
+    """
+    key = index_key(source_file, texts_file, json_file if texts_file else None)
+    path = os.path.join(layout_cache.CACHE_DIR, "suggest", key + ".npz")
+    try:
+        with np.load(path) as cached:
+            return {name: cached[name] for name in cached.files}
+    except (FileNotFoundError, ValueError, OSError):
+        pass
+
+    clause_texts, relationships = (), ()
+    if texts_file:
+        import governance_map
+        clause_texts = load_clauses(texts_file)
+        _, relationships = governance_map.load_data(json_file)
+    index = build_index(load_statements(source_file), clause_texts, relationships)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, **index)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Warning: could not write suggestion cache: {e}")
+    return index
+
+def score(index, texts):
+    """
+    Returns the (len(texts), number of controls) matrix of cosine similarities.
+    """
+    n_controls = len(index["controls"])
+    features = index["features"]
+    if len(features) == 0:
+        return np.zeros((len(texts), n_controls))
+    docs, feats, counts = _term_counts(texts)
+    cols = np.searchsorted(features, feats)
+    cols = np.minimum(cols, len(features) - 1)
+    known = features[cols] == feats
+    # Terms no control uses still count towards the clause's norm, with the
+    # idf of a term that occurs in no document.
+    unseen_idf = np.log(1 + n_controls) + 1.0
+    weights = (1.0 + np.log(counts)) * np.where(known, index["idf"][cols], unseen_idf)
+    norms = np.sqrt(np.bincount(docs, weights=weights**2, minlength=len(texts)))
+    weights = weights / np.where(norms > 0, norms, 1.0)[docs]
+    docs, cols, weights = docs[known], cols[known], weights[known]
+
+    # Sparse product: expand every query term into the column of the index it hits.
+    col_ptr = index["col_ptr"]
+    lengths = col_ptr[cols + 1] - col_ptr[cols]
+    starts = np.repeat(col_ptr[cols] - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+    flat = np.repeat(docs, lengths) * n_controls + index["rows"][starts]
+    scores = np.bincount(flat, weights=np.repeat(weights, lengths) * index["values"][starts],
+                         minlength=len(texts) * n_controls)
+    return scores.reshape(len(texts), n_controls)
+
+def suggest(index, texts, k=5):
+    """
+    Returns, for every text, the top k [(control, score)] with a positive score.
+    """
+    controls = index["controls"].tolist()
+    if not controls or k < 1:
+        return [[] for _ in texts]
+    results = []
+    for i in range(0, len(texts), BATCH):
+        scores = score(index, texts[i:i + BATCH])
+        kk = min(k, scores.shape[1])
+        top = np.argpartition(-scores, kk - 1, axis=1)[:, :kk]
+        for row, candidates in zip(scores, top):
+            ranked = sorted(candidates.tolist(), key=lambda c: -row[c])
+            results.append([(controls[c], round(float(row[c]), 4)) for c in ranked if row[c] > 0])
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Suggest Master controls for framework clauses")
+    parser.add_argument("text", nargs="?", help="Clause text to find Master controls for")
+    parser.add_argument("--clauses", help="CSV of clauses (List, Item, Text) to suggest controls for")
+    parser.add_argument("--unmapped", action="store_true",
+                        help="With --clauses, only suggest for clauses that have no relationships yet")
+    parser.add_argument("--texts", help="CSV of known clause texts (List, Item, Text) to enrich the controls with")
+    parser.add_argument("--source", default=SOURCE_FILE, help="Source data CSV with the control statements")
+    parser.add_argument("--data", default="control_mapping.json", help="Mapping JSON file")
+    parser.add_argument("-k", type=int, default=5, help="Number of suggestions per clause (default: 5)")
+    parser.add_argument("--out", help="Write the suggestions for --clauses to this CSV file")
+    args = parser.parse_args()
+
+    if not args.text and not args.clauses:
+        parser.error("give a clause text or --clauses FILE")
+    index = load_index(args.source, args.texts, args.data)
+
+    if args.text:
+        for control, value in suggest(index, [args.text], args.k)[0]:
+            print(f"{control:<10} {value:.3f}")
+        return 0
+
+    clauses = load_clauses(args.clauses)
+    if args.unmapped:
+        import governance_map
+        _, relationships = governance_map.load_data(args.data)
+        mapped = {(l, item) for rel in relationships for l, item in (rel[:2], rel[2:])}
+        clauses = [c for c in clauses if (c[0], c[1]) not in mapped]
+    results = suggest(index, [text for _, _, text in clauses], args.k)
+
+    if args.out:
+        with open(args.out, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["List", "Item", "Rank", "Master", "Score"])
+            for (l, item, _), ranked in zip(clauses, results):
+                for rank, (control, value) in enumerate(ranked, 1):
+                    writer.writerow([l, item, rank, control, value])
+        print(f"Suggestions for {len(clauses)} clauses saved as '{args.out}'.")
+    else:
+        for (l, item, _), ranked in zip(clauses, results):
+            label = f"{l} {item}".strip()
+            print(f"{label:<20} | {', '.join(f'{c} ({v:.2f})' for c, v in ranked) or '-'}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,35 @@
+import os
+import sys
+import json
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+@pytest.fixture
+def small_mapping():
+    """
+    A mapping small enough to check by hand: SOC2 and ISO27001 share GL-1,
+    and A.6.1 is linked to CC2.1 directly.
+    """
+    return {
+        "lists": {
+            "Master": ["GL-1", "GL-2", "RM-1"],
+            "SOC2": ["CC1.1", "CC1.2", "CC2.1"],
+            "ISO27001": ["A.5.1", "A.6.1"],
+        },
+        "relationships": [
+            ["Master", "GL-1", "SOC2", "CC1.1"],
+            ["Master", "GL-1", "ISO27001", "A.5.1"],
+            ["Master", "GL-2", "SOC2", "CC1.2"],
+            ["Master", "RM-1", "ISO27001", "A.6.1"],
+            ["ISO27001", "A.6.1", "SOC2", "CC2.1"],
+        ],
+    }
+
+@pytest.fixture
+def mapping_file(tmp_path, small_mapping):
+    path = tmp_path / "control_mapping.json"
+    path.write_text(json.dumps(small_mapping), encoding="utf-8")
+    return str(path)
@@ -0,0 +1,102 @@
+import sys
+
+import pytest
+
+import governance_map
+from control_search import ControlTrie, SearchIndex, prompt
+
+@pytest.fixture
+def index():
+    lists = {
+        "Master": ["GL-1", "GL-10", "GL-2", "RM-1"],
+        "ISO27001": ["A.10.1", "A.7.4", "A.7.10", "A.7.2"],
+    }
+    statements = {
+        ("Master", "GL-1"): "Governance. Define the security policy.",
+        ("Master", "RM-1"): "Risk Management. Assess security risks regularly.",
+        ("Master", "GL-2"): "Governance. Assign roles.",
+    }
+    return SearchIndex(lists, statements, sort_key=governance_map.parse_dotted)
+
+def test_trie_prefix_lookup_is_case_insensitive():
+    trie = ControlTrie([("GL-1", 1), ("gl-2", 2), ("RM-1", 3)])
+    assert sorted(trie.find("gl-")) == [1, 2]
+    assert trie.find("X") == []
+
+def test_prefix_results_are_in_natural_order(index):
+    assert index.prefix("A.7") == [("ISO27001", "A.7.2"), ("ISO27001", "A.7.4"), ("ISO27001", "A.7.10")]
+    assert index.prefix("gl-1") == [("Master", "GL-1"), ("Master", "GL-10")]
+    assert index.prefix("A.", limit=2) == [("ISO27001", "A.7.2"), ("ISO27001", "A.7.4")]
+
+def test_keyword_matches_all_words_and_last_word_prefix(index):
+    assert index.keyword("security") == [("Master", "GL-1"), ("Master", "RM-1")]
+    assert index.keyword("security ris") == [("Master", "RM-1")]
+    assert index.keyword("GOVERN") == [("Master", "GL-1"), ("Master", "GL-2")]
+    assert index.keyword("unrelated") == []
+
+def test_search_falls_back_to_keywords(index):
+    assert index.search("RM-") == [("Master", "RM-1")]
+    assert index.search("roles") == [("Master", "GL-2")]
+
+def test_blank_queries_match_nothing(index):
+    for query in ("", "   "):
+        assert index.prefix(query) == []
+        assert index.keyword(query) == []
+        assert index.search(query) == []
+        assert index.complete_id(query) == []
+
+def test_complete_id_returns_distinct_ids():
+    index = SearchIndex({"ISO27001": ["5.1", "5.2"], "ISO42001": ["5.1"]})
+    assert index.complete_id("5.") == ["5.1", "5.2"]
+
+def test_search_command_rejects_blank_query(capsys):
+    assert governance_map.main(["search", "  "]) == 1
+    assert "Enter a control ID prefix or keywords" in capsys.readouterr().out
+
+class FakeReadline:
+    __doc__ = "GNU readline"
+
+    def __init__(self):
+        self.completer = "previous"
+        self.delims = " \t"
+        self.bindings = []
+
+    def get_completer(self):
+        return self.completer
+
+    def set_completer(self, completer):
+        self.completer = completer
+
+    def get_completer_delims(self):
+        return self.delims
+
+    def set_completer_delims(self, delims):
+        self.delims = delims
+
+    def parse_and_bind(self, line):
+        self.bindings.append(line)
+
+    def read_init_file(self):
+        self.bindings.append("<init file>")
+        raise OSError("no init file")
+
+@pytest.mark.parametrize("reply", ["GL-1", KeyboardInterrupt])
+def test_prompt_restores_readline_state(monkeypatch, reply):
+    readline = FakeReadline()
+    monkeypatch.setitem(sys.modules, "readline", readline)
+
+    def fake_input(text):
+        assert readline.completer("gl", 0) == "GL-1"
+        assert readline.delims == ","
+        if reply is KeyboardInterrupt:
+            raise KeyboardInterrupt
+        return reply
+    monkeypatch.setattr("builtins.input", fake_input)
+
+    if reply is KeyboardInterrupt:
+        with pytest.raises(KeyboardInterrupt):
+            prompt("? ", lambda word: ["GL-1"])
+    else:
+        assert prompt("? ", lambda word: ["GL-1"]) == "GL-1"
+    assert readline.completer == "previous" and readline.delims == " \t"
+    assert readline.bindings == ["tab: complete", "<init file>"]
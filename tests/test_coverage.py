@@ -0,0 +1,24 @@
+from coverage import CoverageIndex
+
+def test_gaps_and_cover(small_mapping):
+    index = CoverageIndex(small_mapping["lists"], small_mapping["relationships"])
+    assert index.frameworks == ["SOC2", "ISO27001"]
+    assert index.coverage("SOC2") == (2, 3)
+    # CC2.1 is only linked to ISO27001, not to a Master control.
+    assert index.gaps("SOC2") == ["CC2.1"]
+    assert index.gaps("SOC2", ["GL-1"]) == ["CC1.2", "CC2.1"]
+    assert index.gaps("ISO27001") == []
+    assert index.minimal_cover("SOC2") == ["GL-1", "GL-2"]
+    assert index.minimal_cover("ISO27001") == ["GL-1", "RM-1"]
+    assert index.drop(["GL-1"]) == {"SOC2": ["CC1.1"], "ISO27001": ["A.5.1"]}
+
+def test_greedy_cover_takes_the_widest_control_first(small_mapping):
+    lists = dict(small_mapping["lists"], Master=["GL-1", "GL-2", "RM-1", "TP-1"])
+    relationships = small_mapping["relationships"] + [
+        ["Master", "TP-1", "SOC2", "CC1.1"],
+        ["SOC2", "CC1.2", "Master", "TP-1"],
+    ]
+    index = CoverageIndex(lists, relationships)
+    assert index.top_controls("SOC2") == [("TP-1", 2), ("GL-1", 1), ("GL-2", 1)]
+    assert index.minimal_cover("SOC2") == ["TP-1"]
+    assert index.drop(["GL-1", "GL-2"]) == {"ISO27001": ["A.5.1"]}
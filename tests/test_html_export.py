@@ -0,0 +1,25 @@
+from xml.etree import ElementTree
+
+import pytest
+
+from chord_graph import BUNDLE_WIDTH, EDGE_WIDTH
+from governance_map import compute_layout
+from html_export import build_svg
+
+SVG = "{http://www.w3.org/2000/svg}"
+SOURCES = ["Master", "SOC2", "ISO27001"]
+
+@pytest.mark.parametrize("bundled", [False, True])
+def test_svg_has_one_path_per_edge(small_mapping, bundled):
+    graph = compute_layout(small_mapping["lists"], small_mapping["relationships"], SOURCES, bundled=bundled)
+    root = ElementTree.fromstring(build_svg(graph, title="A & B"))
+    edges = root.find(f"{SVG}g")
+    assert float(edges.get("stroke-width")) == (BUNDLE_WIDTH if bundled else EDGE_WIDTH)
+    paths = edges.findall(f"{SVG}path")
+    # A bundle is one path with a sub-path per edge.
+    assert sum(path.get("d").count("M") for path in paths) == len(graph.edge_u) == 5
+    if not bundled:
+        assert len(paths) == 5
+        assert [tuple(map(int, path.get("data-n").split())) for path in paths] == list(zip(graph.edge_u, graph.edge_v))
+    nodes = root.findall(f"{SVG}g")[1]
+    assert len(nodes) == graph.num_nodes == 8
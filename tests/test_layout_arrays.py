@@ -0,0 +1,85 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from governance_map import layout_arrays
+
+def reference_layout(node_source, edge_u, edge_v, num_sources, master_idx):
+    # The per-node loop layout_arrays replaced.
+    ranges = {}
+    for node, s in enumerate(node_source):
+        start, _ = ranges.get(s, (node, node))
+        ranges[s] = (start, node + 1)
+    angle = [0.0] * len(node_source)
+    if master_idx in ranges:
+        start, end = ranges[master_idx]
+        n = end - start
+        for i in range(n):
+            if n > 1:
+                angle[start + i] = math.radians(135) + i * ((math.radians(225) - math.radians(135)) / (n - 1))
+            else:
+                angle[start + i] = math.radians(180)
+    groups = [s for s in range(num_sources) if s in ranges and s != master_idx]
+    gap = math.radians(5)
+    if groups:
+        per_group = (math.radians(250) - (len(groups) - 1) * gap) / len(groups)
+        current = math.radians(225 + 5)
+        for s in groups:
+            start, end = ranges[s]
+            n = end - start
+            group_end = current + per_group
+            for i in range(n):
+                a = current + i * ((group_end - current) / (n - 1)) if n > 1 else (current + group_end) / 2
+                angle[start + i] = a % (2 * math.pi)
+            current += per_group + gap
+
+    pos = [(math.cos(a), math.sin(a)) for a in angle]
+    node_angles = [math.atan2(y, x) for x, y in pos]
+    edge_source, arc_sign = [], []
+    for u, v in zip(edge_u, edge_v):
+        su, sv = node_source[u], node_source[v]
+        if su == master_idx and sv != master_idx:
+            edge_source.append(sv)
+        elif sv == master_idx and su != master_idx:
+            edge_source.append(su)
+        else:
+            edge_source.append(su if pos[u][0] >= pos[v][0] else sv)
+        delta = node_angles[v] - node_angles[u]
+        if delta > math.pi:
+            delta -= 2 * math.pi
+        elif delta < -math.pi:
+            delta += 2 * math.pi
+        arc_sign.append(-1 if abs(delta) > math.pi / 2 else 1)
+    return angle, pos, edge_source, arc_sign
+
+def tied(pos, u, v):
+    # Ends exactly 90° apart or at the same x: either answer is right, and the
+    # two implementations round differently.
+    (xu, yu), (xv, yv) = pos[u], pos[v]
+    return abs(xu * xv + yu * yv) < 1e-9 or abs(xu - xv) < 1e-9
+
+@pytest.mark.parametrize("seed", range(20))
+def test_layout_arrays_matches_reference_loop(seed):
+    rng = random.Random(seed)
+    num_sources = rng.randint(1, 6)
+    # Some groups are empty and some have a single node (but not the first).
+    counts = [rng.choice([0, 1, 2, rng.randint(3, 40)]) for _ in range(num_sources)]
+    counts[0] += 3
+    node_source = [s for s, n in enumerate(counts) for _ in range(n)]
+    master_idx = rng.choice([None, 0, num_sources - 1])
+    edges = [(rng.randrange(len(node_source)), rng.randrange(len(node_source))) for _ in range(50)]
+    edge_u = [u for u, _ in edges]
+    edge_v = [v for _, v in edges]
+
+    got = layout_arrays(node_source, edge_u, edge_v, num_sources, master_idx)
+    angle, pos, edge_source, arc_sign = reference_layout(
+        node_source, edge_u, edge_v, num_sources, -1 if master_idx is None else master_idx)
+    np.testing.assert_allclose(got["angle"], angle, atol=1e-12)
+    np.testing.assert_allclose(np.column_stack([got["x"], got["y"]]), pos, atol=1e-12)
+    checked = [e for e, (u, v) in enumerate(edges) if not tied(pos, u, v)]
+    assert checked
+    assert [got["edge_source"][e] for e in checked] == [edge_source[e] for e in checked]
+    assert [got["arc_sign"][e] for e in checked] == [arc_sign[e] for e in checked]
+    assert all(left == (x >= 0) for left, (x, _) in zip(got["label_left"], pos) if abs(x) > 1e-9)
@@ -0,0 +1,68 @@
+import copy
+
+import pytest
+
+import mapping_diff
+
+def _diff(old, new):
+    return mapping_diff.diff(old["lists"], {tuple(r) for r in old["relationships"]},
+                             new["lists"], {tuple(r) for r in new["relationships"]})
+
+def test_diff_apply_round_trip(small_mapping):
+    new = copy.deepcopy(small_mapping)
+    new["lists"]["SOC2"].append("CC3.1")
+    new["relationships"].append(["Master", "RM-1", "SOC2", "CC3.1"])
+    new["relationships"].remove(["Master", "GL-2", "SOC2", "CC1.2"])
+    delta = _diff(small_mapping, new)
+
+    assert delta["lists"] == {"SOC2": {"added": ["CC3.1"], "removed": []}}
+    assert delta["relationships"]["removed"] == [["Master", "GL-2", "SOC2", "CC1.2"]]
+    # RM-1 now relates CC3.1 to A.6.1 through Master.
+    assert delta["tables"]["added"] == [["Master", "RM-1", "SOC2", "CC3.1"],
+                                        ["SOC2", "CC3.1", "ISO27001", "A.6.1"]]
+    assert delta["tables"]["removed"] == [["Master", "GL-2", "SOC2", "CC1.2"]]
+
+    data = copy.deepcopy(small_mapping)
+    mapping_diff.apply(data, delta)
+    assert mapping_diff.mapping_hash(data["lists"], data["relationships"]) == delta["to"]
+    assert mapping_diff.mapping_hash(new["lists"], new["relationships"]) == delta["to"]
+
+def test_hash_ignores_order(small_mapping):
+    shuffled = copy.deepcopy(small_mapping)
+    shuffled["relationships"].reverse()
+    shuffled["lists"]["SOC2"].reverse()
+    assert (mapping_diff.mapping_hash(small_mapping["lists"], small_mapping["relationships"])
+            == mapping_diff.mapping_hash(shuffled["lists"], shuffled["relationships"]))
+
+def test_apply_keeps_emptied_lists_and_drops_deleted_ones(small_mapping):
+    new = copy.deepcopy(small_mapping)
+    new["lists"]["ISO27001"] = []
+    new["lists"]["DORA"] = []
+    del new["lists"]["SOC2"]
+    new["relationships"] = [r for r in new["relationships"] if r[0] == "Master" and r[2] == "Master"]
+    delta = _diff(small_mapping, new)
+
+    data = copy.deepcopy(small_mapping)
+    mapping_diff.apply(data, delta)
+    assert data["lists"] == {"Master": ["GL-1", "GL-2", "RM-1"], "ISO27001": [], "DORA": []}
+    assert data["relationships"] == []
+
+def test_apply_refuses_a_different_base(small_mapping):
+    new = copy.deepcopy(small_mapping)
+    new["relationships"].pop()
+    delta = _diff(small_mapping, new)
+    drifted = copy.deepcopy(small_mapping)
+    drifted["lists"]["Master"].append("GL-3")
+    with pytest.raises(ValueError):
+        mapping_diff.apply(drifted, delta)
+    assert "GL-3" in drifted["lists"]["Master"] and len(drifted["relationships"]) == 5
+
+def test_apply_refuses_a_result_that_does_not_match(small_mapping):
+    new = copy.deepcopy(small_mapping)
+    new["relationships"] = new["relationships"][2:]
+    delta = _diff(small_mapping, new)
+    delta["relationships"]["removed"].pop()
+    data = copy.deepcopy(small_mapping)
+    with pytest.raises(ValueError):
+        mapping_diff.apply(data, delta)
+    assert data == small_mapping
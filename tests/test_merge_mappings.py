@@ -0,0 +1,42 @@
+import os
+
+import merge_mappings
+from conftest import ROOT
+
+def _canonicalizer():
+    return merge_mappings.Canonicalizer(merge_mappings.load_table(os.path.join(ROOT, "canonical_ids.json")))
+
+def test_list_names_are_canonicalized():
+    c = _canonicalizer()
+    assert c.list_name("ISO 27001:2022") == "ISO27001"
+    assert c.list_name("ISO 27002") == "ISO27002"
+    assert c.list_name("SOC2") == "SOC2"
+
+def test_2022_annex_a_ids_keep_their_own_namespace():
+    c = _canonicalizer()
+    assert c.control("ISO27001", "Annex A 6.1") == "A.6.1 (2022)"
+    assert c.control("ISO27001", "Annex A 5.31") == "A.5.31 (2022)"
+    assert c.control("ISO27001", "A 5.2") == "A.5.2 (2022)"
+    # Workbook (2013) IDs and management-system clauses are left alone.
+    assert c.control("ISO27001", "A.6.1") == "A.6.1"
+    assert c.control("ISO27001", "6.1.2") == "6.1.2"
+
+def test_iso27002_ids_are_bare_numbers():
+    c = _canonicalizer()
+    assert [c.control("ISO27002", i) for i in ("5.31", "A 5.2", "A.5.2", "Annex A 8.9")] == ["5.31", "5.2", "5.2", "8.9"]
+
+def test_merge_does_not_join_2013_and_2022_controls(small_mapping):
+    dora = {
+        "lists": {"NIS2": ["HR"], "ISO 27001:2022": ["Annex A 6.1", "6.1.2"]},
+        "relationships": [["NIS2", "HR", "ISO 27001:2022", "Annex A 6.1"],
+                          ["ISO 27001:2022", "Annex A 6.1", "NIS2", "HR"]],
+    }
+    merged, duplicates = merge_mappings.merge([small_mapping, dora], _canonicalizer())
+    assert duplicates == 1
+    assert merged["lists"]["ISO27001"] == ["A.5.1", "A.6.1", "A.6.1 (2022)", "6.1.2"]
+    assert ["NIS2", "HR", "ISO27001", "A.6.1 (2022)"] in merged["relationships"]
+    assert not any(r[0] == "NIS2" and r[3] == "A.6.1" for r in merged["relationships"])
+
+def test_missing_table_means_no_renaming(tmp_path):
+    c = merge_mappings.Canonicalizer(merge_mappings.load_table(str(tmp_path / "missing.json")))
+    assert c.control("ISO27001", "Annex  A 6.1") == "Annex A 6.1"
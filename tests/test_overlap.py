@@ -0,0 +1,40 @@
+import json
+
+import numpy as np
+
+import overlap
+
+def test_overlap_metrics(small_mapping):
+    inc = overlap.build_incidence(small_mapping["lists"], small_mapping["relationships"])
+    assert inc["names"] == ["Master", "SOC2", "ISO27001"]
+    metrics = overlap.compute_overlap(inc)
+
+    # Master controls linked: SOC2 {GL-1, GL-2}, ISO27001 {GL-1, RM-1}.
+    assert metrics["shared_masters"].tolist() == [[3, 2, 2], [2, 2, 1], [2, 1, 2]]
+    assert np.allclose(metrics["jaccard"], [[1, 2 / 3, 2 / 3], [2 / 3, 1, 1 / 3], [2 / 3, 1 / 3, 1]])
+    # Items related through Master: CC1.1 to ISO27001 and A.5.1 to SOC2 (via GL-1).
+    assert metrics["shared_items"][1, 2] == 1
+    assert metrics["shared_items"][2, 1] == 1
+    assert metrics["fan_in"].tolist() == [1, 1, 0, 1, 1]
+    assert metrics["fan_out"].tolist() == [[2, 1, 1], [1, 1, 0], [1, 0, 1]]
+
+def test_duplicate_and_non_master_links_are_ignored(small_mapping):
+    relationships = small_mapping["relationships"] + [["SOC2", "CC1.1", "Master", "GL-1"]]
+    inc = overlap.build_incidence(small_mapping["lists"], relationships)
+    assert len(inc["master"]) == 4
+
+def test_export_skips_only_when_requested_outputs_are_current(small_mapping, tmp_path):
+    inc = overlap.build_incidence(small_mapping["lists"], small_mapping["relationships"])
+    metrics = overlap.compute_overlap(inc)
+    out = str(tmp_path)
+    overlap.export(inc, metrics, out, fmt="json", data_hash="h1")
+    assert overlap.is_current(out, "h1", "json")
+    assert not overlap.is_current(out, "h1", "both")
+    assert not overlap.is_current(out, "h2", "json")
+
+    overlap.export(inc, metrics, out, fmt="both", data_hash="h1")
+    assert overlap.is_current(out, "h1", "csv")
+    with open(tmp_path / "overlap.json", encoding="utf-8") as f:
+        assert json.load(f)["data_hash"] == "h1"
+    (tmp_path / "fan_in.csv").unlink()
+    assert not overlap.is_current(out, "h1", "both")
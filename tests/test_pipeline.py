@@ -0,0 +1,71 @@
+import sys
+
+import pytest
+
+from pipeline import run_pipeline
+
+# Appends its name to log.txt and writes the upper-cased concatenation of the
+# inputs to the output, so it fails if an input has not been written yet.
+STEP = """
+import sys
+name, out, *inputs = sys.argv[1:]
+open("log.txt", "a").write(name + "\\n")
+text = "".join(open(path).read() for path in inputs)
+open(out, "w").write(text.upper())
+"""
+
+def stage(name, inputs, output, **extra):
+    return dict({"name": name, "command": [sys.executable, "-c", STEP, name, output, *inputs],
+                 "inputs": inputs, "outputs": [output]}, **extra)
+
+STAGES = [
+    stage("b", ["a.txt"], "b.txt"),
+    stage("a", ["in.txt"], "a.txt"),
+    stage("c", ["in.txt"], "c.txt"),
+    stage("db", ["b.txt"], "db.txt", optional=True),
+]
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "in.txt").write_text("x")
+    return tmp_path
+
+def statuses(results):
+    return {name: status for name, (status, _) in results.items()}
+
+def log(workdir):
+    lines = (workdir / "log.txt").read_text().split()
+    (workdir / "log.txt").unlink()
+    return lines
+
+def test_stages_run_after_their_dependencies(workdir):
+    assert statuses(run_pipeline(STAGES)) == {"a": "ran", "b": "ran", "c": "ran"}
+    order = log(workdir)
+    assert sorted(order) == ["a", "b", "c"] and order.index("a") < order.index("b")
+    assert (workdir / "b.txt").read_text() == "X"
+
+def test_unchanged_content_is_skipped(workdir):
+    run_pipeline(STAGES)
+    log(workdir)
+    (workdir / "in.txt").write_text("x")
+    assert set(statuses(run_pipeline(STAGES)).values()) == {"up to date"}
+    # "a" reruns but writes the same a.txt, so "b" stays up to date.
+    (workdir / "in.txt").write_text("X")
+    assert statuses(run_pipeline(STAGES)) == {"a": "ran", "b": "up to date", "c": "ran"}
+    assert sorted(log(workdir)) == ["a", "c"]
+
+def test_skip_and_optional_stages(workdir):
+    # A skipped stage does not block its dependents; they run on its last outputs.
+    assert statuses(run_pipeline(STAGES, selected=["b"], skip={"a"})) == {"a": "skipped", "b": "failed"}
+    run_pipeline(STAGES)
+    (workdir / "in.txt").write_text("y")
+    assert statuses(run_pipeline(STAGES, skip={"a"})) == {"a": "skipped", "b": "up to date", "c": "ran"}
+    assert (workdir / "a.txt").read_text() == "X"
+    # The optional stage runs only when selected.
+    assert statuses(run_pipeline(STAGES, selected=["db"])) == {"a": "ran", "b": "ran", "db": "ran"}
+    assert (workdir / "db.txt").read_text() == "Y"
+
+def test_failed_stage_blocks_its_dependents(workdir):
+    (workdir / "in.txt").unlink()
+    assert statuses(run_pipeline(STAGES, selected=["db"])) == {"a": "failed", "b": "blocked", "db": "blocked"}
@@ -0,0 +1,47 @@
+import csv
+import os
+
+import pytest
+
+from relationship_index import RelationshipIndex, affected_tables, sheet_title, write_all_tables, write_workbook
+
+def test_mapping_joins_through_master(small_mapping):
+    index = RelationshipIndex(small_mapping["lists"], small_mapping["relationships"])
+    assert index.mapping("ISO27001", "SOC2") == {"A.5.1": ("CC1.1",), "A.6.1": ("CC2.1",)}
+    assert index.mapping("ISO27001", "SOC2", transitive=False) == {"A.5.1": (), "A.6.1": ("CC2.1",)}
+    assert index.mapping("Master", "SOC2")["RM-1"] == ()
+
+def test_iter_mapping_does_not_keep_tables(small_mapping):
+    index = RelationshipIndex(small_mapping["lists"], small_mapping["relationships"])
+    before = dict(vars(index))
+    assert dict(index.iter_mapping("SOC2", "ISO27001")) == index.mapping("SOC2", "ISO27001")
+    assert vars(index) == before
+
+def test_affected_tables_follow_master_links(small_mapping):
+    lists = small_mapping["lists"]
+    changed = {("Master", "GL-2", "SOC2", "CC1.2")}
+    assert affected_tables(lists, set(), changed) == [("Master", "SOC2"), ("SOC2", "ISO27001")]
+
+def test_sheet_titles_are_unique_and_short():
+    used = set()
+    first = sheet_title("A" * 40, "B", used)
+    second = sheet_title("A" * 40, "C", used)
+    assert len(first) <= 31 and len(second) <= 31
+    assert first != second
+    assert sheet_title("ISO/IEC", "x:y", used) == "ISO-IEC vs x-y"
+
+def test_workbook_matches_csv_tables(small_mapping, tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    index = RelationshipIndex(small_mapping["lists"], small_mapping["relationships"])
+    csv_dir = tmp_path / "tables"
+    write_all_tables(index, str(csv_dir))
+    summary = write_workbook(index, str(tmp_path / "crosswalks.xlsx"))
+
+    wb = openpyxl.load_workbook(tmp_path / "crosswalks.xlsx", read_only=True)
+    assert wb.sheetnames == ["Summary"] + [row[0] for row in summary]
+    for title, primary, secondary, rows, unmapped in summary:
+        sheet = [["" if v is None else v for v in row] for row in wb[title].iter_rows(values_only=True)]
+        with open(os.path.join(csv_dir, f"{primary}_vs_{secondary}.csv"), newline="", encoding="utf-8") as f:
+            assert sheet == list(csv.reader(f))
+        assert rows == len(sheet) - 1
+        assert unmapped == sum(1 for row in sheet[1:] if row[1] == "")
@@ -0,0 +1,33 @@
+import random
+
+from scan_documents import Automaton, _is_whole_id, build_patterns
+
+IDS = ["5.1", "5.10", "A.5.1", "A.5.10", "1", "5", "GL-1", "GL-10", "CC1.1", "C1.1"]
+
+def brute_force(text, ids):
+    found = set()
+    for pattern in ids:
+        start = text.find(pattern)
+        while start != -1:
+            found.add((start, start + len(pattern), pattern))
+            start = text.find(pattern, start + 1)
+    return found
+
+def test_search_matches_brute_force_on_overlapping_ids():
+    automaton = Automaton({pattern: pattern for pattern in IDS})
+    rng = random.Random(0)
+    texts = ["See A.5.10, 5.1 and GL-10 (not GL-1).", "CC1.1 and C1.1", "5.1.5.10A.5.1"]
+    texts += ["".join(rng.choice("A.5 10GL-C") for _ in range(40)) for _ in range(200)]
+    for text in texts:
+        assert set(automaton.search(text)) == brute_force(text, IDS), text
+
+def whole_ids(text, ids):
+    automaton = Automaton(build_patterns({"L": ids}))
+    return [text[start:end] for start, end, _ in automaton.search(text) if _is_whole_id(text, start, end)]
+
+def test_ids_inside_longer_ids_are_rejected():
+    assert whole_ids("A.5.1", ["5.1", "A.5.1"]) == ["A.5.1"]
+    assert whole_ids("5.10 and 5.1.2", ["5.1", "5.10"]) == ["5.10"]
+    assert whole_ids("GL-10, GL-1.", ["GL-1", "GL-10"]) == ["GL-10", "GL-1"]
+    assert whole_ids("15.1 25.10 5.1x", ["5.1", "5.10"]) == []
+    assert whole_ids("(5.1) ends at 5.1.", ["5.1"]) == ["5.1", "5.1"]
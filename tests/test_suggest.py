@@ -0,0 +1,56 @@
+from collections import Counter
+
+import numpy as np
+
+from suggest import build_index, score, suggest, tokenize
+
+STATEMENTS = {
+    "GL-1": "AI governance. The organisation shall define an AI governance policy.",
+    "GL-2": "Roles. Responsibilities for AI systems are assigned and reviewed.",
+    "RM-1": "Risk management. AI risks are assessed and treated before deployment.",
+    "DM-1": "Data quality. Training data is checked for quality and bias.",
+}
+QUERIES = [
+    "Define and review an AI governance policy",
+    "Assess risks of AI systems before deployment",
+    "Unrelated words only",
+    "",
+]
+
+def dense_scores(statements, queries):
+    # Reference TF-IDF: one dense row per document over the features the controls use.
+    docs = [Counter(tokenize(text)) for text in statements.values()]
+    vocab = sorted(set().union(*docs))
+    n = len(docs)
+    df = np.array([sum(1 for d in docs if f in d) for f in vocab])
+    idf = dict(zip(vocab, np.log((1 + n) / (1 + df)) + 1.0))
+
+    def vector(counts, columns):
+        row = np.array([(1 + np.log(counts[f])) * idf.get(f, np.log(1 + n) + 1.0) if f in counts else 0.0
+                        for f in columns])
+        norm = np.linalg.norm(row)
+        return row / norm if norm else row
+
+    matrix = np.array([vector(d, vocab) for d in docs])
+    result = []
+    for query in queries:
+        counts = Counter(tokenize(query))
+        # Terms unknown to the index still count towards the query's norm.
+        columns = vocab + sorted(set(counts) - set(vocab))
+        result.append(vector(counts, columns)[:len(vocab)] @ matrix.T)
+    return np.array(result)
+
+def test_scores_match_dense_tfidf():
+    index = build_index(STATEMENTS)
+    np.testing.assert_allclose(score(index, QUERIES), dense_scores(STATEMENTS, QUERIES), atol=1e-12)
+
+def test_suggest_ranks_and_drops_zero_scores():
+    index = build_index(STATEMENTS)
+    results = suggest(index, QUERIES, k=2)
+    assert results[0][0][0] == "GL-1"
+    assert results[1][0][0] == "RM-1"
+    assert results[2] == [] and results[3] == []
+
+def test_suggest_without_controls():
+    assert suggest(build_index({}), ["AI governance policy"]) == [[]]
+    assert suggest(build_index(STATEMENTS), ["AI governance policy"], k=0) == [[]]
@@ -0,0 +1,28 @@
+import os
+
+import tile_export
+
+def test_unknown_label_is_rejected(mapping_file, tmp_path, capsys):
+    out = tmp_path / "tiles"
+    assert tile_export.export_tiles(str(out), ["Bogus"], json_file=mapping_file, max_zoom=0) is None
+    assert "Invalid list label: Bogus" in capsys.readouterr().out
+    assert not out.exists()
+
+def test_selection_without_relationships_is_rejected(mapping_file, tmp_path, capsys):
+    out = tmp_path / "tiles"
+    assert tile_export.export_tiles(str(out), ["ISO27001"], json_file=mapping_file, max_zoom=0) is None
+    assert "No relationships found among the selected lists." in capsys.readouterr().out
+    assert not out.exists()
+
+def test_tiles_are_written(mapping_file, tmp_path):
+    out = tmp_path / "tiles"
+    assert tile_export.export_tiles(str(out), ["Master", "SOC2"], json_file=mapping_file,
+                                    max_zoom=0, jobs=1) == 1
+    assert os.path.exists(out / "0" / "0" / "0.png")
+    assert os.path.exists(out / "index.html")
+
+def test_tile_bounds_cover_the_extent():
+    assert tile_export.tile_bounds(0, 0, 0) == (-tile_export.EXTENT, tile_export.EXTENT,
+                                                -tile_export.EXTENT, tile_export.EXTENT)
+    assert not tile_export.tile_may_have_content(3, 0, 0)
+    assert tile_export.tile_may_have_content(3, 3, 3)
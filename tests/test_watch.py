@@ -0,0 +1,38 @@
+import copy
+
+from watch import affected_specs, mapping_changes
+
+SPECS = [
+    {"output": "all.png", "sources": None},
+    {"output": "soc2.png", "sources": ["Master", "SOC2"]},
+    {"output": "iso.png", "sources": ["Master", "ISO27001"]},
+    {"output": "gl.png", "sources": ["Master", "SOC2"], "master_domains": ["GL"]},
+    {"output": "rm.png", "sources": None, "master_domains": ["RM"]},
+]
+
+def outputs(specs):
+    return [spec["output"] for spec in specs]
+
+def test_mapping_changes(small_mapping):
+    new = copy.deepcopy(small_mapping)
+    assert mapping_changes(small_mapping, new) == (set(), set())
+    new["lists"]["SOC2"].append("CC3.1")
+    new["lists"]["NIST"] = []
+    new["relationships"].remove(["Master", "GL-2", "SOC2", "CC1.2"])
+    new["relationships"].append(["Master", "RM-1", "SOC2", "CC3.1"])
+    assert mapping_changes(small_mapping, new) == (
+        {"SOC2", "NIST"},
+        {("Master", "GL-2", "SOC2", "CC1.2"), ("Master", "RM-1", "SOC2", "CC3.1")},
+    )
+
+def test_affected_specs_follow_lists_and_edges(small_mapping):
+    lists = small_mapping["lists"]
+    assert outputs(affected_specs(SPECS, lists, {"ISO27001"}, set())) == ["all.png", "iso.png", "rm.png"]
+    edge = {("Master", "GL-2", "SOC2", "CC1.2")}
+    assert outputs(affected_specs(SPECS, lists, set(), edge)) == ["all.png", "soc2.png", "gl.png"]
+    # Written from the framework's side, the hub end is still found.
+    edge = {("SOC2", "CC1.2", "Master", "RM-1")}
+    assert outputs(affected_specs(SPECS, lists, set(), edge)) == ["all.png", "soc2.png", "rm.png"]
+    # Edges between two frameworks are not drawn with a domain filter.
+    edge = {("ISO27001", "A.6.1", "SOC2", "CC2.1")}
+    assert outputs(affected_specs(SPECS, lists, set(), edge)) == ["all.png"]
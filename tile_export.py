@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Tiled multi-resolution raster export of the chord diagram.
+
+Renders the diagram into a zoom-level tile pyramid instead of one huge PNG:
+  <out>/<z>/<x>/<y>.png   256x256 tiles; zoom level z is 2**z tiles across,
+                          with y counted from the top (the usual web-map layout)
+  <out>/index.html        a static viewer that pans and zooms the full map and
+                          only loads the tiles on screen (open it directly from disk)
+Font sizes and line widths grow with the zoom level, so labels that are unreadable
+in the overview become legible when zoomed in. Tiles are rendered in parallel
+(each worker draws the diagram once per zoom level, then only moves the view and
+hides the artists outside each tile), and tiles with nothing on them are not written.
+
+Usage:
+  python tile_export.py OUT_DIR [LIST ...] [--max-zoom 5] [--domains GL] [--bundled] [--jobs N]
+"""
+
+import os
+import json
+import math
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import matplotlib.image as mpimg
+import numpy as np
+
+import governance_map
+
+TILE_SIZE = 256
+# Zoom level at which the map is about as large as the 10in x 100dpi images.
+BASE_ZOOM = 2
+# Data extent drawn by draw_layout.
+EXTENT = 1.2
+
+_graph = None
+_figures = {}
+
+def _init_worker(graph):
+    global _graph
+    _graph = graph
+
+def tile_bounds(z, x, y):
+    """
+    Returns the data extent (x0, x1, y0, y1) covered by tile (z, x, y).
+    """
+    size = 2 * EXTENT / 2**z
+    x0 = -EXTENT + x * size
+    y1 = EXTENT - y * size
+    return x0, x0 + size, y1 - size, y1
+
+def tile_may_have_content(z, x, y):
+    """
+    Cheap geometric pre-check: tiles entirely outside the circle of radius EXTENT
+    (the corners of the pyramid) never have anything drawn on them.
+    """
+    x0, x1, y0, y1 = tile_bounds(z, x, y)
+    nearest_x = min(max(0.0, x0), x1)
+    nearest_y = min(max(0.0, y0), y1)
+    return math.hypot(nearest_x, nearest_y) <= EXTENT
+
+def _artist_extents(fig, ax, z):
+    """
+    Returns (artists, boxes): the patches and texts on ax and an (n, 4) array of
+    their data extents (x0, y0, x1, y1) at zoom level z, measured once on the
+    full view. Patches scale with the data, while text keeps its size in pixels,
+    so text boxes are converted with the data-per-pixel of a zoom-z tile.
+    """
+    from matplotlib.text import Text
+
+    ax.set_xlim(-EXTENT, EXTENT)
+    ax.set_ylim(-EXTENT, EXTENT)
+    fig.canvas.draw()
+    renderer = fig.canvas.get_renderer()
+    to_data = ax.transData.inverted()
+    per_pixel = 2 * EXTENT / 2**z / TILE_SIZE
+
+    artists = list(ax.patches) + list(ax.texts)
+    boxes = np.empty((len(artists), 4))
+    for i, artist in enumerate(artists):
+        bb = artist.get_window_extent(renderer)
+        if isinstance(artist, Text):
+            x, y = artist.get_position()
+            px, py = ax.transData.transform((x, y))
+            boxes[i] = (x + (bb.x0 - px) * per_pixel, y + (bb.y0 - py) * per_pixel,
+                        x + (bb.x1 - px) * per_pixel, y + (bb.y1 - py) * per_pixel)
+        else:
+            (x0, y0), (x1, y1) = to_data.transform([(bb.x0, bb.y0), (bb.x1, bb.y1)])
+            boxes[i] = (x0, y0, x1, y1)
+    return artists, boxes
+
+def _figure_for_zoom(z):
+    """
+    Returns this worker's (fig, ax, artists, boxes) for zoom level z, drawing the
+    diagram on first use.
+    """
+    if z not in _figures:
+        fig = plt.figure(figsize=(TILE_SIZE / 100, TILE_SIZE / 100), dpi=100)
+        fig.patch.set_alpha(0)
+        ax = fig.add_axes([0, 0, 1, 1])
+        governance_map.draw_layout(_graph, title=False, ax=ax, scale=2**(z - BASE_ZOOM))
+        _figures[z] = (fig, ax) + _artist_extents(fig, ax, z)
+    return _figures[z]
+
+def render_tiles(z, tiles, out_dir):
+    """
+    Renders the given (x, y) tiles of zoom level z. Runs inside a worker process.
+    Returns the list of "z/x/y" names of the tiles that were written.
+    """
+    fig, ax, artists, boxes = _figure_for_zoom(z)
+    written = []
+    for x, y in tiles:
+        x0, x1, y0, y1 = tile_bounds(z, x, y)
+        # Only draw the artists that overlap this tile; at deep zoom levels
+        # that is a small fraction of the diagram.
+        overlaps = ((boxes[:, 0] <= x1) & (boxes[:, 2] >= x0) &
+                    (boxes[:, 1] <= y1) & (boxes[:, 3] >= y0))
+        if not overlaps.any():
+            continue
+        for artist, visible in zip(artists, overlaps.tolist()):
+            artist.set_visible(visible)
+        ax.set_xlim(x0, x1)
+        ax.set_ylim(y0, y1)
+        fig.canvas.draw()
+        pixels = np.asarray(fig.canvas.buffer_rgba())
+        if not pixels[..., 3].any():
+            continue
+        path = os.path.join(out_dir, str(z), str(x), f"{y}.png")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        mpimg.imsave(path, pixels)
+        written.append(f"{z}/{x}/{y}")
+    return written
+
+VIEWER_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Chord Diagram Tiles</title>
+<style>html,body{margin:0;height:100%%;overflow:hidden;background:#fff}
+#map{position:absolute;inset:0;cursor:grab}#map img{position:absolute;user-select:none}
+#hint{position:absolute;left:8px;top:8px;font:12px sans-serif;background:#fffc}</style></head>
+<body><div id="map"></div><div id="hint">Drag to pan, scroll to zoom.</div>
+<script>
+var T = %(tile_size)d, MAXZ = %(max_zoom)d, TILES = new Set(%(tiles)s);
+var map = document.getElementById('map'), imgs = {};
+var s = Math.min(innerWidth, innerHeight) / T, cx = T / 2, cy = T / 2;
+function draw() {
+  var z = Math.max(0, Math.min(MAXZ, Math.ceil(Math.log2(s)))), tw = T / Math.pow(2, z);
+  var W = map.clientWidth, H = map.clientHeight, left = cx - W / 2 / s, top = cy - H / 2 / s;
+  var seen = {};
+  for (var x = Math.max(0, Math.floor(left / tw)); x * tw < left + W / s && x < Math.pow(2, z); x++) {
+    for (var y = Math.max(0, Math.floor(top / tw)); y * tw < top + H / s && y < Math.pow(2, z); y++) {
+      var k = z + '/' + x + '/' + y;
+      if (!TILES.has(k)) continue;
+      var img = imgs[k];
+      if (!img) { img = imgs[k] = new Image(); img.src = k + '.png'; img.draggable = false; map.appendChild(img); }
+      img.style.left = (x * tw - left) * s + 'px'; img.style.top = (y * tw - top) * s + 'px';
+      img.style.width = img.style.height = tw * s + 1 + 'px';
+      seen[k] = 1;
+    }
+  }
+  for (var k in imgs) if (!seen[k]) { map.removeChild(imgs[k]); delete imgs[k]; }
+}
+map.addEventListener('wheel', function (e) {
+  e.preventDefault();
+  var f = e.deltaY < 0 ? 1.25 : 0.8, mx = cx + (e.clientX - map.clientWidth / 2) / s, my = cy + (e.clientY - map.clientHeight / 2) / s;
+  s *= f; cx = mx - (mx - cx) / f; cy = my - (my - cy) / f; draw();
+}, {passive: false});
+var drag = null;
+map.addEventListener('mousedown', function (e) { drag = [e.clientX, e.clientY]; });
+addEventListener('mouseup', function () { drag = null; });
+addEventListener('mousemove', function (e) {
+  if (!drag) return;
+  cx -= (e.clientX - drag[0]) / s; cy -= (e.clientY - drag[1]) / s; drag = [e.clientX, e.clientY]; draw();
+});
+addEventListener('resize', draw);
+draw();
+</script></body></html>
+"""
+
+def export_tiles(out_dir, selected_sources=None, json_file="control_mapping.json", max_zoom=5,
+                 master_domains=None, bundled=False, lod=False, jobs=None):
+    """
+    Renders the tile pyramid for zoom levels 0..max_zoom into out_dir and writes the viewer.
+    Returns the number of tiles written, or None if a list label is unknown or
+    there is nothing to draw.
+    """
+    lists, relationships = governance_map.load_data(json_file)
+    selected_sources = selected_sources or list(lists.keys())
+    for s in selected_sources:
+        if s not in lists:
+            print(f"Invalid list label: {s}")
+            return None
+    # The layout is computed once here and shipped to the workers.
+    graph = governance_map.compute_layout(lists, relationships, selected_sources,
+                                          master_domains=master_domains, bundled=bundled, lod=lod)
+    if graph is None:
+        print("No relationships found among the selected lists.")
+        return None
+
+    # Work units: chunks of tiles of one zoom level, large enough to amortize
+    # drawing the diagram once per zoom level in each worker.
+    tasks = []
+    for z in range(max_zoom + 1):
+        tiles = []
+        for x in range(2**z):
+            for y in range(2**z):
+                if tile_may_have_content(z, x, y):
+                    tiles.append((x, y))
+        chunk = max(16, len(tiles) // (4 * (jobs or os.cpu_count() or 1)))
+        for i in range(0, len(tiles), chunk):
+            tasks.append((z, tiles[i:i + chunk]))
+
+    os.makedirs(out_dir, exist_ok=True)
+    written = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(graph,)) as pool:
+        futures = [pool.submit(render_tiles, z, tiles, out_dir) for z, tiles in tasks]
+        for future in futures:
+            written.extend(future.result())
+
+    total = sum(4**z for z in range(max_zoom + 1))
+    with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(VIEWER_HTML % {"tile_size": TILE_SIZE, "max_zoom": max_zoom,
+                               "tiles": json.dumps(sorted(written))})
+    print(f"Wrote {len(written)} of {total} tiles ({total - len(written)} empty) to {out_dir}; "
+          f"open {os.path.join(out_dir, 'index.html')} to view.")
+    return len(written)
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the chord diagram as a zoomable tile pyramid")
+    parser.add_argument("out", help="Output directory")
+    parser.add_argument("lists", nargs="*", help="List labels to include (default: ALL)")
+    parser.add_argument("--data", default="control_mapping.json", help="Mapping JSON file")
+    parser.add_argument("--max-zoom", type=int, default=5, help="Deepest zoom level (default: 5)")
+    parser.add_argument("--domains", help="Only draw edges of these Master domains (comma separated)")
+    parser.add_argument("--bundled", action="store_true", help="Bundle edges through the Master domains")
+    parser.add_argument("--lod", action="store_true",
+                        help="Collapse Master domains and top-level clauses into aggregate nodes")
+    parser.add_argument("--jobs", type=int, default=None, help="Number of worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    master_domains = None
+    if args.domains:
+        master_domains = {d.strip() for d in args.domains.split(",") if d.strip()}
+    written = export_tiles(args.out, args.lists, json_file=args.data, max_zoom=args.max_zoom,
+                           master_domains=master_domains, bundled=args.bundled, lod=args.lod,
+                           jobs=args.jobs)
+    return 0 if written is not None else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Opt-in tracing of the slow stages, as Chrome trace files.
+
+Tracing is off unless CHORD_TRACE_DIR is set. When it is off, span() returns
+one shared no-op object and traced() returns the function unchanged, so the
+instrumentation costs a function call per span at most. When it is on,
+every span records its wall time, its row count (span.add(n)) and any other
+arguments, plus the peak memory:
+  • by default the process's peak resident set size so far (max_rss_mb),
+  • with CHORD_TRACE_MEMORY=1, the peak Python heap inside the span itself
+    (peak_mb, via tracemalloc; this slows the traced code down noticeably).
+Each process writes its spans to <CHORD_TRACE_DIR>/trace-<pid>.json when it
+exits. Subprocesses (pipeline stages) inherit the variable and write files of
+their own. Pool workers exit without running atexit handlers, so the work they
+run calls write_trace() itself. Any of the files can be
+loaded in chrome://tracing or https://ui.perfetto.dev. This script merges them
+into one and prints the slowest spans.
+
+Usage:
+  CHORD_TRACE_DIR=traces python pipeline.py --force
+  python tracing.py traces [--out trace.json]
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import argparse
+import functools
+import threading
+
+TRACE_DIR = os.environ.get("CHORD_TRACE_DIR")
+TRACE_MEMORY = os.environ.get("CHORD_TRACE_MEMORY") == "1"
+ENABLED = bool(TRACE_DIR)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def add(self, rows=1):
+        pass
+
+    def set(self, **args):
+        pass
+
+_NULL_SPAN = _NullSpan()
+_events = []
+_local = threading.local()
+
+class Span:
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.rows = 0
+        self.peak = 0
+
+    def add(self, rows=1):
+        """
+        Counts rows (or any other unit of work) processed in the span.
+        """
+        self.rows += rows
+
+    def set(self, **args):
+        self.args.update(args)
+
+    def __enter__(self):
+        stack = _stack()
+        if TRACE_MEMORY:
+            # Fold the peak so far into the enclosing span before resetting it.
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        stack.append(self)
+        self.wall_start = time.time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        stack = _stack()
+        stack.pop()
+        args = dict(self.args)
+        if self.rows:
+            args["rows"] = self.rows
+        if TRACE_MEMORY:
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, self.peak)
+            tracemalloc.reset_peak()
+            args["peak_mb"] = round(self.peak / 2**20, 3)
+        elif resource is not None:
+            # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+            maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            args["max_rss_mb"] = round(maxrss / (2**20 if sys.platform == "darwin" else 2**10), 1)
+        if exc[0] is not None:
+            args["error"] = exc[0].__name__
+        _events.append({
+            "name": self.name, "cat": "stage", "ph": "X",
+            "ts": round(self.wall_start * 1e6, 1), "dur": round((end - self.start) * 1e6, 1),
+            "pid": os.getpid(), "tid": threading.get_ident(), "args": args,
+        })
+        return False
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+def span(name, **args):
+    """
+    Returns a context manager that records a span (a no-op when tracing is off):
+        with tracing.span("read_excel", file=path) as s:
+            ...
+            s.add(len(rows))
+    """
+    if not ENABLED:
+        return _NULL_SPAN
+    return Span(name, args)
+
+def traced(name=None):
+    """
+    Decorator recording a span around every call of a function (a no-op when
+    tracing is off).
+    """
+    def decorate(func):
+        if not ENABLED:
+            return func
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with Span(label, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def write_trace():
+    """
+    Writes this process's spans (so far) to <CHORD_TRACE_DIR>/trace-<pid>.json.
+    """
+    if not _events:
+        return
+    os.makedirs(TRACE_DIR, exist_ok=True)
+    metadata = {"name": "process_name", "ph": "M", "pid": os.getpid(),
+                "args": {"name": os.path.basename(sys.argv[0]) or "python"}}
+    path = os.path.join(TRACE_DIR, f"trace-{os.getpid()}.json")
+    with open(path, 'w') as f:
+        json.dump({"traceEvents": [metadata] + _events, "displayTimeUnit": "ms"}, f)
+
+if ENABLED:
+    if TRACE_MEMORY:
+        import tracemalloc
+        tracemalloc.start()
+    atexit.register(write_trace)
+    if hasattr(os, "register_at_fork"):
+        # A forked worker starts with a copy of the parent's spans; keep only its own.
+        os.register_at_fork(after_in_child=_events.clear)
+
+def merge_traces(trace_dir):
+    """
+    Returns the events of every trace file in trace_dir.
+    """
+    events = []
+    for name in sorted(os.listdir(trace_dir)):
+        if name.startswith("trace-") and name.endswith(".json"):
+            with open(os.path.join(trace_dir, name), 'r') as f:
+                events.extend(json.load(f)["traceEvents"])
+    return events
+
+def summarize(events):
+    """
+    Returns [(name, calls, total ms, rows, peak MB)] sorted by total time.
+    """
+    totals = {}
+    for event in events:
+        if event.get("ph") != "X":
+            continue
+        calls, ms, rows, peak = totals.get(event["name"], (0, 0.0, 0, 0.0))
+        args = event.get("args", {})
+        totals[event["name"]] = (calls + 1, ms + event["dur"] / 1000, rows + args.get("rows", 0),
+                                 max(peak, args.get("peak_mb", args.get("max_rss_mb", 0.0))))
+    return sorted(((name,) + values for name, values in totals.items()), key=lambda t: -t[2])
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge and summarize CHORD_TRACE_DIR trace files")
+    parser.add_argument("trace_dir", help="Folder with trace-<pid>.json files")
+    parser.add_argument("--out", default="trace.json", help="Merged Chrome trace file (default: trace.json)")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.trace_dir):
+        print(f"Directory not found: {args.trace_dir}")
+        return 1
+    events = merge_traces(args.trace_dir)
+    with open(args.out, 'w') as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    print(f"{'Span':<32} | {'Calls':>6} | {'Total ms':>10} | {'Rows':>9} | Peak MB")
+    print("-" * 76)
+    for name, calls, ms, rows, peak in summarize(events):
+        print(f"{name:<32} | {calls:>6} | {ms:>10.1f} | {rows:>9} | {peak:>7.1f}")
+    print(f"Merged trace saved as '{args.out}'.")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
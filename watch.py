@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Watch mode: keeps the derived artifacts up to date while the sources are edited.
+
+Runs until interrupted, polling the sources for saves:
+  • Source Data.xlsx  -> control_mapping.json, crosswalks/*.csv, generated_images/
+  • dora_map.py (the DORA/NIS2 HTML tables) -> control_mapping_dora.json and its CSVs
+The parsed workbook rows, the mapping and the relationship index stay in
+memory between saves. On a save only the rows whose cells changed are
+converted again, and the new relationships are compared with the previous
+ones. Only the pair CSVs and the render specs touched by the difference are
+regenerated. The JSON and CSVs are written straight away, and images are rendered
+in the background by worker processes that stay warm (see render_images.py).
+
+Usage:
+  python watch.py [--interval 0.2] [--jobs N]
+"""
+
+import io
+import os
+import json
+import time
+import argparse
+import importlib
+import contextlib
+from itertools import combinations
+from concurrent.futures import ProcessPoolExecutor
+
+import governance_map
+import layout_cache
+import render_images
+from pipeline import CSV_DIR
+from relationship_index import HUB, RelationshipIndex, affected_tables, write_table_file
+
+WORKBOOK = "Source Data.xlsx"
+DATA_FILE = "control_mapping.json"
+DORA_SOURCE = "dora_map.py"
+DORA_DATA_FILE = "control_mapping_dora.json"
+IMAGES_DIR = "generated_images"
+
+def mapping_changes(old, new):
+    """
+    Compares two mappings ({"lists": ..., "relationships": ...}).
+    Returns (changed_lists, changed_relationships): the lists whose items
+    changed, and the relationships added or removed.
+    """
+    names = set(old["lists"]) | set(new["lists"])
+    changed_lists = {l for l in names if old["lists"].get(l) != new["lists"].get(l)}
+    old_rel = {tuple(r) for r in old["relationships"]}
+    new_rel = {tuple(r) for r in new["relationships"]}
+    return changed_lists, old_rel ^ new_rel
+
+def affected_specs(specs, lists, changed_lists, changed_relationships, hub=HUB):
+    """
+    Returns the render specs whose image may have changed: specs that draw a
+    changed list, or an edge that was added or removed.
+    """
+    affected = []
+    for spec in specs:
+        sources = set(spec.get("sources") or lists)
+        domains = spec.get("master_domains")
+        touched = bool(sources & changed_lists)
+        for l1, item1, l2, item2 in changed_relationships:
+            if touched:
+                break
+            if l1 in sources and l2 in sources:
+                if not domains:
+                    touched = True
+                    continue
+                # As in compute_layout: with a domain filter only edges to the hub are
+                # drawn, and only if every hub end is in one of the domains.
+                hub_items = [item for l, item in ((l1, item1), (l2, item2)) if l == hub]
+                touched = bool(hub_items) and all(governance_map.master_domain(item) in domains
+                                                  for item in hub_items)
+        if touched:
+            affected.append(spec)
+    return affected
+
+def discard(path):
+    """
+    Deletes a file if it exists.
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+class Watcher:
+    def __init__(self, jobs=None):
+        self.mtimes = {}
+        self.rows = {}
+        self.data = None
+        self.index = None
+        self.dora_data = None
+        self.dora_mapping = {}
+        self.pool = ProcessPoolExecutor(max_workers=jobs)
+        # {future: (spec, fingerprint, staging path)}; {output: latest future}
+        self.renders = {}
+        self.latest = {}
+        self.render_count = 0
+
+    def changed(self, path):
+        """
+        Returns True if path was modified since the last call (and exists).
+        """
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if self.mtimes.get(path) == mtime:
+            return False
+        self.mtimes[path] = mtime
+        return True
+
+    # ------------------------------------------------------------
+    # Workbook -> control_mapping.json, pair CSVs, images
+    # ------------------------------------------------------------
+    def convert_workbook(self):
+        """
+        Converts the workbook, reusing the conversion of every row whose cells
+        did not change. Returns (mapping, number of rows converted again).
+        """
+        import pandas as pd
+        import conversion
+
+        df = conversion.read_mapping_sheet(WORKBOOK)
+        columns = [conversion.MASTER_COL] + conversion.SOURCE_COLS
+        rows = {}
+        converted = []
+        fresh = 0
+        for _, row in df.iterrows():
+            key = tuple(str(row[c]) if pd.notnull(row[c]) else None for c in columns)
+            if key not in rows:
+                if key in self.rows:
+                    rows[key] = self.rows[key]
+                else:
+                    rows[key] = conversion.convert_row(row)
+                    fresh += 1
+            converted.append(rows[key])
+        self.rows = rows
+        return conversion.build_mapping(converted), fresh
+
+    def update_mapping(self, initial=False):
+        start = time.perf_counter()
+        try:
+            new, fresh = self.convert_workbook()
+        except Exception as e:
+            # Typically the workbook is still being written; the next save retries.
+            print(f"Could not read {WORKBOOK}: {e}")
+            return
+        if self.data is None:
+            try:
+                self.data = dict(zip(("lists", "relationships"), governance_map.load_data(DATA_FILE)))
+            except (FileNotFoundError, json.JSONDecodeError, KeyError):
+                self.data = {"lists": {}, "relationships": []}
+
+        changed_lists, changed_relationships = mapping_changes(self.data, new)
+        if new != self.data:
+            with open(DATA_FILE, "w") as f:
+                json.dump(new, f, indent=4)
+        self.data = new
+        self.index = RelationshipIndex(new["lists"], new["relationships"])
+
+        if initial or not os.path.isdir(CSV_DIR):
+            tables = list(combinations(new["lists"], 2))
+        else:
+            tables = affected_tables(new["lists"], changed_lists, changed_relationships)
+        os.makedirs(CSV_DIR, exist_ok=True)
+        for primary, secondary in tables:
+            write_table_file(self.index, primary, secondary, CSV_DIR)
+
+        specs = render_images.load_specs()
+        if initial:
+            manifest = render_images.load_manifest(IMAGES_DIR)
+            data_hash = layout_cache.file_hash(DATA_FILE)
+            code_hash = layout_cache.code_hash()
+            specs = [s for s in specs
+                     if manifest.get(s["output"]) != render_images.spec_fingerprint(s, data_hash, code_hash)]
+        else:
+            specs = affected_specs(specs, new["lists"], changed_lists, changed_relationships)
+        self.render(specs)
+
+        print(f"{WORKBOOK}: {fresh} rows converted, {len(changed_relationships)} relationships changed, "
+              f"{len(tables)} tables written, {len(specs)} images queued "
+              f"({time.perf_counter() - start:.2f} s)")
+
+    def render(self, specs):
+        """
+        Queues renders of specs. Each render goes to a staging file that
+        collect_renders moves into place. A newer render of the same output
+        supersedes older ones: those are cancelled if they have not started,
+        and their result is discarded otherwise, so renders that finish out of
+        order never leave an old image marked current.
+        """
+        if not specs:
+            return
+        os.makedirs(IMAGES_DIR, exist_ok=True)
+        data_hash = layout_cache.file_hash(DATA_FILE)
+        code_hash = layout_cache.code_hash()
+        for spec in specs:
+            previous = self.latest.get(spec["output"])
+            if previous is not None:
+                previous.cancel()
+            self.render_count += 1
+            staged = os.path.join(IMAGES_DIR, f".{spec['output']}.{self.render_count}.pending")
+            future = self.pool.submit(render_images.render_spec, spec, DATA_FILE, IMAGES_DIR,
+                                      data_hash, code_hash, staged)
+            self.renders[future] = (spec, render_images.spec_fingerprint(spec, data_hash, code_hash), staged)
+            self.latest[spec["output"]] = future
+
+    def collect_renders(self):
+        """
+        Moves the images of finished renders into place and records them in
+        the render manifest, so render_images.py and the pipeline see them as
+        current. Results of superseded renders are deleted.
+        """
+        done = [f for f in self.renders if f.done()]
+        if not done:
+            return
+        manifest = render_images.load_manifest(IMAGES_DIR)
+        for future in done:
+            spec, fingerprint, staged = self.renders.pop(future)
+            if self.latest.get(spec["output"]) is not future:
+                discard(staged)
+                continue
+            del self.latest[spec["output"]]
+            if future.cancelled():
+                continue
+            try:
+                staged_path = future.result()
+            except Exception as e:
+                print(f"Error rendering {spec['output']}: {e}")
+                discard(staged)
+                continue
+            if staged_path:
+                out_path = os.path.join(IMAGES_DIR, spec["output"])
+                os.replace(staged_path, out_path)
+                manifest[spec["output"]] = fingerprint
+                print(f"Rendered: {out_path}")
+        render_images.save_manifest(IMAGES_DIR, manifest)
+
+    def discard_renders(self):
+        """
+        Deletes the staging files of renders that were never collected.
+        """
+        for _, _, staged in self.renders.values():
+            discard(staged)
+        self.renders.clear()
+        self.latest.clear()
+
+    # ------------------------------------------------------------
+    # DORA/NIS2 HTML tables -> control_mapping_dora.json and CSVs
+    # ------------------------------------------------------------
+    def update_dora(self):
+        start = time.perf_counter()
+        try:
+            import dora_map
+            import dora_csv
+            dora_map = importlib.reload(dora_map)
+            data = dora_map.build_mapping()
+        except Exception as e:
+            print(f"Could not convert the tables in {DORA_SOURCE}: {e}")
+            return
+        if data != self.dora_data:
+            with open(DORA_DATA_FILE, "w") as f:
+                json.dump(data, f, indent=2)
+        self.dora_data = data
+
+        mapping = dora_csv.create_mapping_dict(data)
+        changed = {key: items for key, items in mapping.items() if self.dora_mapping.get(key) != items}
+        self.dora_mapping = mapping
+        with contextlib.redirect_stdout(io.StringIO()):
+            dora_csv.export_to_csv(changed)
+        print(f"{DORA_SOURCE}: {len(changed)} tables written ({time.perf_counter() - start:.2f} s)")
+
+    def run(self, interval=0.2):
+        print(f"Watching {WORKBOOK} and {DORA_SOURCE} (Ctrl+C to stop).")
+        initial = True
+        try:
+            while True:
+                if self.changed(WORKBOOK):
+                    self.update_mapping(initial=initial)
+                if self.changed(DORA_SOURCE):
+                    self.update_dora()
+                initial = False
+                self.collect_renders()
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            print("Stopping.")
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+            self.discard_renders()
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate the derived artifacts whenever the sources change")
+    parser.add_argument("--interval", type=float, default=0.2, help="Polling interval in seconds (default: 0.2)")
+    parser.add_argument("--jobs", type=int, default=None, help="Number of render worker processes (default: all cores)")
+    args = parser.parse_args()
+    Watcher(jobs=args.jobs).run(interval=args.interval)
+
+if __name__ == "__main__":
+    main()